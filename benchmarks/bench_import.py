@@ -0,0 +1,55 @@
+"""
+Import-time benchmark of the scaile package.
+
+Measures the wall time of fresh interpreters importing the package and reports the
+overhead over an empty interpreter. Exits with status 1 when `import scaile` exceeds
+the budget, so it can guard startup cost in CI:
+
+    python benchmarks/bench_import.py --budget-ms 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = (
+    "pass",
+    "import scaile",
+    "from scaile import Utils, Rewards",
+    "from scaile import Client",
+)
+
+
+def measure(statement: str, runs: int) -> float:
+    """Median wall time in milliseconds of a fresh interpreter running `statement`."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="allowed overhead of `import scaile`")
+    args = parser.parse_args()
+
+    baseline = measure(STATEMENTS[0], args.runs)
+    print(f"{'statement':<36} {'median ms':>10} {'overhead ms':>12}")
+    overheads = {}
+    for statement in STATEMENTS:
+        median = measure(statement, args.runs)
+        overheads[statement] = median - baseline
+        print(f"{statement:<36} {median:>10.1f} {overheads[statement]:>12.1f}")
+
+    if overheads["import scaile"] > args.budget_ms:
+        print(f"import scaile exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
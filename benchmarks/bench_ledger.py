@@ -0,0 +1,43 @@
+"""
+Benchmark of local reward ledger reads.
+
+Fills a ledger with the transactions of many contributors, then times the balance
+and history lookups a contributor dashboard makes on every page view:
+
+    python -m benchmarks.bench_ledger
+"""
+
+import os
+import random
+import tempfile
+import time
+from scaile.reward_ledger import RewardLedger
+
+CONTRIBUTORS = 50_000
+TRANSACTIONS = 200_000
+LOOKUPS = 10_000
+
+
+def main():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = RewardLedger(os.path.join(directory, "ledger.sqlite3"), "bench")
+        start = time.perf_counter()
+        for offset in range(0, TRANSACTIONS, 10_000):
+            ledger.append({"id": f"t{n}", "contributor_id": f"user_{rng.randrange(CONTRIBUTORS)}",
+                           "amount": rng.randrange(1, 100)} for n in range(offset, offset + 10_000))
+        print(f"append  {TRANSACTIONS} transactions: {time.perf_counter() - start:.1f} s")
+
+        contributors = [f"user_{rng.randrange(CONTRIBUTORS)}" for _ in range(LOOKUPS)]
+        for name, read in (("balance", ledger.balance), ("summary", ledger.summary),
+                           ("history", lambda c: ledger.history(c, limit=20))):
+            start = time.perf_counter()
+            for contributor_id in contributors:
+                read(contributor_id)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<8} {elapsed / LOOKUPS * 1e6:7.1f} us per lookup")
+        ledger.close()
+
+
+if __name__ == "__main__":
+    main()
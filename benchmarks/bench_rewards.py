@@ -0,0 +1,40 @@
+"""
+Benchmark of the local reward engine.
+
+Computes the rewards of up to a million contributors with every calculation method,
+on numpy when it is installed and on plain lists otherwise:
+
+    python -m benchmarks.bench_rewards
+"""
+
+import random
+import time
+from scaile.reward_engine import CALCULATION_METHODS, RewardEngine
+
+CONTRIBUTORS = (10_000, 100_000, 1_000_000)
+
+
+def activity(n: int) -> dict:
+    rng = random.Random(n)
+    return {
+        "contributor_id": [f"user_{i:07d}" for i in range(n)],
+        "accepted": [rng.randrange(2000) for _ in range(n)],
+        "quality": [rng.random() for _ in range(n)],
+    }
+
+
+def main():
+    backend = "numpy" if RewardEngine("linear")._numpy is not None else "lists"
+    print(f"backend: {backend}")
+    for n in CONTRIBUTORS:
+        columns = activity(n)
+        for method in CALCULATION_METHODS:
+            engine = RewardEngine(method)
+            start = time.perf_counter()
+            result = engine.calculate_columns(columns)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>9} contributors  {method:<11} {elapsed * 1000:8.1f} ms  total={result.total:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Microbenchmark of webhook signature verification.
+
+Compares the original per-request `hmac.new(secret.encode(), ...)` with
+`SignatureVerifier`, which copies precomputed keyed state, at typical payload sizes.
+
+    python -m benchmarks.bench_signature
+"""
+
+import hashlib
+import hmac
+import timeit
+from scaile.signature import SignatureVerifier
+
+SECRET = "default_secret_key"
+PAYLOAD_SIZES = (256, 2 * 1024, 16 * 1024, 256 * 1024)  # bytes
+NUMBER = 20000
+
+
+def verify_from_scratch(payload: bytes, signature: str) -> bool:
+    """The verification done before SignatureVerifier existed."""
+    expected = hmac.new(key=SECRET.encode(), msg=payload, digestmod=hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def main():
+    verifier = SignatureVerifier(SECRET)
+    rotating = SignatureVerifier([SECRET, "next_secret_key"])
+    print(f"{'payload':>10} {'from scratch':>14} {'verifier':>10} {'2 secrets':>10}  (us per request)")
+    for size in PAYLOAD_SIZES:
+        payload = b'{"event": "new_data", "data": "' + b"x" * max(0, size - 34) + b'"}'
+        signature = verifier.sign(payload)
+        number = max(200, NUMBER * 256 // size)
+        timings = [
+            min(timeit.repeat(lambda: func(payload, signature), number=number, repeat=5)) / number * 1e6
+            for func in (verify_from_scratch, verifier.verify, rotating.verify)
+        ]
+        print(f"{size:>10} {timings[0]:>14.2f} {timings[1]:>10.2f} {timings[2]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from scaile.utils import handle_api_error
 
 # Environment Variables (Typically set in the environment or .env file)
 SC_AILE_API_KEY = os.getenv("SCAILE_API_KEY")
+PROJECT_ID = os.getenv("SCAILE_PROJECT_ID", "example_project")
 
 def authenticate():
     """
@@ -21,14 +22,18 @@ def authenticate():
 def create_batch_annotations(client, annotations_data):
     """
     Create a batch of annotations using the Scaile API.
+
+    Items are chunked by `annotation.batch_size` and submitted concurrently;
+    failed items are reported individually instead of aborting the batch.
     """
     try:
-        created_annotations = []
-        for data in annotations_data:
-            annotation = Annotation.create(data)
-            created_annotations.append(annotation)
-            print(f"Annotation created successfully: {annotation}")
-        return created_annotations
+        results = Annotation(client).bulk_create(PROJECT_ID, annotations_data)
+        for result in results:
+            if result.ok:
+                print(f"Annotation created successfully: {result.response}")
+            else:
+                print(f"Annotation {result.index} failed: {result.error}")
+        return [result.response for result in results if result.ok]
     except Exception as e:
         handle_api_error(e)
 
@@ -91,6 +91,21 @@ class RewardManager:
         except Exception as e:
             handle_api_error(e)
 
+    def distribute_payouts(self, payouts, period=None):
+        """
+        Distributes a whole payout table (list of dicts, columnar dict or CSV path) in
+        concurrent, idempotent chunks and prints the reconciliation. Passing the payout
+        period (e.g. "2026-10") lets a re-run of the same period skip paid chunks.
+        """
+        try:
+            report = self.rewards.bulk_distribute(self.project_id, payouts, batch_id=period)
+            print(f"🎁 Payout reconciliation: {report.summary()}")
+            for result in report.failed:
+                print(f"⚠️ Chunk {result.index} ({len(result.contributors)} contributors) failed: {result.error}")
+            return report
+        except Exception as e:
+            handle_api_error(e)
+
     def list_all_rewards(self):
         """Lists all rewards distributed in the project."""
         try:
@@ -136,6 +151,13 @@ def main():
     print("\n--- 🔹 Distributing Contributor Rewards 🔹 ---")
     reward_manager.distribute_rewards(contributor_id, 100)
 
+    print("\n--- 🔹 Distributing a Payout Table 🔹 ---")
+    reward_manager.distribute_payouts([
+        {"contributor_id": contributor_id, "amount": 40},
+        {"contributor_id": "annotator_789", "amount": 25},
+        {"contributor_id": contributor_id, "amount": 10},  # merged with the first entry
+    ])
+
     print("\n--- 🔹 Listing All Rewards 🔹 ---")
     reward_manager.list_all_rewards()
 
@@ -5,12 +5,63 @@ scaile SDK: A Python SDK for interacting with the Scaile API.
 
 This package provides modules for managing annotations, decentralized storage,
 rewards, and utilities. Import the main `Client` class to start using the SDK.
+
+Submodules are imported on first attribute access, so `import scaile` is cheap and
+`from scaile import Utils` does not load the HTTP stack.
 """
 
-from .client import Client
-from .annotation import Annotation
-from .storage import Storage
-from .rewards import Rewards
-from .utils import Utils
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "Client": ".client",
+    "Annotation": ".annotation",
+    "Storage": ".storage",
+    "Rewards": ".rewards",
+    "Utils": ".utils",
+    "AsyncClient": ".async_client",
+    "AsyncAnnotation": ".async_client",
+    "AsyncStorage": ".async_client",
+    "AsyncRewards": ".async_client",
+    "ContentCache": ".cache",
+    "ResponseCache": ".cache",
+    "TokenBucket": ".ratelimit",
+    "FileTokenBucket": ".ratelimit",
+    "RetryPolicy": ".retry",
+    "Instrument": ".instrumentation",
+    "MetricsCollector": ".instrumentation",
+    "BatchValidator": ".validation",
+    "RewardEngine": ".reward_engine",
+    "RewardLedger": ".reward_ledger",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .annotation import Annotation
+    from .storage import Storage
+    from .rewards import Rewards
+    from .utils import Utils
+    from .cache import ContentCache, ResponseCache
+    from .ratelimit import TokenBucket, FileTokenBucket
+    from .retry import RetryPolicy
+    from .instrumentation import Instrument, MetricsCollector
+    from .validation import BatchValidator
+    from .reward_engine import RewardEngine
+    from .reward_ledger import RewardLedger
+    from .async_client import AsyncClient, AsyncAnnotation, AsyncStorage, AsyncRewards
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["Client", "Annotation", "Storage", "Rewards", "Utils"]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
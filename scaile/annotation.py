@@ -1,3 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from .configs import config_value
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+
+# Fallbacks used when `annotation.batch_size` is not set in the config
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BULK_WORKERS = 8
+
+
+class BulkResult:
+    """
+    Outcome of submitting one item through `Annotation.bulk_create`.
+    """
+
+    __slots__ = ("index", "data", "response", "error")
+
+    def __init__(self, index: int, data: dict, response=None, error: Exception = None):
+        """
+        :param index: Position of the item in the input iterable.
+        :param data: The annotation payload that was submitted.
+        :param response: API response for a successful submission.
+        :param error: Exception raised for a failed submission.
+        """
+        self.index = index
+        self.data = data
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """True if the item was created successfully."""
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"BulkResult(index={self.index}, {status})"
+
+
 class Annotation:
     """
     Handles all data annotation-related functions, such as creating, updating, and retrieving annotations.
@@ -66,3 +105,72 @@ class Annotation:
         """
         endpoint = f"/projects/{project_id}/annotations"
         return self.client._make_request("GET", endpoint, params=filters)
+
+    def iter_annotations(self, project_id: str, filters: dict = None, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True):
+        """
+        Lazily iterates over annotations for a specific project, following pagination cursors.
+
+        The next page is fetched in the background while the current one is consumed,
+        so memory stays bounded by the page size.
+
+        :param project_id: The ID of the project.
+        :param filters: Optional dictionary containing filter parameters.
+        :param page_size: Number of items requested per page.
+        :param prefetch: Fetch the next page while the current one is consumed.
+        :return: Generator of annotations.
+        """
+        endpoint = f"/projects/{project_id}/annotations"
+        return iter_items(
+            lambda params: self.client._make_request("GET", endpoint, params=params),
+            filters, page_size=page_size, prefetch=prefetch,
+        )
+
+    def bulk_create(self, project_id: str, annotations, batch_size: int = None, max_workers: int = DEFAULT_BULK_WORKERS):
+        """
+        Creates many annotations concurrently.
+
+        The input is consumed lazily in chunks of `batch_size` items (defaults to
+        `annotation.batch_size` from the config). Chunks are handed to a pool of
+        `max_workers` threads sharing the client's connection pool, and at most
+        `max_workers` chunks are held in memory at once. A failing item is recorded in
+        its result and never aborts the rest of the batch.
+
+        :param project_id: The ID of the project.
+        :param annotations: Iterable of dictionaries containing annotation details.
+        :param batch_size: Number of annotations per chunk.
+        :param max_workers: Number of chunks submitted concurrently.
+        :return: List of `BulkResult`, one per input item, in input order.
+        """
+        if batch_size is None:
+            batch_size = config_value("annotation", "batch_size", DEFAULT_BATCH_SIZE)
+        if batch_size < 1 or max_workers < 1:
+            raise ValueError("batch_size and max_workers must be positive")
+
+        items = enumerate(annotations)
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = set()
+            while True:
+                while len(pending) < max_workers:
+                    chunk = list(islice(items, batch_size))
+                    if not chunk:
+                        break
+                    pending.add(pool.submit(self._create_chunk, project_id, chunk))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.extend(future.result())
+
+        results.sort(key=lambda result: result.index)
+        return results
+
+    def _create_chunk(self, project_id: str, chunk: list):
+        """Submits one chunk of (index, data) pairs, capturing per-item failures."""
+        results = []
+        for index, data in chunk:
+            try:
+                results.append(BulkResult(index, data, response=self.create_annotation(project_id, data)))
+            except Exception as e:
+                results.append(BulkResult(index, data, error=e))
+        return results
@@ -0,0 +1,377 @@
+import logging
+from .codec import JSONCodec, get_codec
+from .instrumentation import body_size
+from .logging import log_event, logger
+from .transport import resolve_timeout
+
+# Upper bound on simultaneously open connections for one AsyncClient
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+def _import_aiohttp():
+    """Imports aiohttp, which is only required for the asyncio client."""
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError(
+            "AsyncClient requires aiohttp. Install it with `pip install scaile-sdk[async]`."
+        ) from e
+    return aiohttp
+
+
+class AsyncClient:
+    """
+    The asyncio client for interacting with the Scaile API.
+
+    Mirrors `Client`, but every request method is a coroutine and all requests share
+    one pooled aiohttp connector, so a single event loop can keep many requests in flight.
+    """
+
+    def __init__(self, api_key: str, base_url: str = "https://api.scaile.com",
+                 timeout=None, connect_timeout=None,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS, max_connections_per_host: int = 0,
+                 codec: JSONCodec = None):
+        """
+        Initializes the client with authentication, base URL and connection limits.
+
+        :param api_key: API key for authentication.
+        :param base_url: Base URL for the Scaile API.
+        :param timeout: Read timeout in seconds, or a (connect, read) tuple. Defaults to `api.timeout` from the config.
+        :param connect_timeout: Connect timeout in seconds. Defaults to `api.connect_timeout` from the config.
+        :param max_connections: Maximum number of concurrent connections; further requests wait for a free slot.
+        :param max_connections_per_host: Maximum number of concurrent connections per host (0 means no per-host limit).
+        :param codec: JSON codec or codec name ("orjson", "stdlib"). Defaults to the fastest installed backend.
+        """
+        self._aiohttp = _import_aiohttp()
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self.timeout = resolve_timeout(timeout, connect_timeout)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.session = None
+        self.codec = get_codec(codec)
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_session(self):
+        """Creates the pooled aiohttp session on first use, inside the running event loop."""
+        if self.session is None or self.session.closed:
+            aiohttp = self._aiohttp
+            connect_timeout, read_timeout = self.timeout
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=read_timeout,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            )
+        return self.session
+
+    async def close(self):
+        """
+        Closes the underlying session and releases all pooled connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _url(self, endpoint: str) -> str:
+        """Joins an API endpoint onto the base URL."""
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    async def _make_request(self, method: str, endpoint: str, **kwargs):
+        """
+        Sends a request through the pooled session and decodes the JSON response.
+
+        :param method: HTTP method (GET, POST, PUT, DELETE).
+        :param endpoint: API endpoint, relative to the base URL.
+        :param kwargs: Extra arguments forwarded to aiohttp (params, json, data, ...).
+        :return: Decoded JSON body, or None for empty responses.
+        """
+        headers = self.headers
+        if "data" in kwargs:
+            # Let aiohttp set the multipart boundary itself
+            headers = {k: v for k, v in headers.items() if k != "Content-Type"}
+        elif "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+        if kwargs.get("params") is None:
+            kwargs.pop("params", None)
+
+        url = self._url(endpoint)
+        if logger.isEnabledFor(logging.DEBUG):
+            log_event(logging.DEBUG, "api.request", method=method, url=url,
+                      params=kwargs.get("params"), body_size=body_size(kwargs.get("data")))
+
+        try:
+            async with self._get_session().request(method, url, headers=headers, **kwargs) as response:
+                response.raise_for_status()
+                body = await response.read()
+                if response.status == 204 or not body:
+                    return None
+                return self.codec.loads(body)
+        except Exception as e:
+            logger.error(f"Error during API call to {endpoint}: {str(e)}")
+            raise
+
+    async def authenticate(self):
+        """
+        Verifies that the API key is valid.
+
+        :return: Authentication status as a boolean.
+        """
+        endpoint = "/auth/validate"
+        response = await self._make_request("GET", endpoint)
+        return response.get("valid", False)
+
+    async def get_projects(self):
+        """
+        Retrieves a list of projects available in the Scaile account.
+
+        :return: List of projects.
+        """
+        endpoint = "/projects"
+        return await self._make_request("GET", endpoint)
+
+    async def create_project(self, project_data: dict):
+        """
+        Creates a new project in Scaile.
+
+        :param project_data: Dictionary containing project details.
+        :return: Created project details.
+        """
+        endpoint = "/projects"
+        return await self._make_request("POST", endpoint, json=project_data)
+
+    async def delete_project(self, project_id: str):
+        """
+        Deletes a project by its ID.
+
+        :param project_id: The ID of the project to delete.
+        :return: Response indicating success or failure.
+        """
+        endpoint = f"/projects/{project_id}"
+        return await self._make_request("DELETE", endpoint)
+
+    async def get_project_annotations(self, project_id: str):
+        """
+        Retrieves annotations for a specific project.
+
+        :param project_id: The ID of the project.
+        :return: List of annotations.
+        """
+        endpoint = f"/projects/{project_id}/annotations"
+        return await self._make_request("GET", endpoint)
+
+    async def submit_annotation(self, project_id: str, annotation_data: dict):
+        """
+        Submits an annotation for a specific project.
+
+        :param project_id: The ID of the project.
+        :param annotation_data: Dictionary containing annotation details.
+        :return: Details of the submitted annotation.
+        """
+        endpoint = f"/projects/{project_id}/annotations"
+        return await self._make_request("POST", endpoint, json=annotation_data)
+
+
+class AsyncAnnotation:
+    """
+    Asyncio counterpart of `Annotation`.
+    """
+
+    def __init__(self, client):
+        """
+        Initializes the AsyncAnnotation class with a reference to the main AsyncClient.
+
+        :param client: An instance of the AsyncClient class for making API requests.
+        """
+        self.client = client
+
+    async def create_annotation(self, project_id: str, data: dict):
+        """
+        Creates a new annotation for a specific project.
+
+        :param project_id: The ID of the project.
+        :param data: Dictionary containing annotation details.
+        :return: Response containing the created annotation details.
+        """
+        endpoint = f"/projects/{project_id}/annotations"
+        return await self.client._make_request("POST", endpoint, json=data)
+
+    async def get_annotation(self, project_id: str, annotation_id: str):
+        """
+        Retrieves a specific annotation by its ID.
+
+        :param project_id: The ID of the project.
+        :param annotation_id: The ID of the annotation to retrieve.
+        :return: Annotation details.
+        """
+        endpoint = f"/projects/{project_id}/annotations/{annotation_id}"
+        return await self.client._make_request("GET", endpoint)
+
+    async def update_annotation(self, project_id: str, annotation_id: str, data: dict):
+        """
+        Updates an existing annotation.
+
+        :param project_id: The ID of the project.
+        :param annotation_id: The ID of the annotation to update.
+        :param data: Dictionary containing updated annotation details.
+        :return: Response containing the updated annotation details.
+        """
+        endpoint = f"/projects/{project_id}/annotations/{annotation_id}"
+        return await self.client._make_request("PUT", endpoint, json=data)
+
+    async def delete_annotation(self, project_id: str, annotation_id: str):
+        """
+        Deletes a specific annotation by its ID.
+
+        :param project_id: The ID of the project.
+        :param annotation_id: The ID of the annotation to delete.
+        :return: Response indicating success or failure of deletion.
+        """
+        endpoint = f"/projects/{project_id}/annotations/{annotation_id}"
+        return await self.client._make_request("DELETE", endpoint)
+
+    async def list_annotations(self, project_id: str, filters: dict = None):
+        """
+        Retrieves a list of annotations for a specific project, optionally filtered.
+
+        :param project_id: The ID of the project.
+        :param filters: Optional dictionary containing filter parameters.
+        :return: List of annotations.
+        """
+        endpoint = f"/projects/{project_id}/annotations"
+        return await self.client._make_request("GET", endpoint, params=filters)
+
+
+class AsyncStorage:
+    """
+    Asyncio counterpart of `Storage`.
+    """
+
+    def __init__(self, client):
+        """
+        Initializes the AsyncStorage class with a reference to the main AsyncClient.
+
+        :param client: An instance of the AsyncClient class for making API requests.
+        """
+        self.client = client
+
+    async def upload_data(self, project_id: str, file_path: str):
+        """
+        Uploads a file to the decentralized storage platform.
+
+        :param project_id: The ID of the project.
+        :param file_path: The local path to the file to be uploaded.
+        :return: Response containing the storage location and metadata.
+        """
+        endpoint = f"/projects/{project_id}/storage/upload"
+        aiohttp = self.client._aiohttp
+        with open(file_path, 'rb') as file:
+            form = aiohttp.FormData()
+            form.add_field("file", file)
+            return await self.client._make_request("POST", endpoint, data=form)
+
+    async def retrieve_data(self, project_id: str, file_id: str):
+        """
+        Retrieves a file from the decentralized storage platform.
+
+        :param project_id: The ID of the project.
+        :param file_id: The ID of the file to retrieve.
+        :return: File content or metadata.
+        """
+        endpoint = f"/projects/{project_id}/storage/files/{file_id}"
+        return await self.client._make_request("GET", endpoint)
+
+    async def delete_data(self, project_id: str, file_id: str):
+        """
+        Deletes a file from the decentralized storage platform.
+
+        :param project_id: The ID of the project.
+        :param file_id: The ID of the file to delete.
+        :return: Response indicating success or failure of deletion.
+        """
+        endpoint = f"/projects/{project_id}/storage/files/{file_id}"
+        return await self.client._make_request("DELETE", endpoint)
+
+    async def list_files(self, project_id: str, filters: dict = None):
+        """
+        Lists all files stored in a project, optionally filtered.
+
+        :param project_id: The ID of the project.
+        :param filters: Optional dictionary containing filter parameters (e.g., file type, date uploaded).
+        :return: List of files and their metadata.
+        """
+        endpoint = f"/projects/{project_id}/storage/files"
+        return await self.client._make_request("GET", endpoint, params=filters)
+
+
+class AsyncRewards:
+    """
+    Asyncio counterpart of `Rewards`.
+    """
+
+    def __init__(self, client):
+        """
+        Initializes the AsyncRewards class with a reference to the main AsyncClient.
+
+        :param client: An instance of the AsyncClient class for making API requests.
+        """
+        self.client = client
+
+    async def calculate_rewards(self, project_id: str, contributor_id: str):
+        """
+        Calculates rewards for a specific contributor in a project.
+
+        :param project_id: The ID of the project.
+        :param contributor_id: The ID of the contributor.
+        :return: Dictionary containing reward details (e.g., tokens earned).
+        """
+        endpoint = f"/projects/{project_id}/contributors/{contributor_id}/rewards/calculate"
+        return await self.client._make_request("GET", endpoint)
+
+    async def distribute_rewards(self, project_id: str, distribution_data: dict):
+        """
+        Distributes rewards to contributors in a project.
+
+        :param project_id: The ID of the project.
+        :param distribution_data: Dictionary containing distribution details (e.g., contributor IDs, amounts).
+        :return: Response indicating success or failure of the distribution.
+        """
+        endpoint = f"/projects/{project_id}/rewards/distribute"
+        return await self.client._make_request("POST", endpoint, json=distribution_data)
+
+    async def get_contributor_rewards(self, project_id: str, contributor_id: str):
+        """
+        Retrieves the reward history for a specific contributor in a project.
+
+        :param project_id: The ID of the project.
+        :param contributor_id: The ID of the contributor.
+        :return: List of reward transactions for the contributor.
+        """
+        endpoint = f"/projects/{project_id}/contributors/{contributor_id}/rewards"
+        return await self.client._make_request("GET", endpoint)
+
+    async def list_all_rewards(self, project_id: str, filters: dict = None):
+        """
+        Retrieves a list of all rewards in a project, optionally filtered.
+
+        :param project_id: The ID of the project.
+        :param filters: Optional dictionary containing filter parameters (e.g., date range).
+        :return: List of rewards.
+        """
+        endpoint = f"/projects/{project_id}/rewards"
+        return await self.client._make_request("GET", endpoint, params=filters)
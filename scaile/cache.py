@@ -0,0 +1,359 @@
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from .logging import logger
+
+# Default size cap of the on-disk content cache
+DEFAULT_CACHE_MAX_BYTES = 10 * 1024 ** 3
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Per-endpoint TTLs (seconds) of the response cache; `*` matches one path segment
+DEFAULT_RESPONSE_TTLS = {
+    "/projects": 60,
+    "/projects/*/annotations/*": 30,
+    "/projects/*/contributors/*/rewards": 30,
+    "/projects/*/storage/files": 15,
+}
+DEFAULT_RESPONSE_CACHE_ENTRIES = 1024
+
+
+class ContentCache:
+    """
+    On-disk, content-addressed cache for immutable Storage files.
+
+    Blobs are stored under a directory keyed by file ID / CID, with a SQLite index that
+    tracks their SHA-256 digest, size and last access time. SQLite serializes index
+    updates across processes and blobs are published with an atomic rename, so several
+    worker processes can share one cache directory. When the total size exceeds
+    `max_bytes`, the least recently used blobs are evicted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, verify: bool = True):
+        """
+        Initializes the cache, creating its directory and index if needed.
+
+        :param directory: Directory holding the cached blobs and index.
+        :param max_bytes: Maximum total size of cached blobs before LRU eviction.
+        :param verify: Check each blob against its recorded SHA-256 digest on read.
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.verify = verify
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, digest TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _connect(self):
+        """Opens a short-lived index connection; SQLite handles cross-process locking."""
+        return _closing_connection(os.path.join(self.directory, "index.sqlite3"))
+
+    def _blob_path(self, key: str) -> str:
+        """Returns the location of the blob for a key."""
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, "objects", name[:2], name)
+
+    def get_path(self, key: str):
+        """
+        Returns the local path of a cached blob and marks it as recently used.
+
+        A blob that is missing or fails integrity verification is dropped and
+        reported as a miss.
+
+        :param key: File ID or CID.
+        :return: Path to the cached content, or None on a miss.
+        """
+        with self._connect() as db:
+            row = db.execute("SELECT digest, size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        path = self._blob_path(key)
+        digest, size = row
+        try:
+            valid = os.path.getsize(path) == size and (not self.verify or _file_digest(path) == digest)
+        except OSError:
+            valid = False
+        if not valid:
+            logger.warning(f"Discarding corrupt cache entry for {key}")
+            self.discard(key)
+            return None
+
+        with self._connect() as db:
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return path
+
+    def __contains__(self, key: str) -> bool:
+        with self._connect() as db:
+            return db.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    @contextmanager
+    def writing(self, key: str):
+        """
+        Context manager yielding a temporary path to fill with the content for `key`.
+
+        On a clean exit the file is hashed, atomically moved into the cache and indexed;
+        if the block raises, the temporary file is removed and nothing is cached. Older
+        blobs are then evicted to make room; the new blob itself is kept even when it
+        alone exceeds `max_bytes`, until the next write evicts it.
+
+        :param key: File ID or CID.
+        """
+        path = self._blob_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        os.close(fd)
+        try:
+            yield tmp_path
+            digest = _file_digest(tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, digest, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, digest, size, time.time()),
+            )
+        self.evict(keep=key)
+
+    def fetch(self, key: str, fill) -> str:
+        """
+        Returns the cached path for `key`, calling `fill(tmp_path)` to populate it on a miss.
+
+        :param key: File ID or CID.
+        :param fill: Callable writing the content for `key` to the given path.
+        :return: Path to the cached content.
+        """
+        for _ in range(2):
+            path = self.get_path(key)
+            if path is None:
+                with self.writing(key) as tmp_path:
+                    fill(tmp_path)
+                path = self._blob_path(key)
+            # Another process may have evicted the blob in between; fetch it again then
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"Cache entry for {key} was evicted while it was being fetched")
+
+    def put_file(self, key: str, source_path: str) -> str:
+        """
+        Copies an existing local file into the cache.
+
+        :param key: File ID or CID.
+        :param source_path: File to copy.
+        :return: Path to the cached content.
+        """
+        with self.writing(key) as tmp_path:
+            with open(source_path, "rb") as src, open(tmp_path, "wb") as dst:
+                while chunk := src.read(HASH_CHUNK_SIZE):
+                    dst.write(chunk)
+        return self._blob_path(key)
+
+    def discard(self, key: str):
+        """
+        Removes a key and its blob from the cache.
+        """
+        with self._connect() as db:
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            os.remove(self._blob_path(key))
+        except FileNotFoundError:
+            pass
+
+    def size(self) -> int:
+        """Total size in bytes of the cached blobs."""
+        with self._connect() as db:
+            return db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self, keep: str = None):
+        """
+        Evicts least recently used blobs until the cache fits within `max_bytes`.
+
+        :param keep: Key that is never evicted, e.g. the one just written.
+        """
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            victims = []
+            if total > self.max_bytes:
+                for key, size in db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                    if total <= self.max_bytes:
+                        break
+                    if key == keep:
+                        continue
+                    victims.append(key)
+                    total -= size
+                db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in victims])
+            db.execute("COMMIT")
+
+        for key in victims:
+            try:
+                os.remove(self._blob_path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+        """
+        with self._connect() as db:
+            keys = [row[0] for row in db.execute("SELECT key FROM entries")]
+        for key in keys:
+            self.discard(key)
+
+
+class CachedResponse:
+    """
+    A cached response body with its expiry time and validator.
+    """
+
+    __slots__ = ("body", "etag", "expires")
+
+    def __init__(self, body: bytes, etag: str, expires: float):
+        self.body = body
+        self.etag = etag
+        self.expires = expires
+
+    @property
+    def fresh(self) -> bool:
+        """True while the entry is within its TTL."""
+        return time.monotonic() < self.expires
+
+
+class ResponseCache:
+    """
+    In-process TTL cache for responses of read-only (GET) endpoints.
+
+    Only endpoints matching one of the `ttls` patterns are cached. Memory is bounded by
+    `max_entries` with LRU eviction. Expired entries that carried an ETag are kept and
+    revalidated with `If-None-Match`, so an unchanged resource costs a 304 instead of a
+    full body. Mutating requests invalidate cached entries of the affected project.
+    """
+
+    def __init__(self, ttls: dict = None, max_entries: int = DEFAULT_RESPONSE_CACHE_ENTRIES):
+        """
+        Initializes the cache.
+
+        :param ttls: Mapping of endpoint patterns (e.g. "/projects/*/annotations/*") to TTLs in seconds.
+        :param max_entries: Maximum number of cached responses.
+        """
+        self.max_entries = max_entries
+        self._ttls = [
+            (re.compile(re.escape(pattern).replace(r"\*", "[^/]+") + "$"), ttl)
+            for pattern, ttl in (DEFAULT_RESPONSE_TTLS if ttls is None else ttls).items()
+        ]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, path: str):
+        """
+        Returns the TTL configured for a path, or None if the path is not cacheable.
+        """
+        for pattern, ttl in self._ttls:
+            if pattern.match(path):
+                return ttl
+        return None
+
+    @staticmethod
+    def key(path: str, params: dict = None):
+        """Builds the cache key for a path and its query parameters."""
+        return (path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+    def get(self, key):
+        """
+        Returns the entry for a key (fresh or awaiting revalidation) and marks it as recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, body: bytes, etag: str, ttl: float):
+        """
+        Stores a response body, evicting the least recently used entries past `max_entries`.
+        """
+        entry = CachedResponse(body, etag, time.monotonic() + ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key, ttl: float):
+        """
+        Extends an entry's lifetime after a successful (304) revalidation.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = time.monotonic() + ttl
+
+    def drop_stale(self, key):
+        """
+        Drops an expired entry that cannot be revalidated.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, path: str):
+        """
+        Invalidates entries affected by a mutating request to `path`.
+
+        Everything cached for the same project is dropped, together with the project
+        listing; paths outside a project clear the whole cache.
+        """
+        segments = path.strip("/").split("/")
+        with self._lock:
+            if len(segments) < 2 or segments[0] != "projects":
+                self._entries.clear()
+                return
+            scope = f"/projects/{segments[1]}"
+            for key in [k for k in self._entries if k[0] == "/projects" or k[0] == scope
+                        or k[0].startswith(scope + "/")]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Removes every cached response.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@contextmanager
+def _closing_connection(path: str):
+    """Yields an autocommit SQLite connection and closes it afterwards."""
+    db = sqlite3.connect(path, timeout=30, isolation_level=None)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _file_digest(path: str) -> str:
+    """Computes the SHA-256 hex digest of a file in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,37 +1,318 @@
-from .logging import logger
+import logging
+import time
+from functools import partial
+from urllib.parse import urlsplit
 import requests
+from .cache import ResponseCache
+from .codec import JSONCodec, get_codec
+from .compression import RequestCompression
+from .configs import config_value
+from .instrumentation import Instrument, RequestMetrics, body_size, endpoint_template
+from .logging import log_event, logger
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy
+from .transport import build_session
 
 class Client:
     """
     The main client for interacting with the Scaile API.
     """
 
-    def __init__(self, api_key: str, base_url: str = "https://api.scaile.com"):
+    def __init__(self, api_key: str, base_url: str = "https://api.scaile.com",
+                 timeout=None, connect_timeout=None,
+                 pool_connections=None, pool_maxsize=None, pool_block=False,
+                 response_cache: ResponseCache = None, retry_policy: RetryPolicy = None,
+                 rate_limiter: TokenBucket = None, instruments=None, codec: JSONCodec = None,
+                 compression: RequestCompression = None):
         """
-        Initializes the client with authentication and base URL.
+        Initializes the client with authentication, base URL and a pooled HTTP transport.
 
         :param api_key: API key for authentication.
         :param base_url: Base URL for the Scaile API.
+        :param timeout: Read timeout in seconds, or a (connect, read) tuple. Defaults to `api.timeout` from the config.
+        :param connect_timeout: Connect timeout in seconds. Defaults to `api.connect_timeout` from the config.
+        :param pool_connections: Number of per-host connection pools to cache.
+        :param pool_maxsize: Maximum number of keep-alive connections per host.
+        :param pool_block: Block when the pool is exhausted instead of opening extra connections.
+        :param response_cache: Optional `ResponseCache` for read-only endpoints (e.g. `ResponseCache()`).
+        :param retry_policy: Retry and backoff policy. Defaults to `RetryPolicy()` with `annotation.max_retries` from the config.
+        :param rate_limiter: Optional `TokenBucket` (or `FileTokenBucket`) shared across threads or processes.
+        :param instruments: Optional `Instrument` hooks (e.g. `MetricsCollector()`) called around every request.
+        :param codec: JSON codec or codec name ("orjson", "stdlib"). Defaults to the fastest installed backend.
+        :param compression: `RequestCompression`, or "gzip"/"zstd", for large JSON request bodies.
+            Defaults to `api.compression` from the config (off when unset).
         """
         self.api_key = api_key
-        self.base_url = base_url
+        self.base_url = base_url.rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.session = build_session(
+            timeout=timeout,
+            connect_timeout=connect_timeout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.response_cache = response_cache
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.instruments = list(instruments or ())
+        self.codec = get_codec(codec)
+        if compression is None:
+            compression = config_value("api", "compression")
+        self.compression = RequestCompression.from_config(
+            compression, config_value("api", "compression_min_size")
+        )
 
-    def make_request(self, endpoint, payload):
-        logger.debug(f"Sending request to {endpoint} with payload: {payload}")
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the underlying session and releases all pooled connections.
+        """
+        self.session.close()
+
+    def add_instrument(self, instrument: Instrument):
+        """
+        Registers request instrumentation hooks.
+
+        :param instrument: An `Instrument`, e.g. a `MetricsCollector`.
+        :return: The instrument, for chaining.
+        """
+        self.instruments.append(instrument)
+        return instrument
+
+    def _url(self, endpoint: str) -> str:
+        """Joins an API endpoint onto the base URL."""
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def _make_request(self, method: str, endpoint: str, headers: dict = None, **kwargs):
+        """
+        Sends a request through the pooled session and decodes the JSON response.
+
+        When a response cache is configured, cacheable GETs are served from it and
+        mutating requests invalidate the affected entries.
+
+        :param method: HTTP method (GET, POST, PUT, DELETE).
+        :param endpoint: API endpoint, relative to the base URL.
+        :param headers: Optional headers merged over the default client headers.
+        :param kwargs: Extra arguments forwarded to the session (params, json, files, data, ...).
+        :return: Decoded JSON body, or None for empty responses.
+        """
+        headers = {**self.headers, **headers} if headers else self.headers
+        if "files" in kwargs:
+            # Let requests set the multipart boundary itself
+            headers = {k: v for k, v in headers.items() if k != "Content-Type"}
 
+        send = self._send
+        if "json" in kwargs:
+            # Encode once with the client's codec; retries resend the same bytes
+            body = kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+            if self.compression is not None:
+                kwargs["data"], encoding = self.compression.compress(body)
+                if encoding is not None:
+                    headers = {**headers, "Content-Encoding": encoding}
+                    send = partial(self._send_compressed, body)
+
+        cache = self.response_cache
+        if cache is not None:
+            path = urlsplit(endpoint).path
+            if method.upper() != "GET":
+                try:
+                    return self._decode(send(method, endpoint, headers, **kwargs))
+                finally:
+                    cache.invalidate(path)
+            ttl = cache.ttl_for(path)
+            if ttl is not None:
+                return self._cached_get(cache, cache.key(path, kwargs.get("params")), ttl, endpoint, headers, **kwargs)
+
+        return self._decode(send(method, endpoint, headers, **kwargs))
+
+    def _send_compressed(self, plain_body: bytes, method: str, endpoint: str, headers: dict, **kwargs):
+        """
+        Sends a compressed request body. If the server rejects the encoding with 415,
+        compression is turned off for this client and the plain body is sent instead.
+        """
         try:
-            response = self.session.post(endpoint, json=payload)
-            response.raise_for_status()
-            logger.info(f"Successful response from {endpoint}")
-            return response.json()
+            return self._send(method, endpoint, headers, **kwargs)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 415:
+                raise
+        logger.warning(f"Server rejected {headers['Content-Encoding']} request bodies, disabling compression")
+        self.compression = None
+        headers = {k: v for k, v in headers.items() if k != "Content-Encoding"}
+        return self._send(method, endpoint, headers, **{**kwargs, "data": plain_body})
+
+    def _send(self, method: str, endpoint: str, headers: dict, **kwargs):
+        """
+        Sends a request, waiting on the rate limiter and retrying throttled or failed
+        attempts according to the retry policy. Raises for HTTP error statuses.
+        """
+        url = self._url(endpoint)
+        if not self.instruments:
+            return self._attempt(method, endpoint, url, headers, None, **kwargs)
+
+        metrics = RequestMetrics(method, endpoint_template(urlsplit(url).path), url)
+        self._notify("before_request", metrics)
+        start = time.perf_counter()
+        try:
+            response = self._attempt(method, endpoint, url, headers, metrics, **kwargs)
         except Exception as e:
-            logger.error(f"Error during API call to {endpoint}: {str(e)}")
+            metrics.error = type(e).__name__
+            response = getattr(e, "response", None)
             raise
+        else:
+            return response
+        finally:
+            metrics.duration = time.perf_counter() - start
+            if response is not None:
+                _record_response(metrics, response, kwargs.get("stream", False))
+            self._notify("after_request", metrics)
+
+    def _attempt(self, method: str, endpoint: str, url: str, headers: dict, metrics, **kwargs):
+        """Runs the retry loop of `_send`, recording queue wait and retries into `metrics` if given."""
+        policy = self.retry_policy
+        limiter = self.rate_limiter
+        # File objects are consumed by the first attempt and cannot be resent
+        retryable = "files" not in kwargs
+        attempt = 0
+
+        while True:
+            if limiter is not None:
+                if metrics is not None:
+                    waited = time.perf_counter()
+                    limiter.acquire()
+                    metrics.queue_wait += time.perf_counter() - waited
+                else:
+                    limiter.acquire()
+            if metrics is not None:
+                metrics.retries = attempt
+            if logger.isEnabledFor(logging.DEBUG):
+                log_event(logging.DEBUG, "api.request", method=method, url=url, attempt=attempt,
+                          params=kwargs.get("params"), body_size=body_size(kwargs.get("data")))
+
+            try:
+                response = getattr(self.session, method.lower())(url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if retryable and policy.should_retry(method, attempt, headers=headers):
+                    logger.warning(f"Retrying {method} {endpoint} after error: {str(e)}")
+                    policy.sleep(attempt)
+                    attempt += 1
+                    continue
+                logger.error(f"Error during API call to {endpoint}: {str(e)}")
+                raise
+
+            status = response.status_code
+            if status in policy.retry_statuses:
+                if limiter is not None and status == 429:
+                    limiter.on_throttle()
+                if retryable and policy.should_retry(method, attempt, status=status, headers=headers):
+                    logger.warning(f"Retrying {method} {endpoint} after HTTP {status}")
+                    retry_after = response.headers.get("Retry-After")
+                    response.close()
+                    policy.sleep(attempt, retry_after)
+                    attempt += 1
+                    continue
+
+            try:
+                response.raise_for_status()
+            except Exception as e:
+                response.close()
+                logger.error(f"Error during API call to {endpoint}: {str(e)}")
+                raise
+            if limiter is not None:
+                limiter.on_success()
+            return response
 
+    def _notify(self, hook: str, metrics: RequestMetrics):
+        """Calls a hook on every instrument, logging instead of raising on failure."""
+        for instrument in self.instruments:
+            try:
+                getattr(instrument, hook)(metrics)
+            except Exception as e:
+                logger.warning(f"Instrument {type(instrument).__name__}.{hook} failed: {str(e)}")
+
+    def _decode(self, response):
+        """Decodes a JSON response body from its raw bytes, returning None for empty responses."""
+        if response.status_code == 204:
+            return None
+        return self._decode_body(response.content)
+
+    def _decode_body(self, body: bytes):
+        """Decodes a raw JSON body, returning None when it is empty."""
+        return self.codec.loads(body) if body else None
+
+    def _cached_get(self, cache, key, ttl: float, endpoint: str, headers: dict, **kwargs):
+        """Serves a GET from the response cache, revalidating stale entries with their ETag."""
+        entry = cache.get(key)
+        if entry is not None:
+            if entry.fresh:
+                return self._decode_body(entry.body)
+            if entry.etag:
+                headers = {**headers, "If-None-Match": entry.etag}
+            else:
+                cache.drop_stale(key)
+                entry = None
+
+        response = self._send("GET", endpoint, headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(key, ttl)
+            return self._decode_body(entry.body)
+        if response.status_code == 204:
+            return None
+
+        cache.set(key, response.content, response.headers.get("ETag"), ttl)
+        return self._decode_body(response.content)
+
+    def _stream_request(self, method: str, endpoint: str, headers: dict = None, **kwargs):
+        """
+        Sends a request and returns the raw streaming response without reading the body.
+
+        The caller is responsible for closing the response (it can be used as a context manager).
+
+        :param method: HTTP method (GET, HEAD, ...).
+        :param endpoint: API endpoint, relative to the base URL.
+        :param headers: Optional headers merged over the default client headers.
+        :param kwargs: Extra arguments forwarded to the session.
+        :return: A `requests.Response` opened with `stream=True`.
+        """
+        headers = {**self.headers, **headers} if headers else self.headers
+        return self._send(method, endpoint, headers, stream=True, **kwargs)
+
+    def get(self, endpoint: str, params: dict = None):
+        """Sends a GET request to the given endpoint."""
+        return self._make_request("GET", endpoint, params=params)
+
+    def post(self, endpoint: str, **kwargs):
+        """Sends a POST request to the given endpoint."""
+        return self._make_request("POST", endpoint, **kwargs)
+
+    def put(self, endpoint: str, **kwargs):
+        """Sends a PUT request to the given endpoint."""
+        return self._make_request("PUT", endpoint, **kwargs)
+
+    def delete(self, endpoint: str):
+        """Sends a DELETE request to the given endpoint."""
+        return self._make_request("DELETE", endpoint)
+
+    def make_request(self, endpoint, payload):
+        """
+        Sends a JSON payload to the given endpoint with a POST request.
+
+        :param endpoint: API endpoint, relative to the base URL.
+        :param payload: JSON-serializable request body.
+        :return: Decoded JSON response.
+        """
+        return self._make_request("POST", endpoint, json=payload)
 
     def authenticate(self):
         """
@@ -82,6 +363,24 @@ class Client:
         endpoint = f"/projects/{project_id}/annotations"
         return self._make_request("GET", endpoint)
 
+    def iter_project_annotations(self, project_id: str, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True):
+        """
+        Lazily iterates over annotations for a specific project, following pagination cursors.
+
+        The next page is fetched in the background while the current one is consumed,
+        so memory stays bounded by the page size.
+
+        :param project_id: The ID of the project.
+        :param page_size: Number of items requested per page.
+        :param prefetch: Fetch the next page while the current one is consumed.
+        :return: Generator of annotations.
+        """
+        endpoint = f"/projects/{project_id}/annotations"
+        return iter_items(
+            lambda params: self._make_request("GET", endpoint, params=params),
+            None, page_size=page_size, prefetch=prefetch,
+        )
+
     def submit_annotation(self, project_id: str, annotation_data: dict):
         """
         Submits an annotation for a specific project.
@@ -91,4 +390,20 @@ class Client:
         :return: Details of the submitted annotation.
         """
         endpoint = f"/projects/{project_id}/annotations"
-        return self._make_request("POST", endpoint, json=annotation_data)
\ No newline at end of file
+        return self._make_request("POST", endpoint, json=annotation_data)
+
+
+def _record_response(metrics: RequestMetrics, response, stream: bool):
+    """Copies status, sizes and time to first byte of the final response into `metrics`."""
+    metrics.status = getattr(response, "status_code", None)
+    request = getattr(response, "request", None)
+    if request is not None:
+        metrics.bytes_sent = body_size(getattr(request, "body", None))
+    elapsed = getattr(response, "elapsed", None)
+    if elapsed is not None:
+        metrics.ttfb = elapsed.total_seconds()
+    length = response.headers.get("Content-Length") if getattr(response, "headers", None) is not None else None
+    if isinstance(length, str) and length.isdigit():
+        metrics.bytes_received = int(length)
+    elif not stream and isinstance(getattr(response, "content", None), bytes):
+        metrics.bytes_received = len(response.content)
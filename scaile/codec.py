@@ -0,0 +1,106 @@
+import abc
+import json
+import os
+
+# Backend used when SCAILE_JSON_CODEC is not set: orjson if installed, else the stdlib
+DEFAULT_CODEC = "auto"
+
+
+class JSONCodec(abc.ABC):
+    """
+    Encodes and decodes JSON bodies.
+
+    `dumps` returns UTF-8 bytes ready to send and `loads` accepts bytes as received,
+    so bodies never take a detour through an intermediate `str`.
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def dumps(self, obj) -> bytes:
+        """Encodes an object to UTF-8 JSON bytes."""
+
+    @abc.abstractmethod
+    def loads(self, data):
+        """
+        :param data: bytes, bytearray, memoryview or str.
+        :raises ValueError: If the data is not valid JSON.
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class StdlibJSONCodec(JSONCodec):
+    """
+    Codec backed by the standard library `json` module.
+    """
+
+    name = "stdlib"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec backed by `orjson` (`pip install scaile-sdk[fast]`), which encodes straight to
+    bytes and parses bytes without decoding them to `str` first.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        # Match the stdlib for non-string dict keys and serialize numpy arrays natively
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+CODECS = {
+    "stdlib": StdlibJSONCodec,
+    "orjson": OrjsonCodec,
+}
+
+_codecs = {}
+
+
+def get_codec(name: str = None) -> JSONCodec:
+    """
+    Returns a shared codec instance.
+
+    :param name: "orjson", "stdlib" or "auto" (the fastest installed backend). Defaults
+        to the `SCAILE_JSON_CODEC` environment variable, then "auto".
+    :raises ValueError: For an unknown codec name.
+    :raises ImportError: If the requested backend is not installed.
+    """
+    if isinstance(name, JSONCodec):
+        return name
+    if name is None:
+        name = os.getenv("SCAILE_JSON_CODEC", DEFAULT_CODEC)
+    codec = _codecs.get(name)
+    if codec is not None:
+        return codec
+
+    if name == "auto":
+        try:
+            codec = get_codec("orjson")
+        except ImportError:
+            codec = get_codec("stdlib")
+    elif name in CODECS:
+        codec = CODECS[name]()
+    else:
+        raise ValueError(f"Unknown JSON codec {name!r}; expected one of: auto, {', '.join(CODECS)}")
+    _codecs[name] = codec
+    return codec
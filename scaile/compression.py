@@ -0,0 +1,87 @@
+import gzip
+import threading
+
+# Request bodies below this size are sent uncompressed
+DEFAULT_MIN_SIZE = 16 * 1024  # bytes
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd compression requires the zstandard package. "
+            "Install it with: pip install scaile-sdk[zstd]"
+        ) from None
+    return zstandard
+
+
+class RequestCompression:
+    """
+    Opt-in compression of JSON request bodies.
+
+    Bodies of at least `min_size` bytes are compressed with gzip or zstd and sent with
+    a `Content-Encoding` header; smaller bodies, and bodies that do not shrink, are
+    sent as they are.
+
+    Compressed responses need no setup: requests advertises every encoding urllib3 can
+    decode (gzip and deflate, plus br and zstd when `brotli` or `zstandard` is
+    installed) and decompresses the body incrementally while it is read.
+    """
+
+    def __init__(self, encoding: str = "gzip", min_size: int = DEFAULT_MIN_SIZE, level: int = None):
+        """
+        :param encoding: "gzip" or "zstd" (requires the `zstandard` package).
+        :param min_size: Smallest body, in bytes, worth compressing.
+        :param level: Compression level; defaults to 6 for gzip and 3 for zstd.
+        """
+        if encoding not in DEFAULT_LEVELS:
+            raise ValueError(f"Unsupported request compression {encoding!r}; expected gzip or zstd")
+        self.encoding = encoding
+        self.min_size = min_size
+        self.level = DEFAULT_LEVELS[encoding] if level is None else level
+        self._zstandard = _import_zstandard() if encoding == "zstd" else None
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, value, min_size: int = None):
+        """
+        Builds the compression of a client from an argument or config value.
+
+        :param value: A `RequestCompression`, an encoding name, or None/"none" to disable.
+        :param min_size: Threshold used when `value` is an encoding name.
+        :return: A `RequestCompression`, or None.
+        """
+        if value is None or isinstance(value, RequestCompression):
+            return value
+        if str(value).lower() in ("", "none", "off", "false"):
+            return None
+        return cls(str(value).lower(), DEFAULT_MIN_SIZE if min_size is None else min_size)
+
+    def compress(self, body: bytes):
+        """
+        Compresses a request body if it is large enough and actually shrinks.
+
+        :return: Tuple of (body, content_encoding); the encoding is None when the body
+            is returned unchanged.
+        """
+        if len(body) < self.min_size:
+            return body, None
+        if self.encoding == "gzip":
+            compressed = gzip.compress(body, compresslevel=self.level, mtime=0)
+        else:
+            compressed = self._zstd_compressor().compress(body)
+        if len(compressed) >= len(body):
+            return body, None
+        return compressed, self.encoding
+
+    def _zstd_compressor(self):
+        """ZstdCompressor objects are not thread-safe, so each thread gets its own."""
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._local.compressor = self._zstandard.ZstdCompressor(level=self.level)
+        return compressor
+
+    def __repr__(self):
+        return f"RequestCompression({self.encoding!r}, min_size={self.min_size}, level={self.level})"
@@ -2,49 +2,240 @@
 
 from pathlib import Path
 import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Dict, Any
-import yaml
-from dotenv import load_dotenv
-import os
 
 class Config:
     DEBUG = os.getenv("SCAILE_DEBUG", "False").lower() == "true"
 
     WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "default_secret_key")
+    # Comma-separated secrets accepted during a rotation; defaults to WEBHOOK_SECRET
+    WEBHOOK_SECRETS = [s.strip() for s in os.getenv("WEBHOOK_SECRETS", "").split(",") if s.strip()] or [WEBHOOK_SECRET]
+    WEBHOOK_MAX_PAYLOAD_SIZE = int(os.getenv("WEBHOOK_MAX_PAYLOAD_SIZE", 1024 * 1024))
     
+# Types of known settings; values from YAML and the environment are coerced at load time
+SCHEMA = {
+    "api": {
+        "base_url": str,
+        "version": str,
+        "timeout": float,
+        "connect_timeout": float,
+        "pool_connections": int,
+        "pool_maxsize": int,
+        "compression": str,
+        "compression_min_size": int,
+    },
+    "annotation": {
+        "batch_size": int,
+        "max_retries": int,
+    },
+    "storage": {
+        "type": str,
+        "path": str,
+    },
+    "rewards": {
+        "enabled": bool,
+        "calculation_method": str,
+    },
+}
+ENV_PREFIX = "SCAILE_"
+ENV_NESTING = "__"  # SCAILE_API__TIMEOUT overrides api.timeout
+TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+FALSE_VALUES = frozenset({"0", "false", "no", "off"})
+
+
+def coerce(value: Any, type_: type, name: str = "value") -> Any:
+    """
+    Converts a config value to the type declared in the schema.
+
+    :param value: Value read from YAML or the environment.
+    :param type_: Target type (bool, int, float or str).
+    :param name: Dotted setting name used in error messages.
+    :raises ValueError: If the value cannot be converted.
+    """
+    if value is None or isinstance(value, type_) and not (type_ is int and isinstance(value, bool)):
+        return value
+    if type_ is bool:
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid boolean for {name}: {value!r}")
+    try:
+        if type_ is int and isinstance(value, str):
+            return int(value.strip())
+        return type_(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {type_.__name__} for {name}: {value!r}") from None
+
+
+class Section(Mapping):
+    """
+    Read-only config section.
+
+    Keys are exposed as plain instance attributes (`settings.api.timeout`) and through
+    the mapping interface (`settings.api["timeout"]`, `.get()`), which older code uses.
+    """
+
+    def __init__(self, name: str, values: dict):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+        for key, value in values.items():
+            if key.isidentifier() and not hasattr(Mapping, key):
+                object.__setattr__(self, key, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Settings section {self._name!r} is read-only")
+
+    __delattr__ = __setattr__
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"Section({self._name!r}, {dict(self._values)!r})"
+
+
 class Settings:
+    """
+    Typed, frozen configuration of one environment.
+
+    Values come from `configs/config.<env>.yaml`, overridden by environment variables:
+    `SCAILE_<SECTION>__<KEY>` for a single key, or `SCAILE_<SECTION>` holding a YAML
+    mapping merged into the section. Known keys are coerced to their `SCHEMA` types
+    once at load time; each section then becomes a read-only `Section` attribute.
+    Use `load_settings()` to share one instance per environment.
+    """
+
     def __init__(self, env: str = "development"):
         """Initialize settings with the specified environment."""
-        self.env = env
-        self.base_dir = Path(__file__).parent.parent
-        
+        object.__setattr__(self, "env", env)
+        object.__setattr__(self, "base_dir", Path(__file__).parent.parent)
+
         # Load environment variables from .env file
+        from dotenv import load_dotenv
         load_dotenv(self.base_dir / f".env.{env}")
-        
-        # Load configuration from YAML
-        self.config = self._load_config()
-        
-        # Override with environment variables
-        self._override_from_env()
-    
+
+        # Load configuration from YAML, override with environment variables, then coerce types
+        config = self._load_config()
+        self._override_from_env(config)
+        sections = {}
+        for name, values in config.items():
+            if not isinstance(values, dict):
+                raise ValueError(f"Config section {name!r} must be a mapping, got {values!r}")
+            schema = SCHEMA.get(name, {})
+            sections[name] = Section(name, {
+                key: coerce(value, schema[key], f"{name}.{key}") if key in schema else value
+                for key, value in values.items()
+            })
+            object.__setattr__(self, name, sections[name])
+        object.__setattr__(self, "config", MappingProxyType(sections))
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
+        import yaml
         config_path = self.base_dir / "configs" / f"config.{self.env}.yaml"
         with open(config_path) as f:
-            return yaml.safe_load(f)
-    
-    def _override_from_env(self) -> None:
+            return yaml.safe_load(f) or {}
+
+    def _override_from_env(self, config: Dict[str, Any]) -> None:
         """Override configuration with environment variables."""
-        for key in self.config.keys():
-            env_key = f"SCAILE_{key.upper()}"
-            if env_value := os.getenv(env_key):
-                self.config[key] = env_value
-    
+        import yaml
+        for env_key, env_value in os.environ.items():
+            if not env_key.startswith(ENV_PREFIX) or not env_value:
+                continue
+            name = env_key[len(ENV_PREFIX):].lower()
+            if ENV_NESTING in name:
+                section, key = name.split(ENV_NESTING, 1)
+                if section in config or section in SCHEMA:
+                    config.setdefault(section, {})[key] = _parse_env_value(env_value, SCHEMA.get(section, {}).get(key))
+            elif name in config:
+                values = yaml.safe_load(env_value)
+                if not isinstance(values, dict):
+                    raise ValueError(f"{env_key} must be a YAML mapping, e.g. {env_key}='{{timeout: 10}}'")
+                config[name] = {**config[name], **values}
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings are read-only")
+
     def __getattr__(self, name: str) -> Any:
-        """Get configuration value by attribute name."""
-        if name in self.config:
-            return self.config[name]
+        """Only reached for sections that do not exist."""
         raise AttributeError(f"No configuration found for: {name}")
 
-# Create default settings instance
-settings = Settings(os.getenv("SCAILE_ENV", "development"))
\ No newline at end of file
+
+def _parse_env_value(value: str, type_: type = None) -> Any:
+    """Parses an environment override: kept as a string for typed keys, YAML scalar otherwise."""
+    if type_ is not None:
+        return value
+    import yaml
+    try:
+        return yaml.safe_load(value)
+    except yaml.YAMLError:
+        return value
+
+
+_settings = {}
+_settings_lock = threading.Lock()
+
+
+def load_settings(env: str = None) -> Settings:
+    """
+    Returns the settings of an environment, loading and caching them on first use.
+
+    :param env: Environment name; defaults to `SCAILE_ENV` or "development".
+    """
+    if env is None:
+        env = os.getenv("SCAILE_ENV", "development")
+    settings = _settings.get(env)
+    if settings is None:
+        with _settings_lock:
+            settings = _settings.get(env)
+            if settings is None:
+                settings = _settings[env] = Settings(env)
+    return settings
+
+
+def get_settings() -> Settings:
+    """
+    Returns the settings of the `SCAILE_ENV` environment, loading them on first use.
+    """
+    return load_settings()
+
+
+def clear_settings_cache():
+    """
+    Forgets loaded settings, so the next access re-reads the files and environment.
+    """
+    with _settings_lock:
+        _settings.clear()
+
+
+def __getattr__(name):
+    # `configs.settings` is loaded on first access instead of at import time
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def config_value(section: str, key: str, default: Any = None) -> Any:
+    """
+    Returns `<section>.<key>` from the active settings, or `default` when it is not set.
+
+    :param section: Top-level config section (e.g. "api", "annotation").
+    :param key: Key inside the section.
+    :param default: Value returned when the section or key is missing, or when the
+        environment has no config file.
+    """
+    try:
+        value = getattr(load_settings(), section)
+    except (AttributeError, FileNotFoundError):
+        return default
+    return value.get(key, default)
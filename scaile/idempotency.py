@@ -0,0 +1,166 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Defaults of the webhook idempotency store
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+# Payload field identifying an event; a top-level "id" names the resource, not the event
+EVENT_ID_KEY = "event_id"
+# Request header carrying the sender's delivery ID, used when the payload has no event_id
+DELIVERY_ID_HEADER = "X-Delivery-Id"
+
+
+def event_id_of(data: dict):
+    """
+    Returns the identifier used to deduplicate a webhook event.
+
+    Uses the payload's `event_id` field; receivers copy the `X-Delivery-Id` header
+    into it when the payload has none (see `attach_delivery_id`). Events with neither
+    have no identity: identical payloads may be legitimately repeated events, so they
+    are never deduplicated.
+
+    :param data: Decoded webhook payload.
+    :return: Event identifier, or None.
+    """
+    if data.get(EVENT_ID_KEY) is not None:
+        return str(data[EVENT_ID_KEY])
+    return None
+
+
+def attach_delivery_id(data: dict, delivery_id) -> dict:
+    """
+    Records the sender's delivery ID as the payload's `event_id` unless it has one,
+    so every later `event_id_of(data)` (claim, release) agrees.
+
+    :param data: Decoded webhook payload, updated in place.
+    :param delivery_id: Value of the delivery ID header, or None.
+    """
+    if delivery_id and data.get(EVENT_ID_KEY) is None:
+        data[EVENT_ID_KEY] = delivery_id
+    return data
+
+
+class SQLiteIdempotencyStore:
+    """
+    Persistent record of claimed event IDs with TTL expiry, shared across restarts
+    and across processes using the same database file.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, purge_every: int = 1000):
+        """
+        :param path: SQLite database file.
+        :param ttl: Seconds after which an event ID may be processed again.
+        :param purge_every: Number of claims between purges of expired rows.
+        """
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._claims = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS webhook_events_seen (event_id TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS webhook_events_seen_at ON webhook_events_seen (seen_at)")
+
+    def claim(self, event_id: str) -> bool:
+        """
+        Atomically records an event ID.
+
+        :return: True if the ID was new (or expired), False if it is a duplicate.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO webhook_events_seen (event_id, seen_at) VALUES (?, ?) "
+                "ON CONFLICT(event_id) DO UPDATE SET seen_at = excluded.seen_at WHERE seen_at < ?",
+                (event_id, now, now - self.ttl),
+            )
+            self._claims += 1
+            if self._claims % self.purge_every == 0:
+                self._db.execute("DELETE FROM webhook_events_seen WHERE seen_at < ?", (now - self.ttl,))
+            return cursor.rowcount == 1
+
+    def release(self, event_id: str):
+        """Forgets an event ID, so a redelivery is processed again."""
+        with self._lock:
+            self._db.execute("DELETE FROM webhook_events_seen WHERE event_id = ?", (event_id,))
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+class IdempotencyStore:
+    """
+    Deduplicates webhook events by ID.
+
+    A bounded in-memory LRU answers repeated IDs in O(1) without touching disk. When a
+    `path` is given, new IDs are also claimed in a `SQLiteIdempotencyStore`, so
+    duplicates are recognized after a restart or by other processes.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL, path: str = None):
+        """
+        :param max_entries: Maximum number of IDs remembered in memory.
+        :param ttl: Seconds after which an event ID may be processed again.
+        :param path: Optional SQLite file for persistent deduplication.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persistent = SQLiteIdempotencyStore(path, ttl) if path else None
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, event_id: str) -> bool:
+        """
+        Records an event ID before processing it. Events without an ID (None) are
+        always processed.
+
+        :return: True if the event should be processed, False if it is a duplicate.
+        """
+        if event_id is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            seen_at = self._seen.get(event_id)
+            if seen_at is not None and now - seen_at < self.ttl:
+                self._seen.move_to_end(event_id)
+                return False
+            if self.persistent is None:
+                self._remember(event_id, now)
+                return True
+
+        # The SQLite upsert is atomic, so concurrent claims of a new ID have one winner
+        is_new = self.persistent.claim(event_id)
+        with self._lock:
+            self._remember(event_id, now)
+        return is_new
+
+    def _remember(self, event_id: str, now: float):
+        """Records an ID in the LRU, evicting the oldest past `max_entries`. Caller holds the lock."""
+        self._seen[event_id] = now
+        self._seen.move_to_end(event_id)
+        if len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+    def release(self, event_id: str):
+        """
+        Forgets an event ID, e.g. when it could not be processed, so a redelivery is handled.
+        """
+        if event_id is None:
+            return
+        with self._lock:
+            self._seen.pop(event_id, None)
+        if self.persistent is not None:
+            self.persistent.release(event_id)
+
+    def __contains__(self, event_id: str) -> bool:
+        with self._lock:
+            seen_at = self._seen.get(event_id)
+        return seen_at is not None and time.monotonic() - seen_at < self.ttl
+
+    def __len__(self):
+        return len(self._seen)
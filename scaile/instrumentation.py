@@ -0,0 +1,244 @@
+import bisect
+import re
+import threading
+
+# Path segments following these collection names are resource IDs
+ID_COLLECTIONS = frozenset({"projects", "annotations", "contributors", "rewards", "files", "uploads", "parts"})
+# Actions and sub-resources that may follow a collection name but are never IDs
+ACTION_SEGMENTS = frozenset({"distribute", "calculate", "complete", "content", "upload"})
+ID_PATTERN = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$")
+# Upper bounds of the latency histograms, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Replaces resource IDs in an API path with `{id}`, so metrics of the same endpoint
+    are grouped together (`/projects/42/annotations` -> `/projects/{id}/annotations`).
+    Known action names such as `distribute` are kept as they are.
+
+    :param path: URL path of the request.
+    :return: Endpoint template.
+    """
+    segments = path.strip("/").split("/")
+    previous = None
+    for i, segment in enumerate(segments):
+        if segment not in ACTION_SEGMENTS and (previous in ID_COLLECTIONS or ID_PATTERN.match(segment)):
+            segments[i] = "{id}"
+            previous = None
+        else:
+            previous = segment
+    return "/" + "/".join(segments)
+
+
+class RequestMetrics:
+    """
+    Measurements of one logical API request, including its retries.
+
+    Passed to `Instrument.before_request` with only the request fields set, then to
+    `Instrument.after_request` once the request has finished. Timings are in seconds
+    and are None when the transport does not expose them (requests gives no DNS or
+    connect timings; `ttfb` is the time until the response headers were parsed).
+    """
+
+    __slots__ = ("method", "endpoint", "url", "status", "bytes_sent", "bytes_received", "duration",
+                 "queue_wait", "dns_time", "connect_time", "ttfb", "retries", "error")
+
+    def __init__(self, method: str, endpoint: str, url: str):
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = None
+        self.duration = None
+        self.queue_wait = 0.0
+        self.dns_time = None
+        self.connect_time = None
+        self.ttfb = None
+        self.retries = 0
+        self.error = None
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"RequestMetrics({self.method} {self.endpoint} status={self.status} duration={self.duration})"
+
+
+class Instrument:
+    """
+    Base class of request instrumentation hooks registered on a `Client`.
+
+    Subclasses override either hook. Exceptions raised by a hook are logged and do not
+    affect the request.
+    """
+
+    def before_request(self, metrics: RequestMetrics):
+        """Called before the first attempt of a request."""
+
+    def after_request(self, metrics: RequestMetrics):
+        """Called once the request has succeeded or failed for good."""
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket bounds, as used by Prometheus.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket containing it.
+
+        :return: Bound in seconds, `inf` if it falls in the overflow bucket, or 0.0 when empty.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsCollector(Instrument):
+    """
+    In-memory collector of request metrics, grouped by method, endpoint template and status.
+
+    Keeps latency and time-to-first-byte histograms plus byte, retry and queue-wait
+    totals. `summary()` lists the slowest endpoints and `export_prometheus()` renders
+    everything in the Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace: str = "scaile"):
+        """
+        :param buckets: Upper bounds of the latency histograms, in seconds.
+        :param namespace: Prefix of the exported metric names.
+        """
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def after_request(self, metrics: RequestMetrics):
+        key = (metrics.method, metrics.endpoint, str(metrics.status or metrics.error or "error"))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.buckets)
+            series.duration.observe(metrics.duration or 0.0)
+            if metrics.ttfb is not None:
+                series.ttfb.observe(metrics.ttfb)
+            series.bytes_sent += metrics.bytes_sent or 0
+            series.bytes_received += metrics.bytes_received or 0
+            series.retries += metrics.retries
+            series.queue_wait += metrics.queue_wait
+
+    def summary(self) -> list:
+        """
+        Returns one dict per (method, endpoint, status), slowest p95 first.
+        """
+        with self._lock:
+            rows = [
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "status": status,
+                    "count": series.duration.count,
+                    "avg": series.duration.sum / series.duration.count,
+                    "p50": series.duration.quantile(0.5),
+                    "p95": series.duration.quantile(0.95),
+                    "p99": series.duration.quantile(0.99),
+                    "bytes_sent": series.bytes_sent,
+                    "bytes_received": series.bytes_received,
+                    "retries": series.retries,
+                    "queue_wait": series.queue_wait,
+                }
+                for (method, endpoint, status), series in self._series.items()
+            ]
+        return sorted(rows, key=lambda row: (row["p95"], row["avg"]), reverse=True)
+
+    def reset(self):
+        """Drops all collected metrics."""
+        with self._lock:
+            self._series = {}
+
+    def export_prometheus(self) -> str:
+        """
+        Renders the collected metrics in the Prometheus text exposition format.
+        """
+        ns = self.namespace
+        lines = []
+        with self._lock:
+            series = sorted(self._series.items())
+            for name, attr, help_text in (
+                ("request_duration_seconds", "duration", "Total time of API requests, including retries."),
+                ("request_ttfb_seconds", "ttfb", "Time until the response headers were received."),
+            ):
+                lines.append(f"# HELP {ns}_{name} {help_text}")
+                lines.append(f"# TYPE {ns}_{name} histogram")
+                for key, s in series:
+                    histogram = getattr(s, attr)
+                    labels = _labels(key)
+                    cumulative = 0
+                    for bound, n in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{ns}_{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f"{ns}_{name}_sum{{{labels}}} {histogram.sum!r}")
+                    lines.append(f"{ns}_{name}_count{{{labels}}} {histogram.count}")
+            for name, attr, help_text in (
+                ("request_bytes_sent_total", "bytes_sent", "Request body bytes sent."),
+                ("request_bytes_received_total", "bytes_received", "Response body bytes received."),
+                ("request_retries_total", "retries", "Retried attempts."),
+                ("request_queue_wait_seconds_total", "queue_wait", "Time spent waiting on the rate limiter."),
+            ):
+                lines.append(f"# HELP {ns}_{name} {help_text}")
+                lines.append(f"# TYPE {ns}_{name} counter")
+                for key, s in series:
+                    lines.append(f"{ns}_{name}{{{_labels(key)}}} {getattr(s, attr)!r}")
+        return "\n".join(lines) + "\n"
+
+
+class _Series:
+    """Metrics of one (method, endpoint, status) combination."""
+
+    __slots__ = ("duration", "ttfb", "bytes_sent", "bytes_received", "retries", "queue_wait")
+
+    def __init__(self, buckets):
+        self.duration = Histogram(buckets)
+        self.ttfb = Histogram(buckets)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.queue_wait = 0.0
+
+
+def _labels(key) -> str:
+    """Formats a (method, endpoint, status) key as Prometheus labels."""
+    method, endpoint, status = (str(v).replace("\\", "\\\\").replace('"', '\\"') for v in key)
+    return f'method="{method}",endpoint="{endpoint}",status="{status}"'
+
+
+def body_size(body) -> int:
+    """Size in bytes of a prepared request body (0 for streamed or missing bodies)."""
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode())
+    return 0
@@ -1,10 +1,233 @@
+import json
 import logging
+import logging.handlers
+import queue
+import reprlib
 from .configs import Config
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG if Config.DEBUG else logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+# Field names whose values never reach the logs
+REDACTED_KEYS = frozenset({"authorization", "api_key", "apikey", "token", "access_token", "secret",
+                           "password", "x-signature", "signature"})
+REDACTED = "***"
+DEFAULT_MAX_FIELD_LENGTH = 256  # characters per logged field
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 
 logger = logging.getLogger("scaile-sdk")
+# A library must not configure the host application's logging; records go nowhere
+# until the application (or `configure_logging`) attaches a handler.
+logger.addHandler(logging.NullHandler())
+
+_queue_listener = None
+
+
+def redact(value, keys=REDACTED_KEYS):
+    """
+    Returns a copy of a JSON-like value with sensitive fields masked.
+
+    :param value: Dict, list or scalar to redact.
+    :param keys: Lower-case field names to mask.
+    """
+    if isinstance(value, dict):
+        return {k: REDACTED if str(k).lower() in keys else redact(v, keys) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v, keys) for v in value]
+    return value
+
+
+def truncate(text: str, limit: int = DEFAULT_MAX_FIELD_LENGTH) -> str:
+    """
+    Shortens a string to `limit` characters, noting how much was cut.
+    """
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(+{len(text) - limit} chars)"
+
+
+class LazyFields:
+    """
+    Structured log fields rendered only when a record is handled.
+
+    Values are redacted and truncated at that point, so building the object in a hot
+    path costs one allocation and nothing when the level is disabled. Large containers
+    are clipped before they are serialized.
+    """
+
+    __slots__ = ("fields", "limit", "_rendered")
+
+    def __init__(self, fields: dict, limit: int = DEFAULT_MAX_FIELD_LENGTH):
+        self.fields = fields
+        self.limit = limit
+        self._rendered = None
+
+    def as_dict(self) -> dict:
+        """Redacted fields with long values truncated, rendered once."""
+        if self._rendered is None:
+            rendered = {}
+            for key, value in redact(_clip(self.fields, self.limit)).items():
+                if isinstance(value, (dict, list)):
+                    value = truncate(_to_json(value), self.limit)
+                elif isinstance(value, (str, bytes)):
+                    value = truncate(value if isinstance(value, str) else reprlib.repr(value), self.limit)
+                rendered[key] = value
+            self._rendered = rendered
+        return self._rendered
+
+    def __str__(self):
+        return " ".join(f"{key}={value}" for key, value in self.as_dict().items())
+
+
+def log_event(level: int, event: str, **fields):
+    """
+    Logs a structured SDK event if `level` is enabled.
+
+    The record's message is `<event> key=value ...`; the fields are also attached as
+    `record.scaile_fields` for `JSONFormatter` or custom handlers.
+
+    :param level: Logging level, e.g. `logging.DEBUG`.
+    :param event: Short event name, e.g. "api.request".
+    :param fields: Event fields; sensitive keys are redacted and long values truncated.
+    """
+    if logger.isEnabledFor(level):
+        lazy = LazyFields(fields)
+        logger.log(level, "%s %s", event, lazy, extra={"scaile_event": event, "scaile_fields": lazy})
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, including structured SDK fields.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage() if not hasattr(record, "scaile_event") else record.scaile_event,
+        }
+        fields = getattr(record, "scaile_fields", None)
+        if fields is not None:
+            entry.update(fields.as_dict())
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return _to_json(entry)
+
+
+def configure_logging(level=None, handler: logging.Handler = None, fmt: str = LOG_FORMAT):
+    """
+    Attaches a handler to the SDK logger only, leaving the root logger untouched.
+
+    :param level: Level of the SDK logger; DEBUG when `SCAILE_DEBUG` is set, INFO otherwise.
+    :param handler: Handler to attach; a stderr `StreamHandler` by default.
+    :param fmt: Format of the default handler.
+    :return: The SDK logger.
+    """
+    if level is None:
+        level = logging.DEBUG if Config.DEBUG else logging.INFO
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(fmt))
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    return logger
+
+
+def start_queue_logging(*handlers: logging.Handler, maxsize: int = 10000):
+    """
+    Makes SDK logging non-blocking.
+
+    Records are put on an in-memory queue and written by a background
+    `QueueListener`, so slow handlers (files, network) never stall request threads.
+    The given handlers, or the SDK logger's current ones, are moved behind the queue.
+    When the queue is full, further records are dropped.
+
+    :param handlers: Handlers to write records with.
+    :param maxsize: Maximum number of queued records.
+    :return: The running `QueueListener`.
+    """
+    global _queue_listener
+    stop_queue_logging()
+    if not handlers:
+        handlers = tuple(h for h in logger.handlers if not isinstance(h, logging.NullHandler))
+    for handler in handlers:
+        logger.removeHandler(handler)
+    records = queue.Queue(maxsize)
+    queue_handler = _DroppingQueueHandler(records)
+    logger.addHandler(queue_handler)
+    _queue_listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _queue_listener.queue_handler = queue_handler
+    _queue_listener.start()
+    return _queue_listener
+
+
+def stop_queue_logging():
+    """
+    Flushes queued records and puts the handlers back on the SDK logger.
+    """
+    global _queue_listener
+    listener, _queue_listener = _queue_listener, None
+    if listener is None:
+        return
+    listener.stop()
+    logger.removeHandler(listener.queue_handler)
+    for handler in listener.handlers:
+        logger.addHandler(handler)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def prepare(self, record):
+        # Render on the calling thread: the caller may change the logged values before
+        # the listener gets to the record
+        fields = getattr(record, "scaile_fields", None)
+        if fields is not None:
+            fields.as_dict()
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _clip(fields: dict, limit: int) -> dict:
+    """
+    Copies each field keeping only the items and characters that can show up in
+    `limit` characters of output, so huge payloads are never serialized whole.
+    """
+    def clip(value, budget):
+        """Returns the clipped copy and the budget left after it."""
+        if isinstance(value, dict):
+            items = {}
+            for key, item in value.items():
+                if budget <= 0:
+                    items["..."] = "..."
+                    break
+                items[key], budget = clip(item, budget - len(str(key)) - 4)
+            return items, budget
+        if isinstance(value, (list, tuple)):
+            items = []
+            for item in value:
+                if budget <= 0:
+                    items.append("...")
+                    break
+                item, budget = clip(item, budget - 1)
+                items.append(item)
+            return items, budget
+        if isinstance(value, str):
+            return value[:max(budget, 0) + 1], budget - len(value)
+        return value, budget - 1
+
+    return {key: clip(value, limit)[0] if isinstance(value, (dict, list, tuple)) else value
+            for key, value in fields.items()}
+
+
+def _to_json(value) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+if Config.DEBUG:
+    configure_logging(logging.DEBUG)
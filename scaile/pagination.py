@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+# Query parameters used to request a page
+CURSOR_PARAM = "cursor"
+PAGE_SIZE_PARAM = "limit"
+DEFAULT_PAGE_SIZE = 100
+
+# Response keys that may hold the page items and the cursor of the next page
+ITEM_KEYS = ("data", "items", "results")
+# "next" may also be a link to the next page (URL or path with a query string)
+CURSOR_KEYS = ("next_cursor", "next")
+
+
+def split_page(response):
+    """
+    Splits a list response into its items and the cursor of the next page.
+
+    Plain list responses are treated as a single, final page.
+
+    :param response: Decoded JSON response of a list endpoint.
+    :return: Tuple of (items, next_cursor). `next_cursor` is None on the last page, and
+        the query parameters of the link (a dict) when the response holds a next-page link.
+        A link without query parameters cannot lead anywhere new and ends pagination.
+    """
+    if response is None:
+        return [], None
+    if isinstance(response, list):
+        return response, None
+
+    items = next((response[key] for key in ITEM_KEYS if key in response), [])
+    cursor = next((response[key] for key in CURSOR_KEYS if response.get(key)), None)
+    if isinstance(cursor, str) and _is_link(cursor):
+        cursor = dict(parse_qsl(urlsplit(cursor).query, keep_blank_values=True)) or None
+    return items or [], cursor
+
+
+def _is_link(cursor: str) -> bool:
+    """True for next-page URLs and paths, as opposed to opaque cursor tokens."""
+    return "://" in cursor or cursor.startswith("/") or cursor.startswith("?")
+
+
+def iter_pages(fetch, params: dict = None, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True):
+    """
+    Lazily follows pagination cursors, yielding one page of items at a time.
+
+    While the caller consumes a page, the next one is fetched on a background
+    thread, so at most two pages are held in memory at any time.
+
+    A next-page link is followed by requesting the same endpoint with the link's
+    query parameters; `fetch` is bound to one endpoint, so the link's path is ignored.
+
+    :param fetch: Callable taking a params dict and returning the decoded response.
+    :param params: Base query parameters (e.g. filters) sent with every page.
+    :param page_size: Number of items requested per page.
+    :param prefetch: Fetch the next page in the background while the current one is consumed.
+    :return: Generator of item lists.
+    """
+    base_params = dict(params or {})
+    if page_size:
+        base_params[PAGE_SIZE_PARAM] = page_size
+
+    def fetch_page(cursor):
+        if isinstance(cursor, dict):
+            # A next-page link already carries every parameter, filters included
+            return split_page(fetch(dict(cursor)))
+        page_params = dict(base_params)
+        if cursor is not None:
+            page_params[CURSOR_PARAM] = cursor
+        return split_page(fetch(page_params))
+
+    if not prefetch:
+        cursor = None
+        while True:
+            items, cursor = fetch_page(cursor)
+            if items:
+                yield items
+            if cursor is None:
+                return
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(fetch_page, None)
+        while future is not None:
+            items, cursor = future.result()
+            future = executor.submit(fetch_page, cursor) if cursor is not None else None
+            if items:
+                yield items
+            del items
+    finally:
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_items(fetch, params: dict = None, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True):
+    """
+    Lazily follows pagination cursors, yielding individual items.
+
+    See `iter_pages` for the parameters.
+
+    :return: Generator of items.
+    """
+    for page in iter_pages(fetch, params, page_size=page_size, prefetch=prefetch):
+        yield from page
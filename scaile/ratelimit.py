@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `burst`. With `adaptive=True`
+    the rate follows an AIMD scheme: it is halved whenever the server throttles (429)
+    and creeps back up towards `max_rate` after each successful request, so the client
+    settles on the highest rate the server sustains.
+    """
+
+    def __init__(self, rate: float, burst: int = None, adaptive: bool = False,
+                 min_rate: float = None, max_rate: float = None):
+        """
+        Initializes the bucket full.
+
+        :param rate: Sustained requests per second.
+        :param burst: Bucket capacity (defaults to `rate`, at least 1).
+        :param adaptive: Adjust the rate from throttling feedback.
+        :param min_rate: Lower bound of the adaptive rate (defaults to 1% of `rate`).
+        :param max_rate: Upper bound of the adaptive rate (defaults to `rate`).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.adaptive = adaptive
+        self.min_rate = float(min_rate if min_rate is not None else rate / 100)
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: float) -> float:
+        """Refills, then takes `tokens` if available. Returns the wait time needed otherwise."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: float = None) -> bool:
+        """
+        Blocks until `tokens` are available and takes them.
+
+        :param tokens: Number of tokens to take.
+        :param timeout: Maximum time to wait in seconds (None waits indefinitely).
+        :return: True if the tokens were taken, False on timeout.
+        :raises ValueError: If `tokens` exceeds the bucket's `burst`, which could never be met.
+        """
+        self._check_tokens(tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                wait = self._take(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def _check_tokens(self, tokens: float):
+        """Rejects requests larger than the bucket, which would otherwise wait forever."""
+        if tokens > self.burst:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket holding at most {self.burst}")
+
+    def on_throttle(self):
+        """
+        Reports a throttled (429) response; halves the rate in adaptive mode.
+        """
+        if self.adaptive:
+            with self._lock:
+                self.rate = max(self.min_rate, self.rate / 2)
+
+    def on_success(self):
+        """
+        Reports a successful response; increases the rate in adaptive mode.
+        """
+        if self.adaptive and self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + max(self.max_rate / 100, 0.1))
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a local file, so that several processes on the
+    same host share one budget. Updates are serialized with an exclusive `flock` on the
+    state file (POSIX only).
+    """
+
+    def __init__(self, path: str, rate: float, burst: int = None, adaptive: bool = False,
+                 min_rate: float = None, max_rate: float = None):
+        """
+        Initializes the shared bucket.
+
+        :param path: Location of the shared state file; created if missing.
+        :param rate: Sustained requests per second across all processes.
+        :param burst: Bucket capacity (defaults to `rate`, at least 1).
+        :param adaptive: Adjust the rate from throttling feedback.
+        :param min_rate: Lower bound of the adaptive rate.
+        :param max_rate: Upper bound of the adaptive rate.
+        """
+        import fcntl  # POSIX only
+        self._fcntl = fcntl
+        super().__init__(rate, burst, adaptive, min_rate, max_rate)
+        self.path = os.fspath(path)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        os.close(fd)
+
+    def _update(self, change):
+        """Runs `change(state)` on the shared state under an exclusive file lock."""
+        with open(self.path, "r+") as f:
+            self._fcntl.flock(f, self._fcntl.LOCK_EX)
+            try:
+                raw = f.read()
+                state = json.loads(raw) if raw else {
+                    "tokens": self.burst, "updated": time.time(), "rate": self.rate,
+                }
+                result = change(state)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+                return result
+            finally:
+                self._fcntl.flock(f, self._fcntl.LOCK_UN)
+
+    def acquire(self, tokens: float = 1, timeout: float = None) -> bool:
+        """
+        Blocks until `tokens` are available in the shared bucket and takes them.
+
+        :param tokens: Number of tokens to take.
+        :param timeout: Maximum time to wait in seconds (None waits indefinitely).
+        :return: True if the tokens were taken, False on timeout.
+        :raises ValueError: If `tokens` exceeds the bucket's `burst`, which could never be met.
+        """
+        self._check_tokens(tokens)
+
+        def take(state):
+            now = time.time()
+            rate = state["rate"]
+            state["tokens"] = min(self.burst, state["tokens"] + max(0.0, now - state["updated"]) * rate)
+            state["updated"] = now
+            if state["tokens"] >= tokens:
+                state["tokens"] -= tokens
+                return 0.0
+            return (tokens - state["tokens"]) / rate
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._update(take)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def on_throttle(self):
+        """
+        Reports a throttled (429) response; halves the shared rate in adaptive mode.
+        """
+        if self.adaptive:
+            def halve(state):
+                state["rate"] = max(self.min_rate, state["rate"] / 2)
+            self._update(halve)
+
+    def on_success(self):
+        """
+        Reports a successful response; increases the shared rate in adaptive mode.
+        """
+        if self.adaptive:
+            def increase(state):
+                state["rate"] = min(self.max_rate, state["rate"] + max(self.max_rate / 100, 0.1))
+            self._update(increase)
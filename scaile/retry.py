@@ -0,0 +1,106 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from .configs import config_value
+
+# Fallback used when `annotation.max_retries` is not set in the config
+DEFAULT_MAX_RETRIES = 3
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait before the next attempt.
+
+    Delays use exponential backoff with full jitter, and a server-provided `Retry-After`
+    header takes precedence when it asks for a longer wait. A 429 response means the
+    request was rejected before being processed, so it is retried for every method.
+    Other retryable statuses and connection errors are only retried for idempotent
+    methods, or for requests carrying an `Idempotency-Key` header.
+    """
+
+    def __init__(self, max_retries: int = None, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_statuses=RETRY_STATUSES, idempotent_methods=IDEMPOTENT_METHODS,
+                 respect_retry_after: bool = True, max_retry_after: float = 300.0):
+        """
+        Initializes the policy.
+
+        :param max_retries: Maximum number of retries per request. Defaults to `annotation.max_retries` from the config.
+        :param backoff_base: Backoff before the first retry, in seconds; doubled for each further attempt.
+        :param backoff_max: Upper bound of the exponential backoff, in seconds.
+        :param retry_statuses: HTTP statuses that trigger a retry.
+        :param idempotent_methods: HTTP methods that are safe to resend after an ambiguous failure.
+        :param respect_retry_after: Honor the `Retry-After` response header.
+        :param max_retry_after: Upper bound applied to `Retry-After`, in seconds.
+        """
+        if max_retries is None:
+            max_retries = config_value("annotation", "max_retries", DEFAULT_MAX_RETRIES)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def is_idempotent(self, method: str, headers: dict = None) -> bool:
+        """True if the request can be resent without risking a duplicate side effect."""
+        return method.upper() in self.idempotent_methods or bool(headers and headers.get(IDEMPOTENCY_HEADER))
+
+    def should_retry(self, method: str, attempt: int, status: int = None, headers: dict = None) -> bool:
+        """
+        Decides whether to retry after a failed attempt.
+
+        :param method: HTTP method of the request.
+        :param attempt: Number of retries already made (0 after the first attempt).
+        :param status: Response status, or None for a connection error or timeout.
+        :param headers: Request headers (used to detect an idempotency key).
+        :return: True if the request should be retried.
+        """
+        if attempt >= self.max_retries:
+            return False
+        if status == 429:
+            return True
+        if status is not None and status not in self.retry_statuses:
+            return False
+        return self.is_idempotent(method, headers)
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Returns the time to wait before the next retry.
+
+        :param attempt: Number of retries already made.
+        :param retry_after: Value of the `Retry-After` response header, if any.
+        :return: Delay in seconds.
+        """
+        backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if self.respect_retry_after and retry_after:
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                return max(backoff, min(server_delay, self.max_retry_after))
+        return backoff
+
+    def sleep(self, attempt: int, retry_after: str = None):
+        """
+        Sleeps for the delay of the given retry attempt.
+        """
+        time.sleep(self.delay(attempt, retry_after))
+
+
+def parse_retry_after(value: str):
+    """
+    Parses a `Retry-After` header given either as seconds or as an HTTP date.
+
+    :param value: Header value.
+    :return: Delay in seconds, or None if the value cannot be parsed.
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
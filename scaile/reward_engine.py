@@ -0,0 +1,192 @@
+import math
+from .configs import config_value
+
+CALCULATION_METHODS = ("linear", "exponential", "tiered")
+DEFAULT_CALCULATION_METHOD = "linear"
+DEFAULT_RATE = 1.0  # tokens per accepted annotation of full quality
+DEFAULT_QUALITY_WEIGHT = 3.0  # exponential: tokens fall by e^-3 at quality 0
+# tiered: (threshold, multiplier) pairs; each tier pays its multiplier on the
+# effective contributions above its threshold, like tax brackets
+DEFAULT_TIERS = ((0, 1.0), (100, 1.25), (1000, 1.5))
+DEFAULT_PRECISION = 6  # decimals of the computed token amounts
+
+
+def _import_numpy():
+    """Returns numpy, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class RewardCalculation:
+    """
+    Rewards computed locally for many contributors at once.
+
+    Amounts are kept as one column (a numpy array when numpy is installed); `get` and
+    `records` expose each contributor in the shape returned by
+    `Rewards.calculate_rewards`, and `to_payouts` feeds `Rewards.bulk_distribute`.
+    """
+
+    def __init__(self, project_id: str, method: str, contributor_ids: list, tokens):
+        self.project_id = project_id
+        self.method = method
+        self.contributor_ids = contributor_ids
+        self.tokens = tokens
+        self._positions = None
+
+    def __len__(self):
+        return len(self.contributor_ids)
+
+    @property
+    def total(self) -> float:
+        tokens = self.tokens
+        return float(tokens.sum() if hasattr(tokens, "sum") else sum(tokens))
+
+    def get(self, contributor_id: str) -> dict:
+        """
+        Reward of one contributor.
+
+        :raises KeyError: If the contributor is not part of the calculation.
+        """
+        if self._positions is None:
+            self._positions = {c: i for i, c in enumerate(self.contributor_ids)}
+        return self._record(self._positions[contributor_id])
+
+    def records(self):
+        """Yields the reward of every contributor, in input order."""
+        return (self._record(i) for i in range(len(self)))
+
+    def to_payouts(self) -> dict:
+        """Columnar payout table accepted by `Rewards.bulk_distribute`."""
+        return {"contributor_id": self.contributor_ids, "amount": self.tokens}
+
+    def _record(self, index: int) -> dict:
+        return {
+            "project_id": self.project_id,
+            "contributor_id": self.contributor_ids[index],
+            "calculation_method": self.method,
+            "tokens": float(self.tokens[index]),
+        }
+
+    def __repr__(self):
+        return f"RewardCalculation(method={self.method!r}, contributors={len(self)}, total={self.total})"
+
+
+class RewardEngine:
+    """
+    Computes contributor rewards locally, in one vectorized pass over all contributors.
+
+    Each contributor's effective contribution is `accepted * quality`. The method,
+    taken from the `rewards.calculation_method` setting by default, turns it into tokens:
+
+    - linear: `rate * accepted * quality`
+    - exponential: `rate * accepted * exp(quality_weight * (quality - 1))`, i.e. full
+      pay at quality 1, decaying exponentially as quality drops
+    - tiered: `rate` times the effective contributions, with each tier's multiplier
+      applied to the part above its threshold
+
+    The arithmetic runs on numpy arrays when numpy is installed and on plain lists
+    otherwise, with identical results.
+    """
+
+    def __init__(self, method: str = None, rate: float = DEFAULT_RATE,
+                 quality_weight: float = DEFAULT_QUALITY_WEIGHT, tiers=DEFAULT_TIERS,
+                 precision: int = DEFAULT_PRECISION):
+        """
+        :param method: "linear", "exponential" or "tiered"; defaults to the
+            `rewards.calculation_method` setting, then "linear".
+        :param rate: Tokens per accepted annotation of full quality.
+        :param quality_weight: Steepness of the exponential quality penalty.
+        :param tiers: Ascending (threshold, multiplier) pairs of the tiered method,
+            starting at threshold 0.
+        :param precision: Decimals the token amounts are rounded to.
+        """
+        if method is None:
+            method = config_value("rewards", "calculation_method", DEFAULT_CALCULATION_METHOD)
+        method = str(method).lower()
+        if method not in CALCULATION_METHODS:
+            raise ValueError(f"Unknown calculation method {method!r}; expected one of: {', '.join(CALCULATION_METHODS)}")
+        tiers = tuple((float(threshold), float(multiplier)) for threshold, multiplier in tiers)
+        if not tiers or tiers[0][0] != 0 or any(a[0] >= b[0] for a, b in zip(tiers, tiers[1:])):
+            raise ValueError("tiers must start at threshold 0 and have ascending thresholds")
+        self.method = method
+        self.rate = rate
+        self.quality_weight = quality_weight
+        self.tiers = tiers
+        self.precision = precision
+        self._numpy = _import_numpy()
+
+    def calculate(self, contributor_ids, accepted, quality=None, project_id: str = None) -> RewardCalculation:
+        """
+        Computes the rewards of many contributors.
+
+        :param contributor_ids: Sequence of contributor IDs.
+        :param accepted: Accepted annotation counts, one per contributor (sequence or numpy array).
+        :param quality: Quality scores between 0 and 1; 1 for everyone when omitted.
+        :param project_id: Project the rewards belong to, copied into each record.
+        :return: A `RewardCalculation`.
+        """
+        contributor_ids = contributor_ids.tolist() if hasattr(contributor_ids, "tolist") else list(contributor_ids)
+        if len(accepted) != len(contributor_ids) or quality is not None and len(quality) != len(contributor_ids):
+            raise ValueError("Activity columns have different lengths")
+        np = self._numpy
+        if np is not None:
+            tokens = self._calculate_numpy(np, accepted, quality)
+        else:
+            tokens = self._calculate_lists(accepted, quality)
+        return RewardCalculation(project_id, self.method, contributor_ids, tokens)
+
+    def calculate_columns(self, columns: dict, project_id: str = None) -> RewardCalculation:
+        """
+        Computes rewards from columnar activity data with the columns `contributor_id`,
+        `accepted` and optionally `quality`.
+        """
+        return self.calculate(columns["contributor_id"], columns["accepted"], columns.get("quality"), project_id)
+
+    def _calculate_numpy(self, np, accepted, quality):
+        accepted = np.asarray(accepted, dtype=np.float64)
+        quality = np.ones_like(accepted) if quality is None else np.asarray(quality, dtype=np.float64)
+        if accepted.size and (not np.isfinite(accepted).all() or not np.isfinite(quality).all()
+                              or accepted.min() < 0 or quality.min() < 0 or quality.max() > 1):
+            raise ValueError("accepted must be finite and non-negative and quality between 0 and 1")
+        if self.method == "linear":
+            tokens = self.rate * accepted * quality
+        elif self.method == "exponential":
+            tokens = self.rate * accepted * np.exp(self.quality_weight * (quality - 1))
+        else:
+            effective = accepted * quality
+            tokens = np.zeros_like(effective)
+            for (threshold, multiplier), upper in self._tier_bounds():
+                tokens += multiplier * np.clip(effective - threshold, 0, upper - threshold)
+            tokens *= self.rate
+        return np.round(tokens, self.precision)
+
+    def _calculate_lists(self, accepted, quality):
+        accepted = [float(a) for a in accepted]
+        quality = [1.0] * len(accepted) if quality is None else [float(q) for q in quality]
+        if any(not 0 <= a < math.inf for a in accepted) or any(not 0 <= q <= 1 for q in quality):
+            raise ValueError("accepted must be finite and non-negative and quality between 0 and 1")
+        rate, precision = self.rate, self.precision
+        if self.method == "linear":
+            tokens = [rate * a * q for a, q in zip(accepted, quality)]
+        elif self.method == "exponential":
+            weight = self.quality_weight
+            tokens = [rate * a * math.exp(weight * (q - 1)) for a, q in zip(accepted, quality)]
+        else:
+            bounds = self._tier_bounds()
+            tokens = [
+                rate * sum(multiplier * min(max(e - threshold, 0.0), upper - threshold)
+                           for (threshold, multiplier), upper in bounds)
+                for e in (a * q for a, q in zip(accepted, quality))
+            ]
+        return [round(t, precision) for t in tokens]
+
+    def _tier_bounds(self) -> list:
+        """Pairs each tier with the threshold of the next one."""
+        uppers = [threshold for threshold, _ in self.tiers[1:]] + [math.inf]
+        return list(zip(self.tiers, uppers))
+
+    def __repr__(self):
+        return f"RewardEngine(method={self.method!r}, rate={self.rate})"
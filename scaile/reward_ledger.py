@@ -0,0 +1,304 @@
+import sqlite3
+import threading
+from decimal import Decimal
+from itertools import islice
+from .codec import get_codec
+from .logging import logger
+from .pagination import DEFAULT_PAGE_SIZE
+
+# Query parameter asking the rewards list endpoint for transactions after an ID
+SINCE_PARAM = "since_id"
+# Fields that may hold a transaction's ID and amount
+TRANSACTION_ID_KEYS = ("id", "transaction_id")
+AMOUNT_KEYS = ("amount", "tokens")
+DEFAULT_SYNC_INTERVAL = 60.0  # seconds
+REWARD_EVENTS = "reward.*"
+MAX_SQL_VARIABLES = 500  # bound parameters per IN query, below SQLite's oldest limit of 999
+CACHE_SIZE_KIB = 64 * 1024  # SQLite page cache, keeps the indexes of large ledgers in memory
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS transactions ("
+    "seq INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT NOT NULL, id TEXT NOT NULL, "
+    "contributor_id TEXT NOT NULL, amount TEXT NOT NULL, data BLOB NOT NULL, UNIQUE (project_id, id))",
+    "CREATE INDEX IF NOT EXISTS transactions_contributor ON transactions (project_id, contributor_id, seq)",
+    "CREATE TABLE IF NOT EXISTS balances ("
+    "project_id TEXT NOT NULL, contributor_id TEXT NOT NULL, balance TEXT NOT NULL, "
+    "transactions INTEGER NOT NULL, last_transaction TEXT NOT NULL, PRIMARY KEY (project_id, contributor_id))",
+    "CREATE TABLE IF NOT EXISTS cursors (project_id TEXT PRIMARY KEY, cursor TEXT NOT NULL)",
+)
+
+
+class RewardLedger:
+    """
+    Local, append-only copy of a project's reward transactions with materialized
+    per-contributor balances.
+
+    Transactions are stored once per ID, so the same transaction arriving from a
+    webhook and from a sync is only counted once. Each new transaction updates its
+    contributor's balance row in the same SQLite transaction, and reads are a primary
+    key lookup on one long-lived connection, so dashboards never call the API.
+
+    The ledger is filled by `sync()`, which fetches only the transactions after the
+    last synced ID, by `start_sync()` to do that periodically, and by reward webhooks
+    once `attach()`-ed to a `WebhookRegistry`. Several projects can share one file.
+    """
+
+    def __init__(self, path: str, project_id: str, rewards=None):
+        """
+        :param path: SQLite database file, or ":memory:".
+        :param project_id: The ID of the project.
+        :param rewards: `Rewards` instance used by `sync()`.
+        """
+        self.path = path
+        self.project_id = project_id
+        self.rewards = rewards
+        self.codec = get_codec()
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._sync_thread = None
+        self._stop = threading.Event()
+        if path != ":memory:":
+            # WAL lets other processes read while a sync writes; in WAL mode NORMAL
+            # sync cannot corrupt the database, it only risks the last commits on power loss
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+
+    @property
+    def cursor(self):
+        """ID of the last transaction fetched by `sync()`, or None before the first sync."""
+        with self._lock:
+            row = self._db.execute("SELECT cursor FROM cursors WHERE project_id = ?", (self.project_id,)).fetchone()
+        return row[0] if row else None
+
+    def append(self, transactions) -> int:
+        """
+        Adds transactions to the ledger, ignoring IDs it already holds.
+
+        :param transactions: Iterable of transaction dicts with an ID, `contributor_id`
+            and amount.
+        :return: Number of new transactions.
+        """
+        with self._lock, self._transaction():
+            return self._append(transactions)
+
+    def sync(self, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+        """
+        Fetches the transactions created since the last sync and applies them.
+
+        The cursor is stored with each page, so an interrupted sync resumes where it
+        stopped.
+
+        :return: Number of new transactions.
+        """
+        if self.rewards is None:
+            raise ValueError("RewardLedger.sync() needs a Rewards instance")
+        cursor = self.cursor
+        filters = {SINCE_PARAM: cursor} if cursor is not None else None
+        items = self.rewards.iter_all_rewards(self.project_id, filters, page_size=page_size)
+        added = 0
+        for page in iter(lambda: list(islice(items, page_size)), []):
+            last = next(filter(None, map(_transaction_id, reversed(page))), None)
+            with self._lock, self._transaction():
+                added += self._append(page)
+                if last is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cursors (project_id, cursor) VALUES (?, ?)",
+                        (self.project_id, str(last)),
+                    )
+        return added
+
+    def start_sync(self, interval: float = DEFAULT_SYNC_INTERVAL):
+        """
+        Calls `sync()` every `interval` seconds on a daemon thread until `stop_sync()`.
+        Failed syncs are logged and retried at the next interval.
+        """
+        self.stop_sync()
+        self._stop.clear()
+        self._sync_thread = threading.Thread(target=self._sync_loop, args=(interval,),
+                                             name="scaile-reward-ledger", daemon=True)
+        self._sync_thread.start()
+
+    def stop_sync(self, timeout: float = None):
+        thread, self._sync_thread = self._sync_thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
+
+    def attach(self, registry, event_type: str = REWARD_EVENTS):
+        """
+        Registers the ledger as a batch handler of reward webhooks.
+
+        Webhooks do not move the sync cursor, since they may arrive out of order; a
+        later `sync()` fills in anything they missed.
+
+        :param registry: A `WebhookRegistry`, e.g. `scaile.webhook_listener.registry`.
+        :param event_type: Event type or pattern carrying reward transactions.
+        """
+        registry.register(event_type, self.handle_events, batch=True)
+
+    def handle_events(self, events: list) -> int:
+        """
+        Applies the transactions carried by webhook payloads of this project.
+
+        Each payload's `data` holds a transaction or a list of them.
+
+        :return: Number of new transactions.
+        """
+        transactions = []
+        for event in events:
+            if event.get("project_id", self.project_id) != self.project_id:
+                continue
+            data = event.get("data")
+            transactions.extend(data if isinstance(data, list) else [data] if data else [])
+        return self.append(transactions) if transactions else 0
+
+    def balance(self, contributor_id: str) -> Decimal:
+        """Current balance of a contributor; 0 for unknown contributors."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT balance FROM balances WHERE project_id = ? AND contributor_id = ?",
+                (self.project_id, contributor_id),
+            ).fetchone()
+        return Decimal(row[0]) if row else Decimal(0)
+
+    def summary(self, contributor_id: str):
+        """
+        Balance, transaction count and last transaction ID of a contributor.
+
+        :return: Dict, or None for unknown contributors.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT balance, transactions, last_transaction FROM balances "
+                "WHERE project_id = ? AND contributor_id = ?",
+                (self.project_id, contributor_id),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"contributor_id": contributor_id, "balance": Decimal(row[0]),
+                "transactions": row[1], "last_transaction": row[2]}
+
+    def history(self, contributor_id: str, limit: int = None) -> list:
+        """
+        Transactions of a contributor, most recent first.
+
+        :param limit: Maximum number of transactions returned.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM transactions WHERE project_id = ? AND contributor_id = ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (self.project_id, contributor_id, -1 if limit is None else limit),
+            ).fetchall()
+        return [self.codec.loads(row[0]) for row in rows]
+
+    def balances(self) -> dict:
+        """Balances of every contributor of the project."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT contributor_id, balance FROM balances WHERE project_id = ?", (self.project_id,)
+            ).fetchall()
+        return {contributor_id: Decimal(balance) for contributor_id, balance in rows}
+
+    def close(self):
+        self.stop_sync()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _append(self, transactions) -> int:
+        """Inserts new transactions and folds them into the balances; needs an open transaction."""
+        db = self._db
+        project_id = self.project_id
+        rows = {}
+        for transaction in transactions:
+            try:
+                transaction_id = _transaction_id(transaction)
+                contributor_id = str(transaction["contributor_id"])
+                amount = Decimal(str(next(transaction[key] for key in AMOUNT_KEYS if key in transaction)))
+                if transaction_id is None or not amount.is_finite():
+                    raise ValueError
+            except (AttributeError, KeyError, TypeError, StopIteration, ArithmeticError, ValueError):
+                logger.warning("Skipping malformed reward transaction: %s", transaction)
+                continue
+            rows.setdefault(str(transaction_id), (contributor_id, amount, transaction))
+        for (transaction_id,) in self._select_in("SELECT id FROM transactions", "id", rows):
+            del rows[transaction_id]
+        if not rows:
+            return 0
+
+        db.executemany(
+            "INSERT INTO transactions (project_id, id, contributor_id, amount, data) VALUES (?, ?, ?, ?, ?)",
+            [(project_id, transaction_id, contributor_id, str(amount), self.codec.dumps(transaction))
+             for transaction_id, (contributor_id, amount, transaction) in rows.items()],
+        )
+        deltas = {}
+        for transaction_id, (contributor_id, amount, _) in rows.items():
+            total, count, _ = deltas.get(contributor_id, (Decimal(0), 0, None))
+            deltas[contributor_id] = (total + amount, count + 1, transaction_id)
+
+        current = {
+            contributor_id: (Decimal(balance), count)
+            for contributor_id, balance, count in self._select_in(
+                "SELECT contributor_id, balance, transactions FROM balances", "contributor_id", deltas
+            )
+        }
+        zero = (Decimal(0), 0)
+        db.executemany(
+            "INSERT OR REPLACE INTO balances (project_id, contributor_id, balance, transactions, last_transaction) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(project_id, contributor_id, str(current.get(contributor_id, zero)[0] + delta),
+              current.get(contributor_id, zero)[1] + count, last)
+             for contributor_id, (delta, count, last) in deltas.items()],
+        )
+        return len(rows)
+
+    def _select_in(self, query: str, column: str, values):
+        """Runs `query` for this project and `column IN values`, in chunks of bound parameters."""
+        values = list(values)
+        for i in range(0, len(values), MAX_SQL_VARIABLES):
+            chunk = values[i:i + MAX_SQL_VARIABLES]
+            yield from self._db.execute(
+                f"{query} WHERE project_id = ? AND {column} IN ({', '.join('?' * len(chunk))})",
+                (self.project_id, *chunk),
+            )
+
+    def _transaction(self):
+        return _Transaction(self._db)
+
+    def _sync_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning("Reward ledger sync failed: %s", e)
+
+    def __repr__(self):
+        return f"RewardLedger({self.path!r}, project_id={self.project_id!r})"
+
+
+class _Transaction:
+    """Wraps a block in an immediate SQLite transaction, rolled back if it raises."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _transaction_id(transaction: dict):
+    if not isinstance(transaction, dict):
+        return None
+    return next((transaction[key] for key in TRANSACTION_ID_KEYS if transaction.get(key) is not None), None)
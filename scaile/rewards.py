@@ -1,3 +1,170 @@
+import csv
+import hashlib
+import io
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from decimal import Decimal, InvalidOperation
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+from .reward_engine import RewardEngine, RewardCalculation
+from .reward_ledger import RewardLedger
+
+# Bulk distribution defaults
+DEFAULT_DISTRIBUTION_CHUNK_SIZE = 1000  # contributors per request
+DEFAULT_DISTRIBUTION_WORKERS = 8
+CONTRIBUTOR_FIELD = "contributor_id"
+AMOUNT_FIELD = "amount"
+
+
+class DistributionPlan:
+    """
+    A payout table normalized for bulk distribution.
+
+    Entries of the same contributor are summed and contributors are sorted, so the same
+    table always produces the same chunks. Each chunk's idempotency key combines the
+    plan's `batch_id` with a digest of the project and that chunk's own entries:
+    resubmitting a plan, or the same entries under the same `batch_id`, reuses the
+    keys and the API ignores chunks it already processed, while another payout run
+    with identical amounts gets new keys.
+    """
+
+    def __init__(self, totals: dict, chunk_size: int, rows: int, rejected: list, batch_id: str = None):
+        """
+        :param totals: Contributor ID -> aggregated `Decimal` amount.
+        :param chunk_size: Maximum number of contributors per request.
+        :param rows: Number of input rows read.
+        :param rejected: (row number, row, reason) tuples of unusable rows.
+        :param batch_id: Identifies the payout run in the idempotency keys, e.g. the payout
+            period; a random ID when omitted.
+        """
+        self.totals = totals
+        self.chunk_size = chunk_size
+        self.rows = rows
+        self.rejected = rejected
+        contributors = sorted(totals)
+        self.batch_id = batch_id or f"payout-{uuid.uuid4().hex}"
+        self.chunks = [contributors[i:i + chunk_size] for i in range(0, len(contributors), chunk_size)]
+
+    @property
+    def contributors(self) -> int:
+        return len(self.totals)
+
+    @property
+    def duplicates(self) -> int:
+        """Number of input rows merged into another row of the same contributor."""
+        return self.rows - len(self.rejected) - len(self.totals)
+
+    @property
+    def total_amount(self) -> Decimal:
+        return sum(self.totals.values(), Decimal(0))
+
+    def idempotency_key(self, project_id: str, index: int) -> str:
+        """Idempotency key of one chunk, derived from the batch, project and chunk entries."""
+        digest = hashlib.sha256(f"{project_id}\x1d".encode())
+        for contributor_id in self.chunks[index]:
+            digest.update(f"{contributor_id}\x1f{self.totals[contributor_id].normalize()}\x1e".encode())
+        return f"{self.batch_id}-{digest.hexdigest()[:24]}"
+
+    def payload(self, index: int) -> dict:
+        """Request body of one chunk."""
+        return {"distributions": [
+            {CONTRIBUTOR_FIELD: contributor_id, AMOUNT_FIELD: _json_amount(self.totals[contributor_id])}
+            for contributor_id in self.chunks[index]
+        ]}
+
+    def __repr__(self):
+        return (f"DistributionPlan(contributors={self.contributors}, chunks={len(self.chunks)}, "
+                f"total={self.total_amount}, rejected={len(self.rejected)})")
+
+
+class ChunkResult:
+    """
+    Outcome of submitting one chunk of a distribution.
+    """
+
+    __slots__ = ("index", "idempotency_key", "contributors", "amount", "response", "error")
+
+    def __init__(self, index: int, idempotency_key: str, contributors: list, amount: Decimal,
+                 response=None, error: Exception = None):
+        self.index = index
+        self.idempotency_key = idempotency_key
+        self.contributors = contributors
+        self.amount = amount
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"ChunkResult(index={self.index}, contributors={len(self.contributors)}, {status})"
+
+
+class DistributionReport:
+    """
+    Reconciliation of a bulk distribution: what was requested, what the API accepted
+    and what still has to be paid.
+    """
+
+    def __init__(self, plan: DistributionPlan, results: list):
+        """
+        :param plan: The submitted plan.
+        :param results: `ChunkResult` of every chunk, in chunk order.
+        """
+        self.plan = plan
+        self.results = results
+
+    @property
+    def ok(self) -> bool:
+        """True if every chunk was accepted."""
+        return all(result.ok for result in self.results)
+
+    @property
+    def failed(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def distributed_amount(self) -> Decimal:
+        return sum((result.amount for result in self.results if result.ok), Decimal(0))
+
+    @property
+    def outstanding_amount(self) -> Decimal:
+        return self.plan.total_amount - self.distributed_amount
+
+    def outstanding(self) -> list:
+        """
+        Entries of the failed chunks, ready to be passed to `bulk_distribute` again.
+
+        Resubmit them with `batch_id=report.plan.batch_id` and the same `chunk_size`, so
+        a chunk the API processed despite the error keeps its key and is not paid twice.
+        """
+        totals = self.plan.totals
+        return [
+            {CONTRIBUTOR_FIELD: contributor_id, AMOUNT_FIELD: totals[contributor_id]}
+            for result in self.failed for contributor_id in result.contributors
+        ]
+
+    def summary(self) -> dict:
+        plan = self.plan
+        return {
+            "batch_id": plan.batch_id,
+            "rows": plan.rows,
+            "rejected_rows": len(plan.rejected),
+            "merged_duplicates": plan.duplicates,
+            "contributors": plan.contributors,
+            "chunks": len(self.results),
+            "failed_chunks": len(self.failed),
+            "total_amount": str(plan.total_amount),
+            "distributed_amount": str(self.distributed_amount),
+            "outstanding_amount": str(self.outstanding_amount),
+        }
+
+    def __repr__(self):
+        return f"DistributionReport({self.summary()})"
+
+
 class Rewards:
     """
     Manages contributor reward systems, such as calculating and distributing token rewards.
@@ -22,6 +189,22 @@ class Rewards:
         endpoint = f"/projects/{project_id}/contributors/{contributor_id}/rewards/calculate"
         return self.client._make_request("GET", endpoint)
 
+    def calculate_rewards_local(self, project_id: str, activity: dict, method: str = None,
+                                **engine_options) -> RewardCalculation:
+        """
+        Calculates the rewards of many contributors locally, without any API request,
+        e.g. to preview or simulate a payout.
+
+        :param project_id: The ID of the project.
+        :param activity: Columnar activity data: `contributor_id`, `accepted` and optionally
+            `quality` sequences or numpy arrays.
+        :param method: "linear", "exponential" or "tiered"; defaults to the
+            `rewards.calculation_method` setting.
+        :param engine_options: Further `RewardEngine` options (rate, quality_weight, tiers, precision).
+        :return: A `RewardCalculation`; `to_payouts()` can be passed to `bulk_distribute`.
+        """
+        return RewardEngine(method, **engine_options).calculate_columns(activity, project_id)
+
     def distribute_rewards(self, project_id: str, distribution_data: dict):
         """
         Distributes rewards to contributors in a project.
@@ -33,6 +216,99 @@ class Rewards:
         endpoint = f"/projects/{project_id}/rewards/distribute"
         return self.client._make_request("POST", endpoint, json=distribution_data)
 
+    def plan_distribution(self, payouts, chunk_size: int = DEFAULT_DISTRIBUTION_CHUNK_SIZE,
+                          contributor_field: str = CONTRIBUTOR_FIELD, amount_field: str = AMOUNT_FIELD,
+                          batch_id: str = None) -> DistributionPlan:
+        """
+        Normalizes a payout table without sending anything, e.g. to preview a payout.
+
+        :param payouts: Iterable of dicts or (contributor_id, amount) pairs; a columnar dict
+            of equal-length sequences; or a CSV file path or open text file with a header row.
+        :param chunk_size: Maximum number of contributors per distribution request.
+        :param contributor_field: Column holding the contributor ID.
+        :param amount_field: Column holding the amount.
+        :param batch_id: Identifies the payout run in the idempotency keys, e.g. the payout
+            period; a random ID when omitted, so only this plan reuses its keys.
+        :return: A `DistributionPlan`.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        totals = {}
+        rejected = []
+        rows = 0
+        for rows, row in enumerate(_iter_payout_rows(payouts, contributor_field, amount_field), 1):
+            contributor_id, amount = row
+            if contributor_id is None or contributor_id == "":
+                rejected.append((rows, row, "missing contributor"))
+                continue
+            try:
+                amount = Decimal(str(amount).strip())
+            except (InvalidOperation, ValueError):
+                rejected.append((rows, row, "invalid amount"))
+                continue
+            if not amount.is_finite() or amount < 0:
+                rejected.append((rows, row, "invalid amount"))
+                continue
+            contributor_id = str(contributor_id)
+            totals[contributor_id] = totals.get(contributor_id, Decimal(0)) + amount
+        return DistributionPlan(totals, chunk_size, rows, rejected, batch_id)
+
+    def bulk_distribute(self, project_id: str, payouts, chunk_size: int = DEFAULT_DISTRIBUTION_CHUNK_SIZE,
+                        max_workers: int = DEFAULT_DISTRIBUTION_WORKERS, **plan_options) -> DistributionReport:
+        """
+        Distributes rewards for a whole payout table.
+
+        Duplicate contributor entries are summed and the table is sent in chunks of
+        `chunk_size` contributors, `max_workers` chunks at a time. Every request carries
+        an `Idempotency-Key`, so the client's retry policy can safely resend it. To resume
+        an interrupted payout without paying anyone twice, pass the same plan again or the
+        same table with the `batch_id` of the first run. A failing chunk is recorded in
+        the report and never aborts the others.
+
+        :param project_id: The ID of the project.
+        :param payouts: Payout table (see `plan_distribution`) or a `DistributionPlan`.
+        :param chunk_size: Maximum number of contributors per request.
+        :param max_workers: Number of chunks submitted concurrently.
+        :param plan_options: Further `plan_distribution` options (contributor_field, amount_field, batch_id).
+        :return: A `DistributionReport`.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        plan = payouts if isinstance(payouts, DistributionPlan) else self.plan_distribution(
+            payouts, chunk_size=chunk_size, **plan_options
+        )
+
+        indexes = iter(range(len(plan.chunks)))
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = set()
+            while True:
+                for index in indexes:
+                    pending.add(pool.submit(self._distribute_chunk, project_id, plan, index))
+                    if len(pending) >= max_workers:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+
+        results.sort(key=lambda result: result.index)
+        return DistributionReport(plan, results)
+
+    def _distribute_chunk(self, project_id: str, plan: DistributionPlan, index: int) -> ChunkResult:
+        """Submits one chunk of a plan, capturing its failure."""
+        contributors = plan.chunks[index]
+        key = plan.idempotency_key(project_id, index)
+        result = ChunkResult(index, key, contributors, sum((plan.totals[c] for c in contributors), Decimal(0)))
+        endpoint = f"/projects/{project_id}/rewards/distribute"
+        try:
+            result.response = self.client._make_request(
+                "POST", endpoint, json=plan.payload(index), headers={"Idempotency-Key": key}
+            )
+        except Exception as e:
+            result.error = e
+        return result
+
     def get_contributor_rewards(self, project_id: str, contributor_id: str):
         """
         Retrieves the reward history for a specific contributor in a project.
@@ -44,6 +320,20 @@ class Rewards:
         endpoint = f"/projects/{project_id}/contributors/{contributor_id}/rewards"
         return self.client._make_request("GET", endpoint)
 
+    def ledger(self, project_id: str, path: str) -> RewardLedger:
+        """
+        Opens a local reward ledger of a project, synced through this instance.
+
+        Balance and history reads on the ledger are local SQLite lookups; call
+        `sync()` or `start_sync()` on it, or `attach()` it to the webhook registry, to
+        keep it current.
+
+        :param project_id: The ID of the project.
+        :param path: SQLite database file, or ":memory:".
+        :return: A `RewardLedger`.
+        """
+        return RewardLedger(path, project_id, self)
+
     def list_all_rewards(self, project_id: str, filters: dict = None):
         """
         Retrieves a list of all rewards in a project, optionally filtered.
@@ -54,3 +344,53 @@ class Rewards:
         """
         endpoint = f"/projects/{project_id}/rewards"
         return self.client._make_request("GET", endpoint, params=filters)
+
+    def iter_all_rewards(self, project_id: str, filters: dict = None, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True):
+        """
+        Lazily iterates over all rewards in a project, following pagination cursors.
+
+        The next page is fetched in the background while the current one is consumed,
+        so memory stays bounded by the page size.
+
+        :param project_id: The ID of the project.
+        :param filters: Optional dictionary containing filter parameters.
+        :param page_size: Number of items requested per page.
+        :param prefetch: Fetch the next page while the current one is consumed.
+        :return: Generator of rewards.
+        """
+        endpoint = f"/projects/{project_id}/rewards"
+        return iter_items(
+            lambda params: self.client._make_request("GET", endpoint, params=params),
+            filters, page_size=page_size, prefetch=prefetch,
+        )
+
+
+def _iter_payout_rows(payouts, contributor_field: str, amount_field: str):
+    """Yields (contributor_id, amount) pairs from any supported payout table layout."""
+    if isinstance(payouts, (str, os.PathLike)):
+        with open(payouts, newline="") as f:
+            yield from _iter_payout_rows(f, contributor_field, amount_field)
+        return
+    if isinstance(payouts, io.TextIOBase) or hasattr(payouts, "readline"):
+        for row in csv.DictReader(payouts):
+            yield row.get(contributor_field), row.get(amount_field)
+        return
+    if isinstance(payouts, dict):
+        contributors = payouts[contributor_field]
+        amounts = payouts[amount_field]
+        if len(contributors) != len(amounts):
+            raise ValueError("Payout columns have different lengths")
+        contributors = contributors.tolist() if hasattr(contributors, "tolist") else contributors
+        amounts = amounts.tolist() if hasattr(amounts, "tolist") else amounts
+        yield from zip(contributors, amounts)
+        return
+    for row in payouts:
+        if isinstance(row, dict):
+            yield row.get(contributor_field), row.get(amount_field)
+        else:
+            yield tuple(row)
+
+
+def _json_amount(amount: Decimal) -> str:
+    """Formats an aggregated amount as an exact decimal string; a JSON float would round it."""
+    return format(amount, "f")
@@ -0,0 +1,98 @@
+import hashlib
+import hmac
+import threading
+
+# Largest payload hashed by default; bigger bodies are rejected unread
+DEFAULT_MAX_PAYLOAD_SIZE = 1024 * 1024  # bytes
+
+
+class SignatureVerifier:
+    """
+    Verifies HMAC signatures of webhook payloads.
+
+    The keyed HMAC state of each secret is computed once and copied for every request,
+    so verification costs one `copy()` plus the hashing of the payload. Several secrets
+    can be active at once: during a rotation, add the new secret, switch the sender over,
+    then remove the old one. Payloads larger than `max_payload_size` are rejected before
+    any hashing is done.
+    """
+
+    def __init__(self, secrets, max_payload_size: int = DEFAULT_MAX_PAYLOAD_SIZE, digestmod=hashlib.sha256):
+        """
+        :param secrets: Active secret or iterable of active secrets (str or bytes).
+        :param max_payload_size: Largest payload accepted, in bytes.
+        :param digestmod: Hash constructor used by the sender.
+        """
+        self.max_payload_size = max_payload_size
+        self.digestmod = digestmod
+        self._lock = threading.Lock()
+        self._keyed = {}
+        self.set_secrets(secrets)
+
+    @property
+    def secret_count(self) -> int:
+        """Number of active secrets."""
+        return len(self._keyed)
+
+    def set_secrets(self, secrets):
+        """
+        Replaces the active secrets.
+        """
+        if isinstance(secrets, (str, bytes)):
+            secrets = [secrets]
+        keyed = {}
+        for secret in secrets:
+            key = _key_bytes(secret)
+            keyed[key] = hmac.new(key, digestmod=self.digestmod)
+        if not keyed:
+            raise ValueError("At least one webhook secret is required")
+        with self._lock:
+            self._keyed = keyed
+            self._states = tuple(keyed.values())
+
+    def add_secret(self, secret):
+        """
+        Starts accepting signatures made with an additional secret.
+        """
+        with self._lock:
+            secrets = list(self._keyed)
+        self.set_secrets(secrets + [_key_bytes(secret)])
+
+    def remove_secret(self, secret):
+        """
+        Stops accepting signatures made with a secret.
+        """
+        key = _key_bytes(secret)
+        with self._lock:
+            secrets = [k for k in self._keyed if k != key]
+        self.set_secrets(secrets)
+
+    def sign(self, payload: bytes) -> str:
+        """
+        Returns the hex signature of a payload under the first active secret.
+        """
+        mac = self._states[0].copy()
+        mac.update(payload)
+        return mac.hexdigest()
+
+    def verify(self, payload: bytes, signature: str) -> bool:
+        """
+        Checks a payload against its signature.
+
+        :param payload: Raw request body.
+        :param signature: Hex signature sent by the Scaile platform.
+        :return: True if any active secret produced the signature.
+        """
+        if not signature or len(payload) > self.max_payload_size:
+            return False
+        for state in self._states:
+            mac = state.copy()
+            mac.update(payload)
+            if hmac.compare_digest(mac.hexdigest(), signature):
+                return True
+        return False
+
+
+def _key_bytes(secret) -> bytes:
+    """Encodes a secret given as str."""
+    return secret.encode() if isinstance(secret, str) else bytes(secret)
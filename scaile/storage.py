@@ -1,29 +1,278 @@
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .cache import ContentCache
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+
+# Chunked upload defaults
+DEFAULT_PART_SIZE = 8 * 1024 * 1024  # bytes
+DEFAULT_UPLOAD_WORKERS = 4
+CHECKPOINT_SUFFIX = ".scaile-upload"
+
+# Streaming download defaults
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # bytes
+DOWNLOAD_HEADERS = {"Accept": "application/octet-stream", "Accept-Encoding": "identity"}
+
+
+class UploadCheckpoint:
+    """
+    Records the completed parts of a chunked upload in a local JSON file,
+    so an interrupted upload can continue where it left off.
+    """
+
+    def __init__(self, path: str, state: dict):
+        """
+        :param path: Location of the checkpoint file.
+        :param state: Checkpoint contents (upload_id, file identity, part size and completed parts).
+        """
+        self.path = path
+        self.state = state
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, path: str, identity: dict):
+        """
+        Loads a checkpoint, ignoring it when it belongs to a different version of the file.
+
+        :param path: Location of the checkpoint file.
+        :param identity: Size, modification time and part size of the file being uploaded.
+        :return: An UploadCheckpoint, or None when there is nothing to resume.
+        """
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("identity") != identity or not state.get("upload_id"):
+            return None
+        return cls(path, state)
+
+    @property
+    def upload_id(self) -> str:
+        return self.state["upload_id"]
+
+    @property
+    def parts(self) -> dict:
+        """Mapping of completed part numbers (as strings) to their ETags."""
+        return self.state["parts"]
+
+    def record_part(self, part_number: int, etag):
+        """
+        Marks a part as uploaded and atomically rewrites the checkpoint file.
+        """
+        with self._lock:
+            self.parts[str(part_number)] = etag
+            self.save()
+
+    def save(self):
+        """Atomically writes the checkpoint file."""
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.path)
+
+    def remove(self):
+        """Deletes the checkpoint file once the upload has completed."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class DownloadSink:
+    """
+    Destination for a streamed download: a file path, a writable file object, or a
+    writable buffer such as a `bytearray`, `memoryview` or `mmap.mmap`.
+
+    Buffers are filled in place with `readinto`, so response bytes are not copied into
+    intermediate objects. Path sinks open one handle per segment, so segments can be
+    written in parallel; file objects are shared, so their writes are serialized, and
+    non-seekable ones are always downloaded as a single stream.
+    """
+
+    def __init__(self, destination):
+        """
+        :param destination: File path, writable file object or writable buffer.
+        """
+        self.path = None
+        self.file = None
+        self.view = None
+        self._base = None
+        self._lock = threading.Lock()
+
+        if isinstance(destination, (str, os.PathLike)):
+            self.path = os.fspath(destination)
+            return
+        try:
+            self.view = memoryview(destination).cast("B")
+        except TypeError:
+            if not hasattr(destination, "write"):
+                raise TypeError("Download destination must be a path, file object or writable buffer")
+            self.file = destination
+            self._base = destination.tell() if destination.seekable() else None
+            return
+        if self.view.readonly:
+            raise TypeError("Download destination buffer must be writable")
+
+    @property
+    def random_access(self) -> bool:
+        """True if bytes can be written at any offset, which parallel segments need."""
+        return self.file is None or self._base is not None
+
+    def existing_size(self) -> int:
+        """Number of bytes already present at a path destination (used to resume)."""
+        if self.path is not None and os.path.exists(self.path):
+            return os.path.getsize(self.path)
+        return 0
+
+    def prepare(self, size: int):
+        """
+        Sizes the destination before writing: truncates or extends a path to `size`
+        bytes and checks that a buffer is large enough.
+        """
+        if self.path is not None:
+            with open(self.path, "ab"):
+                pass
+            os.truncate(self.path, size)
+        elif self.view is not None and size > len(self.view):
+            raise ValueError(f"Download destination holds {len(self.view)} bytes, {size} needed")
+
+    def write_from(self, raw, offset: int, chunk_size: int) -> int:
+        """
+        Streams a body into the destination starting at `offset`.
+
+        :param raw: Binary stream supporting `readinto` (e.g. `response.raw` or an open file).
+        :param offset: Byte offset of the first body byte in the destination.
+        :param chunk_size: Maximum number of bytes read per call.
+        :return: Number of bytes written.
+        """
+        if self.view is not None:
+            position = offset
+            while True:
+                n = raw.readinto(self.view[position:position + chunk_size])
+                if not n:
+                    if position >= len(self.view) and raw.read(1):
+                        raise ValueError("Download destination buffer is too small")
+                    return position - offset
+                position += n
+
+        buffer = bytearray(chunk_size)
+        chunk = memoryview(buffer)
+        written = 0
+        if self.path is not None:
+            with open(self.path, "r+b") as file:
+                file.seek(offset)
+                while True:
+                    n = raw.readinto(buffer)
+                    if not n:
+                        return written
+                    file.write(chunk[:n])
+                    written += n
+
+        while True:
+            n = raw.readinto(buffer)
+            if not n:
+                return written
+            with self._lock:
+                if self._base is not None:
+                    self.file.seek(self._base + offset + written)
+                self.file.write(chunk[:n])
+            written += n
+
+
 class Storage:
     """
     Provides methods for uploading, retrieving, and managing data on decentralized storage platforms (e.g., IPFS).
     """
 
-    def __init__(self, client):
+    def __init__(self, client, cache: ContentCache = None):
         """
         Initializes the Storage class with a reference to the main Client.
 
         :param client: An instance of the Client class for making API requests.
+        :param cache: Optional local content cache used by `download_data` and `cached_path`.
         """
         self.client = client
+        self.cache = cache
 
-    def upload_data(self, project_id: str, file_path: str):
+    def upload_data(self, project_id: str, file_path: str, part_size: int = None,
+                    max_workers: int = DEFAULT_UPLOAD_WORKERS, checkpoint_path: str = None):
         """
         Uploads a file to the decentralized storage platform.
 
+        When `part_size` is given, the file is streamed as fixed-size parts uploaded
+        concurrently by `max_workers` threads, and completed parts are recorded in a
+        local checkpoint (`<file_path>.scaile-upload` by default). Calling again after an
+        interruption resumes the same upload and only sends the missing parts.
+
         :param project_id: The ID of the project.
         :param file_path: The local path to the file to be uploaded.
+        :param part_size: Size in bytes of each part for a chunked, resumable upload.
+        :param max_workers: Number of parts uploaded concurrently in chunked mode.
+        :param checkpoint_path: Location of the checkpoint file in chunked mode.
         :return: Response containing the storage location and metadata.
         """
+        if part_size:
+            return self._upload_multipart(project_id, file_path, part_size, max_workers, checkpoint_path)
+
         endpoint = f"/projects/{project_id}/storage/upload"
         with open(file_path, 'rb') as file:
             files = {"file": file}
             return self.client._make_request("POST", endpoint, files=files)
 
+    def _upload_multipart(self, project_id: str, file_path: str, part_size: int,
+                          max_workers: int, checkpoint_path: str = None):
+        """Runs a chunked upload: initiate (or resume), upload missing parts, complete."""
+        if part_size < 1 or max_workers < 1:
+            raise ValueError("part_size and max_workers must be positive")
+
+        stat = os.stat(file_path)
+        identity = {"size": stat.st_size, "mtime": stat.st_mtime, "part_size": part_size}
+        checkpoint_path = checkpoint_path or f"{file_path}{CHECKPOINT_SUFFIX}"
+        uploads_endpoint = f"/projects/{project_id}/storage/uploads"
+
+        checkpoint = UploadCheckpoint.load(checkpoint_path, identity)
+        if checkpoint is None:
+            response = self.client._make_request("POST", uploads_endpoint, json={
+                "filename": os.path.basename(file_path),
+                "size": stat.st_size,
+                "part_size": part_size,
+            })
+            checkpoint = UploadCheckpoint(checkpoint_path, {
+                "upload_id": response["upload_id"],
+                "identity": identity,
+                "parts": {},
+            })
+            # Persist the upload ID before any part is sent, so a failure from here on
+            # resumes this upload instead of orphaning it on the server
+            checkpoint.save()
+
+        upload_endpoint = f"{uploads_endpoint}/{checkpoint.upload_id}"
+        part_count = max(1, -(-stat.st_size // part_size))
+        missing = [n for n in range(1, part_count + 1) if str(n) not in checkpoint.parts]
+
+        def upload_part(part_number):
+            with open(file_path, "rb") as file:
+                file.seek((part_number - 1) * part_size)
+                chunk = file.read(part_size)
+            response = self.client._make_request(
+                "PUT", f"{upload_endpoint}/parts/{part_number}",
+                data=chunk, headers={"Content-Type": "application/octet-stream"},
+            )
+            checkpoint.record_part(part_number, (response or {}).get("etag"))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # list() re-raises the first failed part; finished parts stay checkpointed
+            list(pool.map(upload_part, missing))
+
+        parts = [{"part_number": n, "etag": checkpoint.parts[str(n)]} for n in range(1, part_count + 1)]
+        response = self.client._make_request("POST", f"{upload_endpoint}/complete", json={"parts": parts})
+        checkpoint.remove()
+        return response
+
     def retrieve_data(self, project_id: str, file_id: str):
         """
         Retrieves a file from the decentralized storage platform.
@@ -35,6 +284,115 @@ class Storage:
         endpoint = f"/projects/{project_id}/storage/files/{file_id}"
         return self.client._make_request("GET", endpoint)
 
+    def download_data(self, project_id: str, file_id: str, destination, segments: int = 1,
+                      resume: bool = False, chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE):
+        """
+        Streams a file's content straight into a destination without buffering it in memory.
+
+        With `segments > 1` and a server that accepts range requests, the file is split
+        into that many byte ranges downloaded in parallel. With `resume=True`, a partially
+        downloaded path destination is continued from its current size.
+
+        :param project_id: The ID of the project.
+        :param file_id: The ID of the file to download.
+        :param destination: File path, writable file object, or writable buffer (`bytearray`, `memoryview`, `mmap`).
+        :param segments: Number of byte ranges to download in parallel.
+        :param resume: Continue a partial download at a path destination, from the cache when one is set.
+        :param chunk_size: Maximum number of bytes read from the socket per call.
+        :return: Total size in bytes of the downloaded file.
+        """
+        sink = destination if isinstance(destination, DownloadSink) else DownloadSink(destination)
+        if self.cache is None:
+            return self._download(project_id, file_id, sink, segments, resume, chunk_size)
+
+        path = self.cached_path(project_id, file_id, segments=segments, chunk_size=chunk_size)
+        size = os.path.getsize(path)
+        offset = sink.existing_size() if resume else 0
+        if sink.path is not None and 0 < offset <= size:
+            # Resume: copy only the missing tail of the cached content
+            sink.prepare(offset)
+            with open(path, "rb") as cached:
+                cached.seek(offset)
+                return offset + sink.write_from(cached, offset, chunk_size)
+        if sink.path is not None:
+            shutil.copyfile(path, sink.path)
+            return size
+        sink.prepare(size)
+        with open(path, "rb") as cached:
+            return sink.write_from(cached, 0, chunk_size)
+
+    def cached_path(self, project_id: str, file_id: str, segments: int = 1,
+                    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE) -> str:
+        """
+        Returns a local path holding the file's content, downloading it into the cache on a miss.
+
+        File content is immutable per file ID / CID, so repeated reads (e.g. once per
+        training epoch) are served from disk without touching the network.
+
+        :param project_id: The ID of the project.
+        :param file_id: The ID (or CID) of the file.
+        :param segments: Number of byte ranges to download in parallel on a miss.
+        :param chunk_size: Maximum number of bytes read from the socket per call.
+        :return: Path to the cached content. Treat it as read-only.
+        """
+        if self.cache is None:
+            raise ValueError("Storage was created without a cache")
+        return self.cache.fetch(file_id, lambda tmp_path: self._download(
+            project_id, file_id, DownloadSink(tmp_path), segments, False, chunk_size,
+        ))
+
+    def _download(self, project_id: str, file_id: str, sink: DownloadSink,
+                  segments: int, resume: bool, chunk_size: int):
+        """Streams a file from the API into a sink; see `download_data`."""
+        endpoint = f"/projects/{project_id}/storage/files/{file_id}/content"
+
+        offset = sink.existing_size() if resume else 0
+        # Segments arrive out of order; a non-seekable stream can only be written in order
+        if segments > 1 and offset == 0 and sink.random_access:
+            with self.client._stream_request("HEAD", endpoint, headers=DOWNLOAD_HEADERS) as head:
+                size = int(head.headers.get("Content-Length") or 0)
+                accepts_ranges = head.headers.get("Accept-Ranges") == "bytes"
+            if accepts_ranges and size > 0:
+                return self._download_segments(endpoint, sink, size, segments, chunk_size)
+
+        headers = dict(DOWNLOAD_HEADERS)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        try:
+            response = self.client._stream_request("GET", endpoint, headers=headers)
+        except Exception as e:
+            # 416: the partial file already holds the whole content
+            if offset and getattr(getattr(e, "response", None), "status_code", None) == 416:
+                return offset
+            raise
+
+        with response:
+            if response.status_code != 206:
+                offset = 0
+            if sink.path is not None:
+                sink.prepare(offset)
+            return offset + sink.write_from(response.raw, offset, chunk_size)
+
+    def _download_segments(self, endpoint: str, sink: DownloadSink, size: int, segments: int, chunk_size: int):
+        """Downloads `size` bytes as parallel range requests written at their offsets."""
+        sink.prepare(size)
+        segment_size = -(-size // segments)
+        ranges = [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+
+        def download_range(byte_range):
+            start, end = byte_range
+            headers = {**DOWNLOAD_HEADERS, "Range": f"bytes={start}-{end}"}
+            with self.client._stream_request("GET", endpoint, headers=headers) as response:
+                if response.status_code != 206:
+                    raise ValueError(f"Server ignored range request for bytes {start}-{end}")
+                return sink.write_from(response.raw, start, chunk_size)
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            written = sum(pool.map(download_range, ranges))
+        if written != size:
+            raise IOError(f"Incomplete download: received {written} of {size} bytes")
+        return size
+
     def delete_data(self, project_id: str, file_id: str):
         """
         Deletes a file from the decentralized storage platform.
@@ -56,3 +414,22 @@ class Storage:
         """
         endpoint = f"/projects/{project_id}/storage/files"
         return self.client._make_request("GET", endpoint, params=filters)
+
+    def iter_files(self, project_id: str, filters: dict = None, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True):
+        """
+        Lazily iterates over files stored in a project, following pagination cursors.
+
+        The next page is fetched in the background while the current one is consumed,
+        so memory stays bounded by the page size.
+
+        :param project_id: The ID of the project.
+        :param filters: Optional dictionary containing filter parameters.
+        :param page_size: Number of items requested per page.
+        :param prefetch: Fetch the next page while the current one is consumed.
+        :return: Generator of files and their metadata.
+        """
+        endpoint = f"/projects/{project_id}/storage/files"
+        return iter_items(
+            lambda params: self.client._make_request("GET", endpoint, params=params),
+            filters, page_size=page_size, prefetch=prefetch,
+        )
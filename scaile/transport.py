@@ -0,0 +1,88 @@
+import requests
+from requests.adapters import HTTPAdapter
+from .configs import config_value
+
+# Defaults used when neither the caller nor the environment config set a value
+DEFAULT_CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_READ_TIMEOUT = 30  # seconds
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that applies a default (connect, read) timeout to every request
+    sent through it, so callers never block forever on a stalled socket.
+    """
+
+    def __init__(self, timeout=None, *args, **kwargs):
+        """
+        Initializes the adapter with a default timeout.
+
+        :param timeout: Either a single number of seconds or a (connect, read) tuple.
+        """
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        """
+        Sends the prepared request, filling in the default timeout when none is given.
+        """
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def resolve_timeout(timeout=None, connect_timeout=None):
+    """
+    Builds the (connect, read) timeout tuple used by the transport.
+
+    Values that are not passed explicitly fall back to the ``api`` section of the
+    active environment config and then to the module defaults.
+
+    :param timeout: Read timeout in seconds, or a full (connect, read) tuple.
+    :param connect_timeout: Connect timeout in seconds.
+    :return: A (connect, read) tuple.
+    """
+    if isinstance(timeout, tuple):
+        return timeout
+
+    if timeout is None:
+        timeout = config_value("api", "timeout", DEFAULT_READ_TIMEOUT)
+    if connect_timeout is None:
+        connect_timeout = config_value("api", "connect_timeout", DEFAULT_CONNECT_TIMEOUT)
+    return (float(connect_timeout), float(timeout))
+
+
+def build_session(timeout=None, connect_timeout=None,
+                  pool_connections=None, pool_maxsize=None, pool_block=False):
+    """
+    Creates a keep-alive ``requests.Session`` backed by a shared connection pool.
+
+    The underlying urllib3 pools are thread-safe, so a single session can be shared
+    by every resource class and worker thread of a ``Client``.
+
+    :param timeout: Read timeout in seconds, or a full (connect, read) tuple.
+    :param connect_timeout: Connect timeout in seconds.
+    :param pool_connections: Number of per-host pools to keep cached.
+    :param pool_maxsize: Maximum number of connections kept alive per host.
+    :param pool_block: Whether to block when the pool is exhausted instead of opening extra connections.
+    :return: A configured ``requests.Session``.
+    """
+    if pool_connections is None:
+        pool_connections = config_value("api", "pool_connections", DEFAULT_POOL_CONNECTIONS)
+    if pool_maxsize is None:
+        pool_maxsize = config_value("api", "pool_maxsize", DEFAULT_POOL_MAXSIZE)
+
+    adapter = TimeoutHTTPAdapter(
+        timeout=resolve_timeout(timeout, connect_timeout),
+        pool_connections=int(pool_connections),
+        pool_maxsize=int(pool_maxsize),
+        pool_block=pool_block,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
@@ -19,6 +19,28 @@ class Utils:
             raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
         return True
 
+    @staticmethod
+    def compile_validator(schema: dict):
+        """
+        Compiles a schema into a `BatchValidator` that validates whole batches at once.
+
+        :param schema: Field rules, e.g. `{"text": str, "label": {"type": str, "labels": {"cat", "dog"}}}`.
+        :return: A `BatchValidator`; reuse it across batches.
+        """
+        from .validation import BatchValidator
+        return BatchValidator(schema)
+
+    @staticmethod
+    def validate_batch(rows, schema: dict):
+        """
+        Validates a batch of records against a schema without raising.
+
+        :param rows: List of dicts, a columnar dict of sequences, or an NDJSON string.
+        :param schema: Field rules (see `compile_validator`).
+        :return: A `ValidationResult` holding one error mask per row (0 for valid rows).
+        """
+        return Utils.compile_validator(schema).validate(rows)
+
     @staticmethod
     def handle_api_response(response):
         """
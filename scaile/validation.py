@@ -0,0 +1,305 @@
+import json
+import operator
+from itertools import islice
+
+# Bit 0 flags rows that are not JSON objects; each schema field then uses three bits
+INVALID_ROW = 1
+MISSING, WRONG_TYPE, UNKNOWN_LABEL = 0, 1, 2
+ERROR_NAMES = ("missing", "wrong type", "unknown label")
+DEFAULT_CHUNK_SIZE = 10000  # rows validated at once when streaming
+
+# numpy dtype kinds accepted for each declared type, checked once per column
+DTYPE_KINDS = {int: "iu", float: "iuf", bool: "b", str: "U"}
+
+_MISSING = object()
+
+
+class FieldSpec:
+    """
+    Compiled rules of one schema field.
+    """
+
+    __slots__ = ("name", "types", "required", "nullable", "labels", "shift")
+
+    def __init__(self, name: str, spec, shift: int):
+        if not isinstance(spec, dict):
+            spec = {"type": spec}
+        types = spec.get("type", object)
+        types = tuple(types) if isinstance(types, (tuple, list)) else (types,)
+        if float in types and int not in types:
+            # JSON has a single number type: accept 3 where 3.0 is expected
+            types += (int,)
+        self.name = name
+        self.types = frozenset(types)
+        self.required = spec.get("required", True)
+        self.nullable = spec.get("nullable", False)
+        labels = spec.get("labels")
+        self.labels = frozenset(labels) if labels is not None else None
+        self.shift = shift
+
+    def bit(self, error: int) -> int:
+        return 1 << (self.shift + error)
+
+    def check(self, values) -> list:
+        """Returns the error bits of this field for every value of a column."""
+        missing = self.bit(MISSING) if self.required else 0
+        wrong_type = self.bit(WRONG_TYPE)
+        types = self.types
+        any_type = object in types
+        nullable = self.nullable
+
+        if hasattr(values, "dtype"):
+            # numpy column: one dtype check replaces the per-value type checks
+            kinds = "".join(DTYPE_KINDS.get(t, "") for t in types)
+            type_ok = any_type or values.dtype.kind in kinds
+            values = values.tolist()
+            if type_ok:
+                return self._check_labels(values, [0] * len(values))
+
+        bits = [
+            0 if type(value) in types and value is not _MISSING else
+            missing if value is _MISSING else
+            0 if any_type or value is None and nullable else
+            0 if any(isinstance(value, t) and not (t is int and type(value) is bool) for t in types) else
+            wrong_type
+            for value in values
+        ]
+        return self._check_labels(values, bits)
+
+    def _check_labels(self, values, bits: list) -> list:
+        """Adds the unknown-label bit for values outside the vocabulary."""
+        labels = self.labels
+        if labels is None:
+            return bits
+        unknown = self.bit(UNKNOWN_LABEL)
+        return [
+            b if b or value is _MISSING or value is None else
+            b if (_all_in(value, labels) if type(value) is list else _in(value, labels)) else
+            unknown
+            for b, value in zip(bits, values)
+        ]
+
+
+def _in(value, labels) -> bool:
+    """Membership test that treats unhashable values as unknown."""
+    try:
+        return value in labels
+    except TypeError:
+        return False
+
+
+def _all_in(values: list, labels: frozenset) -> bool:
+    """True if every element of a list value is an allowed label."""
+    try:
+        return labels.issuperset(values)
+    except TypeError:
+        return False
+
+
+class ValidationResult:
+    """
+    Per-row error masks of a validated batch.
+
+    Each mask is an int; 0 means the row is valid. Use `errors(i)` to decode a row's
+    mask and `filter(rows)` to keep the valid rows.
+    """
+
+    def __init__(self, fields: tuple, masks: list):
+        self.fields = fields
+        self.masks = masks
+
+    def __len__(self):
+        return len(self.masks)
+
+    @property
+    def valid(self) -> list:
+        """One boolean per row."""
+        return [not mask for mask in self.masks]
+
+    @property
+    def invalid_rows(self) -> list:
+        """Indices of rows with at least one error."""
+        return [i for i, mask in enumerate(self.masks) if mask]
+
+    @property
+    def ok(self) -> bool:
+        """True if every row is valid."""
+        return not any(self.masks)
+
+    def errors(self, index: int) -> list:
+        """
+        Decodes the mask of one row.
+
+        :return: Messages such as "label: unknown label".
+        """
+        mask = self.masks[index]
+        if mask & INVALID_ROW:
+            return ["row: not a JSON object"]
+        return [
+            f"{field.name}: {ERROR_NAMES[error]}"
+            for field in self.fields for error in (MISSING, WRONG_TYPE, UNKNOWN_LABEL)
+            if mask & field.bit(error)
+        ]
+
+    def summary(self) -> dict:
+        """
+        Counts errors per field and kind, e.g. `{"label: unknown label": 3}`.
+        """
+        counts = {}
+        if any(mask & INVALID_ROW for mask in self.masks):
+            counts["row: not a JSON object"] = sum(1 for mask in self.masks if mask & INVALID_ROW)
+        for field in self.fields:
+            for error in (MISSING, WRONG_TYPE, UNKNOWN_LABEL):
+                bit = field.bit(error)
+                n = sum(1 for mask in self.masks if mask & bit)
+                if n:
+                    counts[f"{field.name}: {ERROR_NAMES[error]}"] = n
+        return counts
+
+    def filter(self, rows):
+        """
+        Keeps the valid rows of the validated batch.
+
+        :param rows: The list of dicts or columnar dict that was validated.
+        :return: Rows in the same layout.
+        """
+        if isinstance(rows, dict):
+            keep = self.valid
+            return {name: [v for v, k in zip(_as_list(column), keep) if k] for name, column in rows.items()}
+        return [row for row, mask in zip(rows, self.masks) if not mask]
+
+
+class BatchValidator:
+    """
+    Schema validator compiled once and applied to whole batches of annotation rows.
+
+    The schema maps field names to a type, a tuple of types, or a dict with the keys
+    `type`, `required` (default True), `nullable` (default False) and `labels` (allowed
+    values; for list values every element must be allowed)::
+
+        validator = BatchValidator({
+            "text": str,
+            "label": {"type": str, "labels": {"cat", "dog"}},
+            "score": {"type": float, "required": False},
+        })
+        result = validator.validate(rows)
+        good = result.filter(rows)
+
+    Batches are checked column by column, so each rule runs as one tight loop over
+    the batch instead of once per row and field.
+    """
+
+    def __init__(self, schema: dict):
+        """
+        :param schema: Field rules, as described above.
+        """
+        self.fields = tuple(FieldSpec(name, spec, 1 + 3 * i) for i, (name, spec) in enumerate(schema.items()))
+
+    def validate(self, rows) -> ValidationResult:
+        """
+        Validates a batch.
+
+        :param rows: List of dicts, a columnar dict of equal-length sequences (lists or
+            numpy arrays), or an NDJSON string/bytes.
+        :return: A `ValidationResult` with one mask per row.
+        """
+        if isinstance(rows, (str, bytes)):
+            return self.validate_ndjson(rows.splitlines())
+        if isinstance(rows, dict):
+            return self.validate_columns(rows)
+        return self.validate_rows(rows)
+
+    def validate_rows(self, rows) -> ValidationResult:
+        """
+        Validates a list of dicts.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        masks = [0 if type(row) is dict else INVALID_ROW for row in rows]
+        objects = [row if type(row) is dict else {} for row in rows]
+        has_invalid = any(masks)
+        for field in self.fields:
+            name = field.name
+            masks = list(map(operator.or_, masks, field.check([row.get(name, _MISSING) for row in objects])))
+        if has_invalid:
+            # A row that is not an object has no field errors of its own
+            masks = [INVALID_ROW if mask & INVALID_ROW else mask for mask in masks]
+        return ValidationResult(self.fields, masks)
+
+    def validate_columns(self, columns: dict) -> ValidationResult:
+        """
+        Validates columnar data: a dict mapping field names to equal-length sequences.
+        """
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        size = lengths.pop() if lengths else 0
+        masks = [0] * size
+        for field in self.fields:
+            column = columns.get(field.name)
+            values = [_MISSING] * size if column is None else column
+            masks = list(map(operator.or_, masks, field.check(values)))
+        return ValidationResult(self.fields, masks)
+
+    def validate_ndjson(self, lines) -> ValidationResult:
+        """
+        Validates newline-delimited JSON (an iterable of lines, e.g. an open file).
+        Blank lines are skipped; lines that are not JSON objects are flagged.
+        """
+        masks = []
+        for chunk in self._ndjson_chunks(lines, DEFAULT_CHUNK_SIZE):
+            masks += self.validate_rows(chunk).masks
+        return ValidationResult(self.fields, masks)
+
+    def iter_valid(self, rows, chunk_size: int = DEFAULT_CHUNK_SIZE, on_invalid=None):
+        """
+        Lazily yields the valid rows of a stream of dicts or NDJSON lines, validating
+        `chunk_size` rows at a time so memory stays bounded. The output can be passed
+        straight to `Annotation.bulk_create`.
+
+        :param rows: Iterable of dicts, or of NDJSON lines (str or bytes).
+        :param chunk_size: Rows validated at once.
+        :param on_invalid: Optional callable receiving (row, errors) for each rejected row.
+        """
+        iterator = iter(rows)
+        first = next(iterator, _MISSING)
+        if first is _MISSING:
+            return
+        iterator = _prepend(first, iterator)
+        if isinstance(first, (str, bytes)):
+            chunks = self._ndjson_chunks(iterator, chunk_size)
+        else:
+            chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+
+        for chunk in chunks:
+            result = self.validate_rows(chunk)
+            for i, (row, mask) in enumerate(zip(chunk, result.masks)):
+                if not mask:
+                    yield row
+                elif on_invalid is not None:
+                    on_invalid(row, result.errors(i))
+
+    @staticmethod
+    def _ndjson_chunks(lines, chunk_size: int):
+        """Parses NDJSON lines into lists of at most `chunk_size` rows."""
+        chunk = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                chunk.append(json.loads(line))
+            except ValueError:
+                chunk.append(None)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _as_list(column) -> list:
+    return column.tolist() if hasattr(column, "tolist") else list(column)
+
+
+def _prepend(first, iterator):
+    yield first
+    yield from iterator
@@ -0,0 +1,222 @@
+"""
+Asyncio webhook receiver exposed as a plain ASGI application.
+
+Run it locally with any ASGI server, for example:
+
+    uvicorn scaile.webhook_asgi:app --port 5000
+
+Deliveries are verified with `verify_signature`, acknowledged with 202 and processed in
+background tasks, so one process can hold thousands of concurrent deliveries without a
+thread per request.
+"""
+
+import asyncio
+from concurrent.futures import Future
+from .idempotency import DELIVERY_ID_HEADER, IdempotencyStore, attach_delivery_id, event_id_of
+from .logging import logger
+from .retry import RetryPolicy
+from .webhook_listener import MAX_RETRIES, RETRY_DELAY, json_codec, process_webhook, verify_signature
+
+# Limits of the asyncio receiver
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024  # bytes
+DEFAULT_MAX_CONCURRENCY = 1000  # handlers running at once
+DEFAULT_MAX_PENDING = 10000  # accepted events not yet processed
+
+
+class WebhookASGIApp:
+    """
+    ASGI application receiving Scaile webhooks on `POST <path>`.
+
+    Coroutine handlers are registered per event type with `on()`. Events without an
+    async handler fall back to the synchronous `process_webhook`, run in the default
+    executor. Failed handlers are retried with jittered exponential backoff.
+    """
+
+    def __init__(self, path: str = "/webhook", max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, max_pending: int = DEFAULT_MAX_PENDING,
+                 max_retries: int = MAX_RETRIES, retry_delay: float = RETRY_DELAY,
+                 idempotency_store: IdempotencyStore = None):
+        """
+        Initializes the application.
+
+        :param path: URL path receiving deliveries.
+        :param max_body_size: Largest accepted payload in bytes; bigger bodies get 413.
+        :param max_concurrency: Maximum number of handlers running at once.
+        :param max_pending: Maximum number of accepted, unprocessed events before answering 503.
+        :param max_retries: Retries per event before it is dropped.
+        :param retry_delay: Backoff before the first retry, in seconds.
+        :param idempotency_store: Store used to skip redelivered events (in-memory by default).
+        """
+        self.path = path
+        self.max_body_size = max_body_size
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_policy = RetryPolicy(max_retries=max_retries, backoff_base=retry_delay,
+                                        backoff_max=retry_delay * 2 ** max_retries)
+        self.idempotency_store = idempotency_store if idempotency_store is not None else IdempotencyStore()
+        self._handlers = {}
+        self._tasks = set()
+        self._semaphore = None
+
+    def on(self, event_type: str):
+        """
+        Decorator registering a coroutine function as a handler for an event type.
+
+        :param event_type: Value of the payload's "event" field.
+        """
+        def decorator(handler):
+            if not asyncio.iscoroutinefunction(handler):
+                raise TypeError("Async webhook handlers must be coroutine functions")
+            self._handlers.setdefault(event_type, []).append(handler)
+            return handler
+        return decorator
+
+    @property
+    def pending(self) -> int:
+        """Number of accepted events that have not finished processing."""
+        return len(self._tasks)
+
+    async def drain(self):
+        """
+        Waits until every accepted event has been processed.
+        """
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        if scope["path"] != self.path:
+            await _respond(send, 404, {"error": "Not found"})
+            return
+        if scope["method"] != "POST":
+            await _respond(send, 405, {"error": "Method not allowed"})
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        payload = await self._read_body(receive)
+        if payload is None:
+            await _respond(send, 413, {"error": "Payload too large"})
+            return
+
+        signature = headers.get("x-signature")
+        if not signature or not verify_signature(payload, signature):
+            logger.error("Webhook signature verification failed!")
+            await _respond(send, 403, {"error": "Unauthorized"})
+            return
+
+        try:
+            data = json_codec.loads(payload)
+        except ValueError:
+            await _respond(send, 400, {"error": "Invalid JSON payload"})
+            return
+
+        if not isinstance(data, dict):
+            await _respond(send, 400, {"error": "Invalid JSON payload"})
+            return
+        attach_delivery_id(data, headers.get(DELIVERY_ID_HEADER.lower()))
+
+        if len(self._tasks) >= self.max_pending:
+            logger.error("Webhook backlog is full, asking the sender to redeliver")
+            await _respond(send, 503, {"error": "Queue full"}, {"retry-after": str(RETRY_DELAY)})
+            return
+
+        logger.info("Received webhook event: %s", data.get("event"))
+        if not self.idempotency_store.claim(event_id_of(data)):
+            await _respond(send, 200, {"status": "duplicate"})
+            return
+
+        task = asyncio.ensure_future(self._process(data))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        await _respond(send, 202, {"status": "accepted"})
+
+    async def _read_body(self, receive):
+        """Reads the request body, returning None when it exceeds `max_body_size`."""
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _process(self, data: dict):
+        """Runs the handlers for one event with bounded concurrency and retries."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Handlers still to run; those that succeed are dropped so a retry skips them
+        handlers = list(self._handlers.get(data.get("event"), ()))
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    await self._dispatch(data, handlers)
+                return
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"Webhook processing failed after {attempt + 1} attempts, dropping event: {str(e)}")
+                    self.idempotency_store.release(event_id_of(data))
+                    return
+                delay = self.retry_policy.delay(attempt)
+                logger.error(f"Webhook processing failed: {str(e)}; retrying in {delay:.1f} seconds")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _dispatch(self, data: dict, handlers: list):
+        """
+        Calls the async handlers concurrently, or `process_webhook` in an executor when
+        the event has none.
+
+        Handlers that succeed are removed from `handlers`; once all of them have
+        finished, the first failure is raised.
+        """
+        if handlers:
+            results = await asyncio.gather(*(handler(data) for handler in handlers), return_exceptions=True)
+            failed = [(handler, result) for handler, result in zip(handlers, results)
+                      if isinstance(result, BaseException)]
+            handlers[:] = [handler for handler, _ in failed]
+            if failed:
+                raise failed[0][1]
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(None, process_webhook, data)
+            if isinstance(result, Future):
+                # Batched delivery: the event is only done once its batch was handled
+                await asyncio.wrap_future(result)
+
+    async def _lifespan(self, receive, send):
+        """Handles ASGI lifespan events, draining pending events on shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.drain()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _respond(send, status: int, body: dict, headers: dict = None):
+    """Sends a JSON response."""
+    content = json_codec.dumps(body)
+    raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(content)).encode())]
+    raw_headers += [(k.encode(), v.encode()) for k, v in (headers or {}).items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": content})
+
+
+# Default application for `uvicorn scaile.webhook_asgi:app`
+app = WebhookASGIApp()
@@ -1,11 +1,13 @@
-import json
-import hashlib
-import hmac
-import time
-import requests
+import os
+import threading
 from flask import Flask, request, jsonify
+from .codec import get_codec
 from .configs import Config
+from .idempotency import DELIVERY_ID_HEADER, IdempotencyStore, attach_delivery_id, event_id_of
 from .logging import logger
+from .signature import SignatureVerifier
+from .webhook_queue import DEFAULT_QUEUE_SIZE, DEFAULT_WORKERS, WebhookQueue
+from .webhook_registry import DEFAULT_BATCH_SIZE, WebhookRegistry
 
 app = Flask(__name__)
 
@@ -13,58 +15,114 @@ app = Flask(__name__)
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
 
+# Background processing queue
+WEBHOOK_WORKERS = int(os.getenv("SCAILE_WEBHOOK_WORKERS", DEFAULT_WORKERS))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("SCAILE_WEBHOOK_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+WEBHOOK_QUEUE_PATH = os.getenv("SCAILE_WEBHOOK_QUEUE_PATH")  # SQLite file for a disk-backed queue
+
+# Event deduplication; set SCAILE_WEBHOOK_IDEMPOTENCY_PATH to persist seen event IDs in SQLite
+idempotency_store = IdempotencyStore(path=os.getenv("SCAILE_WEBHOOK_IDEMPOTENCY_PATH"))
+
+# Decodes payloads straight from the request bytes; set SCAILE_JSON_CODEC to pick a backend
+json_codec = get_codec()
+
+# Keyed HMAC state for every active secret, computed once
+signature_verifier = SignatureVerifier(Config.WEBHOOK_SECRETS, max_payload_size=Config.WEBHOOK_MAX_PAYLOAD_SIZE)
+
+_webhook_queue = None
+_webhook_queue_lock = threading.Lock()
+
+# Event handlers; register more with @webhook_handler("event_type") or a wildcard such as "*"
+registry = WebhookRegistry()
+webhook_handler = registry.on
+batch_webhook_handler = registry.on_batch
+
+# Optional micro-batching of events with batch handlers, e.g. SCAILE_WEBHOOK_BATCH_WINDOW=2
+WEBHOOK_BATCH_WINDOW = os.getenv("SCAILE_WEBHOOK_BATCH_WINDOW")  # seconds
+WEBHOOK_BATCH_SIZE = int(os.getenv("SCAILE_WEBHOOK_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+if WEBHOOK_BATCH_WINDOW:
+    # Batched events stay in the webhook queue until their batch is handled, and the
+    # queue retries failed batches, so the batcher itself does not retry
+    registry.enable_batching(window=float(WEBHOOK_BATCH_WINDOW), max_batch=WEBHOOK_BATCH_SIZE,
+                             max_retries=0, max_pending=WEBHOOK_QUEUE_SIZE)
+
 def verify_signature(payload, signature):
     """Verify the HMAC signature of the webhook request."""
-    expected_signature = hmac.new(
-        key=Config.WEBHOOK_SECRET.encode(),
-        msg=payload,
-        digestmod=hashlib.sha256
-    ).hexdigest()
-
-    return hmac.compare_digest(expected_signature, signature)
+    return signature_verifier.verify(payload, signature)
 
 @app.route("/webhook", methods=["POST"])
 def handle_webhook():
-    """Handle incoming webhook requests with retries and security."""
+    """Verify an incoming webhook, enqueue it for background processing and acknowledge it."""
+    if (request.content_length or 0) > signature_verifier.max_payload_size:
+        return jsonify({"error": "Payload too large"}), 413
+
     payload = request.data
     received_signature = request.headers.get("X-Signature")
 
     # Security: Verify the signature
-    if not verify_signature(payload, received_signature):
+    if not received_signature or not verify_signature(payload, received_signature):
         logger.error("Webhook signature verification failed!")
         return jsonify({"error": "Unauthorized"}), 403
 
-    data = json.loads(payload)
+    try:
+        data = json_codec.loads(payload)
+    except ValueError:
+        return jsonify({"error": "Invalid JSON payload"}), 400
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid JSON payload"}), 400
+    attach_delivery_id(data, request.headers.get(DELIVERY_ID_HEADER))
     event_type = data.get("event")
 
-    logger.info(f"Received webhook event: {event_type}")
+    logger.info("Received webhook event: %s", event_type)
+
+    event_id = event_id_of(data)
+    if not idempotency_store.claim(event_id):
+        logger.info("Duplicate webhook event %s, skipping", event_id)
+        return jsonify({"status": "duplicate"}), 200
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            # Process the webhook data (custom logic goes here)
-            process_webhook(data)
+    if not get_webhook_queue().submit(data):
+        idempotency_store.release(event_id)
+        logger.error("Webhook queue is full, asking the sender to redeliver")
+        return jsonify({"error": "Queue full"}), 503, {"Retry-After": str(RETRY_DELAY)}
 
-            logger.info("Webhook processed successfully!")
-            return jsonify({"status": "success"}), 200
+    return jsonify({"status": "accepted"}), 202
 
-        except Exception as e:
-            logger.error(f"Webhook processing failed: {str(e)}")
-            if attempt < MAX_RETRIES - 1:
-                logger.info(f"Retrying in {RETRY_DELAY} seconds...")
-                time.sleep(RETRY_DELAY)
-            else:
-                return jsonify({"error": "Failed after retries"}), 500
+def get_webhook_queue():
+    """Return the module's webhook queue, starting its workers on first use."""
+    global _webhook_queue
+    if _webhook_queue is None:
+        with _webhook_queue_lock:
+            if _webhook_queue is None:
+                # Resolve process_webhook per event so it can be replaced at runtime
+                _webhook_queue = WebhookQueue(
+                    lambda data: process_webhook(data),
+                    workers=WEBHOOK_WORKERS,
+                    maxsize=WEBHOOK_QUEUE_SIZE,
+                    max_retries=MAX_RETRIES,
+                    retry_delay=RETRY_DELAY,
+                    path=WEBHOOK_QUEUE_PATH,
+                    on_failure=lambda data: idempotency_store.release(event_id_of(data)),
+                ).start()
+    return _webhook_queue
 
 def process_webhook(data):
-    """Custom logic to handle different webhook events."""
-    if data.get("event") == "new_data":
-        logger.info("Processing new data event...")
-        # Add your logic here (e.g., update database)
-    elif data.get("event") == "delete_data":
-        logger.info("Processing delete event...")
-        # Delete from database or take action
-    else:
-        logger.warning(f"Unknown event type: {data.get('event')}")
+    """
+    Dispatch a webhook event to the handlers registered for its type.
+
+    Returns a future that completes once batched handlers have processed the event,
+    so the queue acknowledges it only then.
+    """
+    return registry.submit(data)
+
+@webhook_handler("new_data")
+def handle_new_data(data):
+    logger.info("Processing new data event...")
+    # Add your logic here (e.g., update database)
+
+@webhook_handler("delete_data")
+def handle_delete_data(data):
+    logger.info("Processing delete event...")
+    # Delete from database or take action
 
 if __name__ == "__main__":
     app.run(port=5000, debug=Config.DEBUG)
@@ -0,0 +1,278 @@
+import heapq
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from .logging import logger
+from .retry import RetryPolicy
+
+# Defaults of the webhook processing queue
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_WORKERS = 4
+LEASE_SECONDS = 300  # how long a claimed disk event stays invisible to other workers
+
+
+class MemoryEventStore:
+    """
+    Bounded in-process store of pending webhook events, ordered by the time they become
+    due. Retried events are scheduled in the future instead of blocking a worker.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE):
+        """
+        :param maxsize: Maximum number of pending events.
+        """
+        self.maxsize = maxsize
+        self._heap = []
+        self._leased = 0
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def put(self, event: dict) -> bool:
+        """Adds a new event. Returns False when the store is full."""
+        with self._cond:
+            if len(self._heap) + self._leased >= self.maxsize:
+                return False
+            token = next(self._counter)
+            heapq.heappush(self._heap, (time.monotonic(), token, event, 0))
+            self._cond.notify()
+            return True
+
+    def get(self, timeout: float):
+        """
+        Waits up to `timeout` seconds for a due event.
+
+        :return: Tuple of (token, event, attempts), or None if nothing became due.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    _, token, event, attempts = heapq.heappop(self._heap)
+                    self._leased += 1
+                    return token, event, attempts
+                if now >= deadline:
+                    return None
+                wait = deadline - now
+                if self._heap:
+                    wait = min(wait, self._heap[0][0] - now)
+                self._cond.wait(wait)
+
+    def ack(self, token):
+        """Marks a leased event as done."""
+        with self._cond:
+            self._leased -= 1
+
+    def retry(self, token, event: dict, attempts: int, delay: float):
+        """Schedules a leased event again after `delay` seconds."""
+        with self._cond:
+            self._leased -= 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, token, event, attempts))
+            self._cond.notify()
+
+    def __len__(self):
+        """Number of events not yet acknowledged, including those being processed."""
+        with self._cond:
+            return len(self._heap) + self._leased
+
+
+class SQLiteEventStore:
+    """
+    Disk-backed store of pending webhook events, so accepted events survive a restart.
+    """
+
+    def __init__(self, path: str, maxsize: int = DEFAULT_QUEUE_SIZE):
+        """
+        :param path: SQLite database file.
+        :param maxsize: Maximum number of pending events.
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS webhook_events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS webhook_events_due ON webhook_events (available_at)")
+        # Events claimed before a crash become visible again immediately
+        self._db.execute("UPDATE webhook_events SET available_at = ? WHERE available_at > ?",
+                         (time.time(), time.time()))
+        self._count = self._db.execute("SELECT COUNT(*) FROM webhook_events").fetchone()[0]
+
+    def put(self, event: dict) -> bool:
+        """Adds a new event. Returns False when the store is full."""
+        with self._lock:
+            if self._count >= self.maxsize:
+                return False
+            self._db.execute("INSERT INTO webhook_events (payload, available_at) VALUES (?, ?)",
+                             (json.dumps(event), time.time()))
+            self._count += 1
+            self._wakeup.notify()
+            return True
+
+    def get(self, timeout: float):
+        """
+        Waits up to `timeout` seconds for a due event and leases it to the caller.
+
+        :return: Tuple of (event_id, event, attempts), or None if nothing became due.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                now = time.time()
+                row = self._db.execute(
+                    "SELECT id, payload, attempts FROM webhook_events WHERE available_at <= ? "
+                    "ORDER BY available_at, id LIMIT 1", (now,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE webhook_events SET available_at = ? WHERE id = ?",
+                                     (now + LEASE_SECONDS, row[0]))
+                    return row[0], json.loads(row[1]), row[2]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._wakeup.wait(min(remaining, 0.1))
+
+    def ack(self, event_id):
+        """Deletes a processed event."""
+        with self._lock:
+            self._db.execute("DELETE FROM webhook_events WHERE id = ?", (event_id,))
+            self._count -= 1
+
+    def retry(self, event_id, event: dict, attempts: int, delay: float):
+        """Makes an event due again after `delay` seconds."""
+        with self._lock:
+            self._db.execute("UPDATE webhook_events SET attempts = ?, available_at = ? WHERE id = ?",
+                             (attempts, time.time() + delay, event_id))
+            self._wakeup.notify()
+
+    def __len__(self):
+        """Number of events not yet acknowledged, including those being processed."""
+        return self._count
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+class WebhookQueue:
+    """
+    Decouples webhook delivery from processing.
+
+    The HTTP handler only verifies and enqueues an event; a pool of worker threads
+    drains the queue, retrying failed events with jittered exponential backoff. When
+    the queue is full, `submit` returns False so the handler can ask the sender to
+    redeliver later.
+
+    A handler may return a `concurrent.futures.Future` (e.g. from
+    `WebhookRegistry.submit` with batching enabled): the event then stays queued, and
+    counts against `maxsize`, until the future completes, and is acknowledged or
+    retried according to its outcome.
+    """
+
+    def __init__(self, handler, workers: int = DEFAULT_WORKERS, maxsize: int = DEFAULT_QUEUE_SIZE,
+                 max_retries: int = 3, retry_delay: float = 5, path: str = None, on_failure=None):
+        """
+        Initializes the queue. Call `start()` to launch the workers.
+
+        :param handler: Callable processing one decoded event; may return a Future to
+            defer the event's acknowledgement.
+        :param workers: Number of worker threads.
+        :param maxsize: Maximum number of pending events.
+        :param max_retries: Retries per event before it is dropped.
+        :param retry_delay: Backoff before the first retry, in seconds; doubled for each further attempt.
+        :param path: SQLite file for a disk-backed queue; in-memory when omitted.
+        :param on_failure: Optional callable receiving an event that is dropped after its last retry.
+        """
+        self.handler = handler
+        self.on_failure = on_failure
+        self.workers = workers
+        self.store = SQLiteEventStore(path, maxsize) if path else MemoryEventStore(maxsize)
+        self.max_retries = max_retries
+        self.retry_policy = RetryPolicy(max_retries=max_retries, backoff_base=retry_delay,
+                                        backoff_max=retry_delay * 2 ** max_retries)
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def start(self):
+        """
+        Starts the worker threads.
+        """
+        if self._threads:
+            return self
+        self._stopping.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"scaile-webhook-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = None):
+        """
+        Stops the workers after their current event. Pending events stay queued.
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, event: dict) -> bool:
+        """
+        Enqueues an event for background processing.
+
+        :param event: Decoded webhook payload.
+        :return: True if accepted, False if the queue is full.
+        """
+        return self.store.put(event)
+
+    def join(self, timeout: float = None) -> bool:
+        """
+        Waits until every queued event has been processed or dropped.
+
+        :return: True if the queue drained within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self.store):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _run(self):
+        """Worker loop: process due events until stopped."""
+        while not self._stopping.is_set():
+            item = self.store.get(timeout=0.1)
+            if item is not None:
+                self._process(*item)
+
+    def _process(self, token, event: dict, attempts: int):
+        """Runs the handler for one event, scheduling a retry on failure."""
+        try:
+            result = self.handler(event)
+        except Exception as e:
+            self._settle(token, event, attempts, e)
+            return
+        if isinstance(result, Future):
+            result.add_done_callback(lambda future: self._settle(token, event, attempts, future.exception()))
+        else:
+            self._settle(token, event, attempts, None)
+
+    def _settle(self, token, event: dict, attempts: int, error):
+        """Acknowledges a handled event, or retries or drops a failed one."""
+        if error is not None:
+            if attempts < self.max_retries:
+                delay = self.retry_policy.delay(attempts)
+                logger.error(f"Webhook processing failed: {str(error)}; retrying in {delay:.1f} seconds")
+                self.store.retry(token, event, attempts + 1, delay)
+                return
+            logger.error(f"Webhook processing failed after {attempts + 1} attempts, dropping event: {str(error)}")
+            if self.on_failure is not None:
+                self.on_failure(event)
+        self.store.ack(token)
@@ -0,0 +1,525 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from .idempotency import event_id_of
+from .logging import logger
+from .retry import RetryPolicy
+
+# Threads shared by handlers that run concurrently for the same event
+DEFAULT_HANDLER_WORKERS = 8
+WILDCARD_CHARS = frozenset("*?[")
+# Events whose successful handlers are remembered while a failed handler awaits its retry
+DEFAULT_MAX_PARTIAL_EVENTS = 10000
+
+# Micro-batching defaults
+DEFAULT_BATCH_WINDOW = 1.0  # seconds
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_PENDING = 10000  # events held by the batcher before `add` blocks
+
+
+class HandlerStats:
+    """
+    Timing metrics of one registered handler.
+    """
+
+    __slots__ = ("calls", "errors", "retries", "total_time", "max_time")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        """Mean handler duration in seconds."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "total_time": self.total_time,
+            "avg_time": self.avg_time,
+            "max_time": self.max_time,
+        }
+
+
+class WebhookRegistry:
+    """
+    Maps webhook event types to handler functions.
+
+    Handlers are registered with the `on()` decorator for an exact event type or a
+    wildcard pattern (`"*"`, `"annotation.*"`). The handler list for each event type is
+    resolved once and cached, so dispatch is a single dict lookup. When several handlers
+    match, they run concurrently on a shared thread pool. Each handler's call count,
+    errors and durations are recorded and exposed by `stats()`.
+
+    When some handlers of an event fail, the handlers that succeeded are remembered
+    and skipped when the event is dispatched again, so a retry only re-runs the
+    failed ones. This memory is per process: after a restart a redelivered event runs
+    every handler, so handlers should still tolerate being called twice.
+
+    Batch-aware handlers registered with `on_batch()` receive a list of events. Once
+    `enable_batching()` is called, events with batch handlers are coalesced per event
+    type and project by a `WebhookBatcher`; otherwise they get single-event lists. Use
+    `submit()` to learn when a batched event has actually been handled.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_HANDLER_WORKERS):
+        """
+        :param max_workers: Threads used to run several handlers of one event concurrently.
+        """
+        self.max_workers = max_workers
+        self._exact = {}
+        self._patterns = []
+        self._resolved = {}
+        self._batch_exact = {}
+        self._batch_patterns = []
+        self._batch_resolved = {}
+        self.batcher = None
+        self._stats = {}
+        self._names = {}
+        self._partial = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def on(self, event_type: str):
+        """
+        Decorator registering a handler for an event type or wildcard pattern.
+
+        :param event_type: Exact value of the payload's "event" field, or an fnmatch pattern.
+        """
+        def decorator(handler):
+            self.register(event_type, handler)
+            return handler
+        return decorator
+
+    def on_batch(self, event_type: str):
+        """
+        Decorator registering a batch-aware handler, called with a list of events.
+
+        :param event_type: Exact value of the payload's "event" field, or an fnmatch pattern.
+        """
+        def decorator(handler):
+            self.register(event_type, handler, batch=True)
+            return handler
+        return decorator
+
+    def register(self, event_type: str, handler, batch: bool = False):
+        """
+        Registers a handler for an event type or wildcard pattern.
+
+        :param batch: Register a batch-aware handler that receives a list of events.
+        """
+        exact, patterns = (self._batch_exact, self._batch_patterns) if batch else (self._exact, self._patterns)
+        with self._lock:
+            if WILDCARD_CHARS.intersection(event_type):
+                patterns.append((event_type, handler))
+            else:
+                exact.setdefault(event_type, []).append(handler)
+            self._stats_for(handler)
+            self._resolved = {}
+            self._batch_resolved = {}
+
+    def enable_batching(self, window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_BATCH_SIZE, **kwargs):
+        """
+        Starts coalescing events that have batch handlers.
+
+        :param window: Maximum time in seconds an event waits before its group is flushed.
+        :param max_batch: Number of events that triggers an immediate flush of a group.
+        :param kwargs: Further `WebhookBatcher` options (max_pending, max_retries, retry_delay).
+        :return: The `WebhookBatcher`.
+        """
+        if self.batcher is None:
+            self.batcher = WebhookBatcher(self, window=window, max_batch=max_batch, **kwargs)
+        return self.batcher
+
+    def disable_batching(self, timeout: float = None):
+        """
+        Flushes pending batches and goes back to per-event dispatch.
+        """
+        batcher, self.batcher = self.batcher, None
+        if batcher is not None:
+            batcher.close(timeout)
+
+    def unregister(self, event_type: str, handler):
+        """
+        Removes a previously registered handler.
+        """
+        with self._lock:
+            for exact, patterns in ((self._exact, self._patterns), (self._batch_exact, self._batch_patterns)):
+                if (event_type, handler) in patterns:
+                    patterns.remove((event_type, handler))
+                elif handler in exact.get(event_type, []):
+                    exact[event_type].remove(handler)
+            self._resolved = {}
+            self._batch_resolved = {}
+
+    def handlers_for(self, event_type: str) -> tuple:
+        """
+        Returns the handlers matching an event type: exact handlers first, then wildcard ones.
+        """
+        handlers = self._resolved.get(event_type)
+        if handlers is None:
+            with self._lock:
+                handlers = self._resolved[event_type] = _resolve(self._exact, self._patterns, event_type)
+        return handlers
+
+    def batch_handlers_for(self, event_type: str) -> tuple:
+        """
+        Returns the batch-aware handlers matching an event type.
+        """
+        handlers = self._batch_resolved.get(event_type)
+        if handlers is None:
+            with self._lock:
+                handlers = self._batch_resolved[event_type] = _resolve(
+                    self._batch_exact, self._batch_patterns, event_type
+                )
+        return handlers
+
+    def dispatch(self, data: dict) -> int:
+        """
+        Runs every handler matching the event's type.
+
+        If any handler raises, the other handlers still run and the first exception is
+        re-raised afterwards, so the caller's retry logic applies; the retry skips the
+        handlers that already succeeded.
+
+        Events with batch handlers are handed to the batcher when batching is enabled,
+        and to the batch handlers as a single-event list otherwise. `dispatch` does not
+        wait for batched delivery; see `submit`.
+
+        :param data: Decoded webhook payload.
+        :return: Number of handlers that ran (batched events count once they are flushed).
+        """
+        return self._dispatch(data)[0]
+
+    def submit(self, data: dict) -> Future:
+        """
+        Dispatches an event and tracks its batched delivery.
+
+        Per-event handlers run before this returns and their first error is raised, as
+        in `dispatch`. The returned future completes once the event's batch has been
+        handled, or fails with the batch's error after its last retry, so a durable
+        queue can acknowledge the event only then. Without a batcher it is already done.
+
+        :param data: Decoded webhook payload.
+        :return: A `concurrent.futures.Future` resolving to None.
+        """
+        count, batched, ran = self._dispatch(data)
+        if batched is None:
+            batched = Future()
+            batched.set_result(None)
+        elif ran:
+            key = _event_key(data)
+
+            def remember_handlers(future):
+                # A redelivery after a failed batch must not re-run the per-event handlers
+                if future.exception() is not None:
+                    with self._lock:
+                        self._partial.setdefault(key, set()).update(ran)
+
+            batched.add_done_callback(remember_handlers)
+        return batched
+
+    def _dispatch(self, data: dict):
+        """
+        Runs the per-event handlers and hands the event to the batcher if needed.
+
+        :return: Tuple of (handlers run, batcher future or None, per-event handlers run).
+        """
+        event_type = data.get("event")
+        handlers = self.handlers_for(event_type)
+        batch_handlers = self.batch_handlers_for(event_type)
+        if not handlers and not batch_handlers:
+            logger.warning(f"Unknown event type: {event_type}")
+            return 0, None, ()
+
+        calls = [(handler, data) for handler in handlers]
+        batcher = self.batcher if batch_handlers else None
+        if batch_handlers and batcher is None:
+            calls += [(handler, [data]) for handler in batch_handlers]
+        count = self._run_all(calls, _event_key(data))
+        # Batch only after the per-event handlers succeeded, so a failure is retried as a whole
+        batched = batcher.add(data) if batcher is not None else None
+        return count, batched, tuple(handler for handler in handlers)
+
+    def dispatch_batch(self, event_type: str, events: list) -> int:
+        """
+        Runs every batch handler matching an event type with a list of events.
+
+        :return: Number of handlers that ran.
+        """
+        calls = [(handler, events) for handler in self.batch_handlers_for(event_type)]
+        return self._run_all(calls, ("batch", event_type, tuple(_event_key(event) for event in events)))
+
+    def _run_all(self, calls: list, key) -> int:
+        """
+        Runs (handler, argument) pairs, concurrently when there are several, skipping
+        handlers that already succeeded on an earlier attempt of the same `key`.
+
+        :return: Number of handlers that ran.
+        """
+        with self._lock:
+            succeeded = self._partial.pop(key, None)
+        retry = succeeded is not None
+        if retry:
+            calls = [(handler, arg) for handler, arg in calls if handler not in succeeded]
+        else:
+            succeeded = set()
+
+        if len(calls) == 1:
+            errors = [_call(self._run, calls[0][0], calls[0][1], retry)]
+        else:
+            futures = [self._get_executor().submit(self._run, handler, arg, retry) for handler, arg in calls]
+            errors = [future.exception() for future in futures]
+
+        failed = [error for error in errors if error is not None]
+        if failed:
+            succeeded.update(handler for (handler, _), error in zip(calls, errors) if error is None)
+            with self._lock:
+                self._partial[key] = succeeded
+                while len(self._partial) > DEFAULT_MAX_PARTIAL_EVENTS:
+                    self._partial.popitem(last=False)
+            raise failed[0]
+        return len(calls)
+
+    def stats(self) -> dict:
+        """
+        Returns the metrics of every registered handler, keyed by qualified name.
+
+        Distinct handlers sharing a name (e.g. lambdas) get a `#2`, `#3`... suffix in
+        registration order. `retries` counts calls re-running a handler that failed on
+        an earlier attempt of the same event.
+        """
+        with self._lock:
+            return {self._names[handler]: stats.as_dict() for handler, stats in self._stats.items()}
+
+    def _stats_for(self, handler) -> HandlerStats:
+        """Returns the stats of a handler, naming it uniquely on first use; needs the lock."""
+        stats = self._stats.get(handler)
+        if stats is None:
+            base = name = _handler_name(handler)
+            taken = set(self._names.values())
+            n = 2
+            while name in taken:
+                name = f"{base}#{n}"
+                n += 1
+            self._names[handler] = name
+            stats = self._stats[handler] = HandlerStats()
+        return stats
+
+    def _run(self, handler, arg, retry: bool = False):
+        """Calls one handler, recording its duration and outcome."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            handler(arg)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats_for(handler)
+                stats.calls += 1
+                stats.errors += failed
+                stats.retries += retry
+                stats.total_time += elapsed
+                stats.max_time = max(stats.max_time, elapsed)
+
+    def _get_executor(self):
+        """Creates the shared handler thread pool on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="scaile-handler")
+        return self._executor
+
+
+class WebhookBatcher:
+    """
+    Collects bursty events per (event type, project) and hands them to batch handlers
+    in groups.
+
+    A group is flushed when it reaches `max_batch` events or when its oldest event has
+    waited `window` seconds. Flushes run on a background thread; a failing batch is
+    retried with jittered exponential backoff. Each event's future (returned by `add`)
+    completes when its batch succeeds, or fails with the error after `max_retries`, so
+    the caller decides whether to redeliver, acknowledge or release the event.
+
+    At most `max_pending` events are held at once; `add` blocks beyond that, passing
+    backpressure on to the caller (e.g. the webhook queue workers).
+    """
+
+    def __init__(self, registry, window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_BATCH_SIZE,
+                 max_retries: int = 3, retry_delay: float = 1.0, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        :param registry: Registry whose batch handlers receive the flushed groups.
+        :param window: Maximum time in seconds an event waits before its group is flushed.
+        :param max_batch: Number of events that triggers an immediate flush of a group.
+        :param max_retries: Retries per batch before its events fail.
+        :param retry_delay: Backoff before the first retry, in seconds.
+        :param max_pending: Events held (grouped, ready or being delivered) before `add` blocks.
+        """
+        self.registry = registry
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max(max_pending, max_batch)
+        self.max_retries = max_retries
+        self.retry_policy = RetryPolicy(max_retries=max_retries, backoff_base=retry_delay,
+                                        backoff_max=retry_delay * 2 ** max_retries)
+        self._groups = {}
+        self._cond = threading.Condition()
+        self._ready = deque()
+        self._in_flight = 0
+        self._pending = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="scaile-webhook-batcher", daemon=True)
+        self._thread.start()
+
+    def add(self, data: dict) -> Future:
+        """
+        Adds an event to its group, flushing the group if it is full. Blocks while
+        `max_pending` events are already held.
+
+        :return: Future completing when the event's batch has been handled.
+        """
+        key = (data.get("event"), data.get("project_id"))
+        future = Future()
+        with self._cond:
+            while self._pending >= self.max_pending and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                raise RuntimeError("WebhookBatcher is closed")
+            self._pending += 1
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = (time.monotonic(), [], [])
+            group[1].append(data)
+            group[2].append(future)
+            if len(group[1]) >= self.max_batch:
+                self._ready.append((key[0], *self._groups.pop(key)[1:]))
+            self._cond.notify_all()
+        return future
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Flushes every group now and waits until all batches have been handled.
+
+        :return: True if everything was handled within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            for key in list(self._groups):
+                self._ready.append((key[0], *self._groups.pop(key)[1:]))
+            self._cond.notify_all()
+            while self._ready or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = None):
+        """
+        Flushes pending events and stops the background thread.
+        """
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Background loop: flush full or expired groups."""
+        while True:
+            with self._cond:
+                while not self._ready and not self._closed:
+                    now = time.monotonic()
+                    expired = [key for key, group in self._groups.items() if now - group[0] >= self.window]
+                    for key in expired:
+                        self._ready.append((key[0], *self._groups.pop(key)[1:]))
+                    if self._ready:
+                        break
+                    oldest = min((group[0] for group in self._groups.values()), default=None)
+                    self._cond.wait(None if oldest is None else max(0.0, oldest + self.window - now))
+                if not self._ready and self._closed:
+                    return
+                event_type, events, futures = self._ready.popleft()
+                self._in_flight += 1
+            try:
+                error = self._deliver(event_type, events)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._pending -= len(events)
+                    self._cond.notify_all()
+            for future in futures:
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    def _deliver(self, event_type: str, events: list):
+        """
+        Runs the batch handlers for one group, retrying failures.
+
+        :return: None on success, or the last error once the retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            try:
+                self.registry.dispatch_batch(event_type, events)
+                return None
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"Batch of {len(events)} {event_type} events failed after "
+                                 f"{attempt + 1} attempts, failing its events: {str(e)}")
+                    return e
+                delay = self.retry_policy.delay(attempt)
+                logger.error(f"Batch of {len(events)} {event_type} events failed: {str(e)}; "
+                             f"retrying in {delay:.1f} seconds")
+                time.sleep(delay)
+                attempt += 1
+
+
+def _resolve(exact: dict, patterns: list, event_type: str) -> tuple:
+    """Collects exact handlers, then wildcard handlers whose pattern matches the event type."""
+    return tuple(exact.get(event_type, ())) + tuple(
+        handler for pattern, handler in patterns
+        if event_type is not None and fnmatchcase(event_type, pattern)
+    )
+
+
+def _event_key(data: dict) -> str:
+    """
+    Key under which the handlers that succeeded for an event are remembered until its
+    retry: the event ID, or a digest of the payload for events without one.
+    """
+    event_id = event_id_of(data)
+    if event_id is not None:
+        return event_id
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return "sha256:" + hashlib.sha256(canonical).hexdigest()
+
+
+def _call(run, handler, arg, retry: bool):
+    """Runs a handler inline, returning its exception instead of raising it."""
+    try:
+        run(handler, arg, retry)
+    except Exception as e:
+        return e
+    return None
+
+
+def _handler_name(handler) -> str:
+    """Returns a stable, readable name for a handler."""
+    return f"{getattr(handler, '__module__', '')}.{getattr(handler, '__qualname__', repr(handler))}"
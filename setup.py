@@ -17,6 +17,13 @@ setup(
         'python-dotenv',
         'pyyaml'
     ],
+    extras_require={
+        'async': ['aiohttp'],  # Required for AsyncClient
+        'asgi': ['uvicorn'],  # Serves scaile.webhook_asgi:app
+        'fast': ['orjson'],  # Faster JSON encoding and decoding
+        'zstd': ['zstandard'],  # zstd request and response compression
+        'numpy': ['numpy'],  # Vectorized local reward calculation
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'Programming Language :: Python :: 3.8',
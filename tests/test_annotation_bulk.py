@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from scaile.annotation import Annotation
+
+class TestAnnotationBulkCreate(unittest.TestCase):
+    """
+    Unit tests for Annotation.bulk_create.
+    """
+
+    def setUp(self):
+        """
+        Setup a mocked client instance for testing.
+        """
+        self.mock_client = MagicMock()
+        self.annotation = Annotation(self.mock_client)
+
+    def test_results_in_input_order(self):
+        """
+        Test that every item gets a result, in input order.
+        """
+        self.mock_client._make_request.side_effect = lambda method, endpoint, json: {"id": json["n"]}
+        items = ({"n": n} for n in range(25))
+
+        results = self.annotation.bulk_create("p1", items, batch_size=4, max_workers=3)
+
+        self.assertEqual([r.index for r in results], list(range(25)))
+        self.assertEqual([r.response["id"] for r in results], list(range(25)))
+        self.assertTrue(all(r.ok for r in results))
+        self.mock_client._make_request.assert_any_call("POST", "/projects/p1/annotations", json={"n": 0})
+
+    def test_partial_failures(self):
+        """
+        Test that failing items are reported without dropping the rest of the batch.
+        """
+        def create(method, endpoint, json):
+            if json["n"] % 5 == 0:
+                raise RuntimeError("rejected")
+            return {"id": json["n"]}
+
+        self.mock_client._make_request.side_effect = create
+        results = self.annotation.bulk_create("p1", [{"n": n} for n in range(12)], batch_size=5)
+
+        failed = [r.index for r in results if not r.ok]
+        self.assertEqual(failed, [0, 5, 10])
+        self.assertIsInstance(results[5].error, RuntimeError)
+        self.assertEqual(sum(r.ok for r in results), 9)
+
+    def test_bounded_in_flight(self):
+        """
+        Test that exactly max_workers requests run at once, and never more.
+        """
+        lock = threading.Lock()
+        saturated = threading.Event()
+        state = {"active": 0, "peak": 0}
+
+        def create(method, endpoint, json):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                if state["active"] == 3:
+                    saturated.set()
+            # Hold every request until three overlap, so an unbounded pool would show more
+            saturated.wait(timeout=0.2)
+            time.sleep(0.005)
+            with lock:
+                state["active"] -= 1
+            return {}
+
+        self.mock_client._make_request.side_effect = create
+        self.annotation.bulk_create("p1", [{}] * 30, batch_size=2, max_workers=3)
+        self.assertTrue(saturated.is_set())
+        self.assertEqual(state["peak"], 3)
+
+    def test_batch_size_from_config(self):
+        """
+        Test that batch_size defaults to annotation.batch_size.
+        """
+        from scaile.configs import settings
+        chunks = []
+        self.annotation._create_chunk = lambda project_id, chunk: chunks.append(len(chunk)) or []
+        self.annotation.bulk_create("p1", [{}] * 250)
+        self.assertEqual(max(chunks), settings.annotation["batch_size"])
+
+if __name__ == "__main__":
+    unittest.main()
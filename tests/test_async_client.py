@@ -0,0 +1,95 @@
+import unittest
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    web = None
+
+from scaile.async_client import AsyncClient, AsyncAnnotation, AsyncRewards
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit tests for the AsyncClient class against a local aiohttp server.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a local server that echoes requests back as JSON.
+        """
+        async def projects(request):
+            return web.json_response([{"id": "p1"}])
+
+        async def annotations(request):
+            if request.method == "POST":
+                body = await request.json()
+                return web.json_response({"id": "a1", **body}, status=201)
+            return web.json_response({"filters": dict(request.query)})
+
+        async def delete_annotation(request):
+            return web.Response(status=204)
+
+        async def rewards(request):
+            return web.json_response({"auth": request.headers["Authorization"]})
+
+        async def distribute(request):
+            return web.Response(status=200)
+
+        app = web.Application()
+        app.router.add_get("/projects", projects)
+        app.router.add_route("*", "/projects/{project_id}/annotations", annotations)
+        app.router.add_delete("/projects/{project_id}/annotations/{annotation_id}", delete_annotation)
+        app.router.add_get("/projects/{project_id}/rewards", rewards)
+        app.router.add_post("/projects/{project_id}/rewards/distribute", distribute)
+
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.client = AsyncClient(api_key="test_api_key", base_url=str(self.server.make_url("")), max_connections=4)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_get_projects(self):
+        """
+        Test that get_projects decodes the JSON response.
+        """
+        self.assertEqual(await self.client.get_projects(), [{"id": "p1"}])
+
+    async def test_annotation_roundtrip(self):
+        """
+        Test create, list and delete through AsyncAnnotation.
+        """
+        annotation = AsyncAnnotation(self.client)
+        created = await annotation.create_annotation("p1", {"text": "hello"})
+        self.assertEqual(created, {"id": "a1", "text": "hello"})
+
+        listed = await annotation.list_annotations("p1", filters={"label": "cat"})
+        self.assertEqual(listed, {"filters": {"label": "cat"}})
+
+        self.assertIsNone(await annotation.delete_annotation("p1", "a1"))
+
+    async def test_rewards_sends_auth_header(self):
+        """
+        Test that requests carry the bearer token.
+        """
+        response = await AsyncRewards(self.client).list_all_rewards("p1")
+        self.assertEqual(response, {"auth": "Bearer test_api_key"})
+
+    async def test_empty_body_returns_none(self):
+        """
+        Test that a 200 response without a body decodes to None.
+        """
+        self.assertIsNone(await self.client._make_request("POST", "/projects/p1/rewards/distribute", json={}))
+
+    async def test_connection_limit(self):
+        """
+        Test that the connector is bounded by max_connections.
+        """
+        await self.client.get_projects()
+        self.assertEqual(self.client.session.connector.limit, 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from scaile.cache import ContentCache
+
+
+def _fill_shared_cache(directory, worker):
+    """Writes entries into a shared cache from a separate process."""
+    cache = ContentCache(directory)
+    for n in range(5):
+        with cache.writing(f"cid-{worker}-{n}") as tmp_path:
+            with open(tmp_path, "wb") as f:
+                f.write(os.urandom(100))
+
+
+class TestContentCache(unittest.TestCase):
+    """
+    Unit tests for the on-disk content-addressed cache.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ContentCache(self.tmpdir.name, max_bytes=250)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def put(self, key, content):
+        with self.cache.writing(key) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+
+    def test_roundtrip(self):
+        """
+        Test that written content can be read back by key.
+        """
+        self.put("cid-1", b"hello")
+        with open(self.cache.get_path("cid-1"), "rb") as f:
+            self.assertEqual(f.read(), b"hello")
+        self.assertIn("cid-1", self.cache)
+        self.assertIsNone(self.cache.get_path("cid-2"))
+
+    def test_fetch_fills_once(self):
+        """
+        Test that fetch only calls the fill function on a miss.
+        """
+        calls = []
+
+        def fill(path):
+            calls.append(path)
+            with open(path, "wb") as f:
+                f.write(b"data")
+
+        first = self.cache.fetch("cid-1", fill)
+        second = self.cache.fetch("cid-1", fill)
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_write_is_not_cached(self):
+        """
+        Test that an exception while filling leaves no entry behind.
+        """
+        with self.assertRaises(RuntimeError):
+            with self.cache.writing("cid-1"):
+                raise RuntimeError("download failed")
+        self.assertNotIn("cid-1", self.cache)
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entries are evicted past max_bytes.
+        """
+        self.put("a", b"x" * 100)
+        self.put("b", b"x" * 100)
+        self.cache.get_path("a")
+        self.put("c", b"x" * 100)
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertLessEqual(self.cache.size(), 250)
+
+    def test_oversized_blob_is_served(self):
+        """
+        Test that a blob larger than max_bytes is still returned after being written.
+        """
+        self.put("a", b"x" * 100)
+        def fill(tmp_path):
+            with open(tmp_path, "wb") as f:
+                f.write(b"y" * 1000)
+
+        path = self.cache.fetch("big", fill)
+        self.assertEqual(os.path.getsize(path), 1000)
+        self.assertNotIn("a", self.cache)
+
+        self.put("c", b"x" * 100)
+        self.assertNotIn("big", self.cache)
+
+    def test_fetch_refills_evicted_blob(self):
+        """
+        Test that a blob evicted by another process right after writing is fetched again.
+        """
+        calls = []
+
+        def fill(path):
+            calls.append(path)
+            with open(path, "wb") as f:
+                f.write(b"data")
+
+        evict = self.cache.evict
+
+        def racing_evict(keep=None):
+            # Another process drops the first copy before fetch returns it
+            if len(calls) == 1:
+                self.cache.discard(keep)
+            else:
+                evict(keep)
+
+        with patch.object(self.cache, "evict", side_effect=racing_evict):
+            path = self.cache.fetch("cid-1", fill)
+        self.assertEqual(len(calls), 2)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"data")
+
+    def test_corruption_is_detected(self):
+        """
+        Test that a tampered blob is discarded on read.
+        """
+        self.put("cid-1", b"hello")
+        with open(self.cache.get_path("cid-1"), "wb") as f:
+            f.write(b"HELLO")
+        self.assertIsNone(self.cache.get_path("cid-1"))
+        self.assertNotIn("cid-1", self.cache)
+
+    def test_concurrent_processes(self):
+        """
+        Test that several processes can populate one cache directory.
+        """
+        cache = ContentCache(self.tmpdir.name)
+        processes = [
+            multiprocessing.Process(target=_fill_shared_cache, args=(self.tmpdir.name, worker))
+            for worker in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertTrue(all(p.exitcode == 0 for p in processes))
+        self.assertEqual(cache.size(), 1500)
+        self.assertIsNotNone(cache.get_path("cid-2-4"))
+
+if __name__ == "__main__":
+    unittest.main()
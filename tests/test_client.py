@@ -1,5 +1,7 @@
+import json
 import unittest
 from unittest.mock import MagicMock
+from scaile.cache import ResponseCache
 from scaile.client import Client
 
 class TestClient(unittest.TestCase):
@@ -26,7 +28,7 @@ class TestClient(unittest.TestCase):
         """
         Test the GET request method.
         """
-        self.client.session.get = MagicMock(return_value=MagicMock(status_code=200, json=lambda: {"data": "test"}))
+        self.client.session.get = MagicMock(return_value=MagicMock(status_code=200, content=b'{"data": "test"}'))
         response = self.client.get("/test")
         self.client.session.get.assert_called_once_with(f"{self.base_url}/test", headers=self.client.headers, params=None)
         self.assertEqual(response["data"], "test")
@@ -35,20 +37,22 @@ class TestClient(unittest.TestCase):
         """
         Test the POST request method.
         """
-        self.client.session.post = MagicMock(return_value=MagicMock(status_code=201, json=lambda: {"success": True}))
+        self.client.session.post = MagicMock(return_value=MagicMock(status_code=201, content=b'{"success": true}'))
         payload = {"key": "value"}
         response = self.client.post("/test", json=payload)
-        self.client.session.post.assert_called_once_with(f"{self.base_url}/test", headers=self.client.headers, json=payload)
+        self.client.session.post.assert_called_once_with(
+            f"{self.base_url}/test", headers=self.client.headers, data=self.client.codec.dumps(payload))
         self.assertTrue(response["success"])
 
     def test_put(self):
         """
         Test the PUT request method.
         """
-        self.client.session.put = MagicMock(return_value=MagicMock(status_code=200, json=lambda: {"updated": True}))
+        self.client.session.put = MagicMock(return_value=MagicMock(status_code=200, content=b'{"updated": true}'))
         payload = {"key": "new_value"}
         response = self.client.put("/test", json=payload)
-        self.client.session.put.assert_called_once_with(f"{self.base_url}/test", headers=self.client.headers, json=payload)
+        self.client.session.put.assert_called_once_with(
+            f"{self.base_url}/test", headers=self.client.headers, data=self.client.codec.dumps(payload))
         self.assertTrue(response["updated"])
 
     def test_delete(self):
@@ -60,5 +64,94 @@ class TestClient(unittest.TestCase):
         self.client.session.delete.assert_called_once_with(f"{self.base_url}/test", headers=self.client.headers)
         self.assertIsNone(response)
 
+    def test_transport_pool(self):
+        """
+        Test that the client mounts a pooled adapter with a (connect, read) timeout.
+        """
+        client = Client(api_key=self.api_key, timeout=12, connect_timeout=3, pool_maxsize=25)
+        adapter = client.session.get_adapter(self.base_url)
+        self.assertEqual(adapter.timeout, (3.0, 12.0))
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertIs(client.session.get_adapter("http://localhost"), adapter)
+        client.close()
+
+    def test_transport_timeout_from_config(self):
+        """
+        Test that the read timeout defaults to the `api.timeout` config value.
+        """
+        from scaile.configs import settings
+        adapter = self.client.session.get_adapter(self.base_url)
+        self.assertEqual(adapter.timeout[1], float(settings.api["timeout"]))
+
+class TestClientResponseCache(unittest.TestCase):
+    """
+    Unit tests for the opt-in response cache.
+    """
+
+    def setUp(self):
+        """
+        Set up a client with a response cache and a mocked session.
+        """
+        self.cache = ResponseCache(ttls={"/projects": 60, "/projects/*/annotations/*": 0})
+        self.client = Client(api_key="test_api_key", response_cache=self.cache)
+        self.client.session = MagicMock()
+
+    def response(self, status_code=200, body=b'{"n": 1}', etag=None):
+        return MagicMock(
+            status_code=status_code, content=body, headers={"ETag": etag} if etag else {},
+            json=lambda: json.loads(body),
+        )
+
+    def test_fresh_hit(self):
+        """
+        Test that a fresh entry is served without a request.
+        """
+        self.client.session.get.return_value = self.response()
+        self.assertEqual(self.client.get_projects(), {"n": 1})
+        self.assertEqual(self.client.get_projects(), {"n": 1})
+        self.assertEqual(self.client.session.get.call_count, 1)
+
+    def test_empty_body(self):
+        """
+        Test that an empty cached body decodes to None, like an uncached one.
+        """
+        self.client.session.get.return_value = self.response(body=b"")
+        self.assertIsNone(self.client.get_projects())
+        self.assertIsNone(self.client.get_projects())
+        self.assertEqual(self.client.session.get.call_count, 1)
+
+    def test_etag_revalidation(self):
+        """
+        Test that an expired entry is revalidated with If-None-Match.
+        """
+        self.client.session.get.side_effect = [self.response(etag='"v1"'), self.response(status_code=304)]
+        first = self.client._make_request("GET", "/projects/p1/annotations/a1")
+        second = self.client._make_request("GET", "/projects/p1/annotations/a1")
+
+        self.assertEqual(first, second)
+        headers = self.client.session.get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+
+    def test_mutation_invalidates(self):
+        """
+        Test that a mutating call drops cached entries of the project.
+        """
+        self.client.session.get.return_value = self.response()
+        self.client.session.delete.return_value = self.response(status_code=204)
+        self.client.get_projects()
+        self.client.delete_project("p1")
+        self.client.get_projects()
+        self.assertEqual(self.client.session.get.call_count, 2)
+
+    def test_uncached_endpoints_pass_through(self):
+        """
+        Test that endpoints without a TTL are never cached.
+        """
+        self.client.session.get.return_value = self.response()
+        self.client.get_project_annotations("p1")
+        self.client.get_project_annotations("p1")
+        self.assertEqual(self.client.session.get.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
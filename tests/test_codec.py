@@ -0,0 +1,64 @@
+import unittest
+from scaile.codec import CODECS, JSONCodec, get_codec
+
+PAYLOAD = {"project_id": "p1", "label": "café", "bbox": [1, 2.5, 3, 4], "meta": {"reviewed": True, "score": None}}
+
+class TestCodecs(unittest.TestCase):
+    """
+    Unit tests for the pluggable JSON codecs.
+    """
+
+    def available_codecs(self):
+        for name in CODECS:
+            try:
+                yield get_codec(name)
+            except ImportError:
+                continue
+
+    def test_round_trip_from_bytes(self):
+        """
+        Test that every installed codec encodes to bytes and decodes bytes, memoryviews and str.
+        """
+        for codec in self.available_codecs():
+            with self.subTest(codec=codec.name):
+                body = codec.dumps(PAYLOAD)
+                self.assertIsInstance(body, bytes)
+                self.assertEqual(codec.loads(body), PAYLOAD)
+                self.assertEqual(codec.loads(memoryview(body)), PAYLOAD)
+                self.assertEqual(codec.loads(body.decode()), PAYLOAD)
+                with self.assertRaises(ValueError):
+                    codec.loads(b"{broken")
+
+    def test_codecs_are_interchangeable(self):
+        """
+        Test that bodies written by one codec are read identically by the others.
+        """
+        codecs = list(self.available_codecs())
+        for writer in codecs:
+            for reader in codecs:
+                self.assertEqual(reader.loads(writer.dumps(PAYLOAD)), PAYLOAD)
+
+    def test_selection(self):
+        """
+        Test that codecs are shared by name and unknown names are rejected.
+        """
+        self.assertIs(get_codec("stdlib"), get_codec("stdlib"))
+        self.assertIn(get_codec("auto").name, CODECS)
+        self.assertIs(get_codec(get_codec("stdlib")), get_codec("stdlib"))
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+    def test_incomplete_codec_cannot_be_instantiated(self):
+        """
+        Test that a codec must implement both dumps and loads.
+        """
+        class EncodeOnly(JSONCodec):
+            def dumps(self, obj) -> bytes:
+                return b"{}"
+
+        with self.assertRaises(TypeError):
+            EncodeOnly()
+
+
+if __name__ == "__main__":
+    unittest.main()
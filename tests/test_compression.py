@@ -0,0 +1,84 @@
+import gzip
+import json
+import os
+import unittest
+from unittest.mock import MagicMock
+import requests
+from scaile.client import Client
+from scaile.compression import RequestCompression
+
+def annotation_payload(points: int) -> dict:
+    """An annotation with a long polygon, like the ones that motivated compression."""
+    return {"label": "road", "polygon": [[x, x + 0.5] for x in range(points)]}
+
+
+class TestRequestCompression(unittest.TestCase):
+    """
+    Unit tests for opt-in request body compression.
+    """
+
+    def setUp(self):
+        self.client = Client(api_key="test_api_key", compression=RequestCompression("gzip", min_size=1024))
+        self.client.session = MagicMock()
+        self.client.session.post.return_value = MagicMock(status_code=201, content=b'{"id": 1}')
+
+    def test_threshold_and_no_growth(self):
+        """
+        Test that small or incompressible bodies are sent unchanged.
+        """
+        compression = RequestCompression("gzip", min_size=100)
+        self.assertEqual(compression.compress(b"x" * 10), (b"x" * 10, None))
+        body, encoding = compression.compress(b"x" * 1000)
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(gzip.decompress(body), b"x" * 1000)
+        random_bytes = os.urandom(4096)
+        self.assertEqual(compression.compress(random_bytes), (random_bytes, None))
+        with self.assertRaises(ValueError):
+            RequestCompression("brotli")
+
+    def test_large_body_is_compressed(self):
+        """
+        Test that a large annotation is sent gzip-encoded with a Content-Encoding header.
+        """
+        payload = annotation_payload(5000)
+        self.assertEqual(self.client.submit_annotation("p1", payload), {"id": 1})
+
+        kwargs = self.client.session.post.call_args.kwargs
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(kwargs["data"])), payload)
+        self.assertLess(len(kwargs["data"]), len(self.client.codec.dumps(payload)) / 2)
+
+    def test_small_body_is_not_compressed(self):
+        """
+        Test that bodies under the threshold keep the plain encoding.
+        """
+        self.client.submit_annotation("p1", {"label": "cat"})
+        kwargs = self.client.session.post.call_args.kwargs
+        self.assertNotIn("Content-Encoding", kwargs["headers"])
+
+    def test_falls_back_when_server_rejects_encoding(self):
+        """
+        Test that a 415 answer resends the plain body and disables compression.
+        """
+        rejected = MagicMock(status_code=415)
+        rejected.raise_for_status.side_effect = requests.HTTPError(response=rejected)
+        self.client.session.post.side_effect = [rejected, MagicMock(status_code=201, content=b'{"id": 2}')]
+
+        payload = annotation_payload(5000)
+        self.assertEqual(self.client.submit_annotation("p1", payload), {"id": 2})
+        retry = self.client.session.post.call_args.kwargs
+        self.assertNotIn("Content-Encoding", retry["headers"])
+        self.assertEqual(json.loads(retry["data"]), payload)
+        self.assertIsNone(self.client.compression)
+
+    def test_disabled_by_default(self):
+        """
+        Test that clients send plain bodies unless compression is configured.
+        """
+        self.assertIsNone(Client(api_key="test_api_key").compression)
+        self.assertIsNone(RequestCompression.from_config("none"))
+        self.assertEqual(RequestCompression.from_config("gzip", 10).min_size, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import unittest
+from unittest.mock import patch
+from scaile.configs import Settings, clear_settings_cache, coerce, config_value, load_settings
+
+class TestSettings(unittest.TestCase):
+    """
+    Unit tests for typed, cached settings.
+    """
+
+    def tearDown(self):
+        clear_settings_cache()
+
+    def test_typed_sections(self):
+        """
+        Test that values are coerced to their schema types and readable both ways.
+        """
+        settings = Settings("testing")
+        self.assertEqual(settings.api.timeout, 10.0)
+        self.assertIsInstance(settings.api.timeout, float)
+        self.assertEqual(settings.annotation["batch_size"], 50)
+        self.assertIs(settings.rewards.enabled, False)
+        self.assertEqual(settings.storage.get("missing", "default"), "default")
+
+    def test_nested_env_overrides(self):
+        """
+        Test that SCAILE_<SECTION>__<KEY> overrides one key with type coercion.
+        """
+        env = {"SCAILE_API__TIMEOUT": "7", "SCAILE_REWARDS__ENABLED": "yes", "SCAILE_API__RETRY_JITTER": "0.25"}
+        with patch.dict(os.environ, env):
+            settings = Settings("testing")
+        self.assertEqual(settings.api.timeout, 7.0)
+        self.assertIs(settings.rewards.enabled, True)
+        self.assertEqual(settings.api.retry_jitter, 0.25)
+        self.assertEqual(settings.api.connect_timeout, 5.0)
+
+    def test_section_env_override_and_errors(self):
+        """
+        Test that SCAILE_<SECTION> merges a YAML mapping and bad values fail at load time.
+        """
+        with patch.dict(os.environ, {"SCAILE_ANNOTATION": "{batch_size: '25'}"}):
+            self.assertEqual(Settings("testing").annotation.batch_size, 25)
+        with patch.dict(os.environ, {"SCAILE_API__TIMEOUT": "soon"}):
+            with self.assertRaises(ValueError):
+                Settings("testing")
+        with self.assertRaises(ValueError):
+            coerce("maybe", bool, "rewards.enabled")
+
+    def test_frozen(self):
+        """
+        Test that settings cannot be modified after loading.
+        """
+        settings = Settings("testing")
+        with self.assertRaises(AttributeError):
+            settings.api.timeout = 1
+        with self.assertRaises(AttributeError):
+            settings.api = {}
+        with self.assertRaises(TypeError):
+            settings.api["timeout"] = 1
+
+    def test_cached_per_environment(self):
+        """
+        Test that each environment is loaded once and config_value reads the active one.
+        """
+        self.assertIs(load_settings("testing"), load_settings("testing"))
+        self.assertIsNot(load_settings("testing"), load_settings("production"))
+        with patch.dict(os.environ, {"SCAILE_ENV": "production"}):
+            self.assertEqual(config_value("annotation", "batch_size"), 200)
+            self.assertEqual(config_value("nothing", "key", 3), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
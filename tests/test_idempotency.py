@@ -0,0 +1,86 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from scaile.idempotency import IdempotencyStore, SQLiteIdempotencyStore, attach_delivery_id, event_id_of
+
+class TestIdempotencyStore(unittest.TestCase):
+    """
+    Unit tests for webhook event deduplication.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "seen.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_event_id(self):
+        """
+        Test that only explicit event IDs and delivery IDs identify an event.
+        """
+        self.assertEqual(event_id_of({"event_id": "e1", "id": "x"}), "e1")
+        # Neither a resource id nor the payload content identifies an event
+        self.assertIsNone(event_id_of({"event": "new_data", "id": 7}))
+        self.assertEqual(event_id_of(attach_delivery_id({"id": 7}, "d1")), "d1")
+        self.assertEqual(event_id_of(attach_delivery_id({"event_id": "e1"}, "d1")), "e1")
+
+    def test_claim_once(self):
+        """
+        Test that an ID can be claimed only once until released.
+        """
+        store = IdempotencyStore()
+        self.assertTrue(store.claim("e1"))
+        self.assertFalse(store.claim("e1"))
+        store.release("e1")
+        self.assertTrue(store.claim("e1"))
+        # Events without an ID are never duplicates
+        self.assertTrue(store.claim(None))
+        self.assertTrue(store.claim(None))
+        store.release(None)
+
+    def test_lru_bound(self):
+        """
+        Test that the in-memory store keeps at most max_entries IDs.
+        """
+        store = IdempotencyStore(max_entries=3)
+        for n in range(5):
+            store.claim(f"e{n}")
+        self.assertEqual(len(store), 3)
+        self.assertNotIn("e0", store)
+        self.assertIn("e4", store)
+
+    def test_concurrent_claims_have_one_winner(self):
+        """
+        Test that racing claims of the same ID succeed exactly once.
+        """
+        store = IdempotencyStore()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.claim("e1"))) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 1)
+
+    def test_persistent_across_restarts(self):
+        """
+        Test that the SQLite store remembers IDs across instances.
+        """
+        self.assertTrue(IdempotencyStore(path=self.path).claim("e1"))
+        self.assertFalse(IdempotencyStore(path=self.path).claim("e1"))
+
+    def test_ttl_expiry(self):
+        """
+        Test that an expired ID may be processed again.
+        """
+        store = SQLiteIdempotencyStore(self.path, ttl=60)
+        self.assertTrue(store.claim("e1"))
+        self.assertFalse(store.claim("e1"))
+        with patch("scaile.idempotency.time.time", return_value=10 ** 12):
+            self.assertTrue(store.claim("e1"))
+
+if __name__ == "__main__":
+    unittest.main()
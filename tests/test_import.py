@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Generous upper bound for `import scaile`; the lazy package needs a few milliseconds
+IMPORT_BUDGET_SECONDS = 0.1
+HEAVY_MODULES = ("requests", "urllib3", "yaml", "dotenv", "aiohttp", "flask", "scaile.client")
+
+def run_isolated(statement: str) -> dict:
+    """Run an import in a fresh interpreter and report its duration and loaded heavy modules."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+class TestImport(unittest.TestCase):
+    """
+    Guards the cost and side effects of importing the package.
+    """
+
+    def test_bare_import_is_lazy(self):
+        """
+        Test that `import scaile` loads no HTTP stack or config and stays within budget.
+        """
+        result = run_isolated("import scaile")
+        self.assertEqual(result["loaded"], [])
+        self.assertLess(result["elapsed"], IMPORT_BUDGET_SECONDS)
+
+    def test_light_exports_do_not_load_requests(self):
+        """
+        Test that helpers without HTTP needs import without requests or settings.
+        """
+        result = run_isolated("from scaile import Utils, Rewards, TokenBucket")
+        self.assertEqual(result["loaded"], [])
+
+    def test_client_loads_on_access(self):
+        """
+        Test that `scaile.Client` still resolves to the client class.
+        """
+        result = run_isolated("import scaile; scaile.Client")
+        self.assertIn("requests", result["loaded"])
+
+        import scaile
+        from scaile.client import Client
+        self.assertIs(scaile.Client, Client)
+        self.assertIn("Client", dir(scaile))
+        with self.assertRaises(AttributeError):
+            scaile.Missing
+
+
+if __name__ == "__main__":
+    unittest.main()
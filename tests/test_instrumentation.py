@@ -0,0 +1,115 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+import requests
+from scaile.client import Client
+from scaile.instrumentation import Instrument, MetricsCollector, endpoint_template
+from scaile.retry import RetryPolicy
+
+def make_response(status_code: int, body: bytes = b'{"ok": true}', request_body: bytes = None) -> requests.Response:
+    """Build a real requests.Response as the transport would return it."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response._content_consumed = True
+    response.headers["Content-Length"] = str(len(body))
+    response.elapsed = datetime.timedelta(milliseconds=20)
+    response.request = requests.Request("POST", "https://api.scaile.com/x", data=request_body).prepare()
+    return response
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Unit tests for request instrumentation hooks and the metrics collector.
+    """
+
+    def setUp(self):
+        self.collector = MetricsCollector()
+        self.client = Client(api_key="test_api_key", instruments=[self.collector],
+                             retry_policy=RetryPolicy(max_retries=2, backoff_base=0))
+        self.client.session = MagicMock()
+
+    def test_endpoint_template(self):
+        """
+        Test that resource IDs are replaced by placeholders.
+        """
+        self.assertEqual(endpoint_template("/projects/p-1/annotations"), "/projects/{id}/annotations")
+        self.assertEqual(endpoint_template("/projects/7/contributors/alice/rewards"),
+                         "/projects/{id}/contributors/{id}/rewards")
+        self.assertEqual(endpoint_template("/auth/validate"), "/auth/validate")
+
+    def test_endpoint_template_keeps_actions(self):
+        """
+        Test that action segments after a collection are not mistaken for IDs.
+        """
+        self.assertEqual(endpoint_template("/projects/p1/rewards/distribute"), "/projects/{id}/rewards/distribute")
+        self.assertEqual(endpoint_template("/projects/p1/contributors/bob/rewards/calculate"),
+                         "/projects/{id}/contributors/{id}/rewards/calculate")
+        self.assertEqual(endpoint_template("/projects/p1/storage/uploads/u1/complete"),
+                         "/projects/{id}/storage/uploads/{id}/complete")
+        self.assertEqual(endpoint_template("/projects/p1/storage/files/f1/content"),
+                         "/projects/{id}/storage/files/{id}/content")
+
+    def test_hooks_report_request(self):
+        """
+        Test that hooks see the endpoint template, status, sizes, TTFB and retries.
+        """
+        seen = []
+
+        class Recorder(Instrument):
+            def before_request(self, metrics):
+                seen.append(("before", metrics.endpoint, metrics.status))
+
+            def after_request(self, metrics):
+                seen.append(("after", metrics.as_dict()))
+
+        self.client.add_instrument(Recorder())
+        self.client.session.post.side_effect = [
+            make_response(429, b""), make_response(201, b'{"id": 1}', request_body=b'{"label": "cat"}'),
+        ]
+        self.client.submit_annotation("p1", {"label": "cat"})
+
+        self.assertEqual(seen[0], ("before", "/projects/{id}/annotations", None))
+        after = seen[1][1]
+        self.assertEqual((after["method"], after["status"], after["retries"]), ("POST", 201, 1))
+        self.assertEqual((after["bytes_sent"], after["bytes_received"]), (16, 9))
+        self.assertAlmostEqual(after["ttfb"], 0.02)
+        self.assertIsNone(after["dns_time"])
+
+    def test_collector_and_prometheus_export(self):
+        """
+        Test that failed and successful requests are aggregated and exported.
+        """
+        self.client.session.get.return_value = make_response(200)
+        self.client.session.delete.return_value = make_response(404, b"")
+        for project_id in ("p1", "p2"):
+            self.client.get_project_annotations(project_id)
+        with self.assertRaises(requests.HTTPError):
+            self.client.delete_project("p1")
+
+        summary = {(row["method"], row["endpoint"], row["status"]): row for row in self.collector.summary()}
+        self.assertEqual(summary[("GET", "/projects/{id}/annotations", "200")]["count"], 2)
+        self.assertEqual(summary[("DELETE", "/projects/{id}", "404")]["count"], 1)
+
+        text = self.collector.export_prometheus()
+        self.assertIn("# TYPE scaile_request_duration_seconds histogram", text)
+        self.assertIn('scaile_request_duration_seconds_count{method="GET",endpoint="/projects/{id}/annotations",'
+                      'status="200"} 2', text)
+        self.assertIn('scaile_request_bytes_received_total{method="GET",endpoint="/projects/{id}/annotations",'
+                      'status="200"} 24', text)
+
+    def test_failing_instrument_does_not_break_requests(self):
+        """
+        Test that an exception in a hook is logged, not raised.
+        """
+        class Broken(Instrument):
+            def after_request(self, metrics):
+                raise RuntimeError("boom")
+
+        self.client.add_instrument(Broken())
+        self.client.session.get.return_value = make_response(200)
+        self.assertEqual(self.client.get_projects(), {"ok": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
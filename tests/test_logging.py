@@ -0,0 +1,125 @@
+import logging
+import subprocess
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+from scaile.logging import (
+    LazyFields, _to_json, log_event, logger, redact, start_queue_logging, stop_queue_logging, truncate,
+)
+
+class RecordingHandler(logging.Handler):
+    """Handler keeping formatted messages."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestLogging(unittest.TestCase):
+    """
+    Unit tests for the SDK logging layer.
+    """
+
+    def setUp(self):
+        self.handler = RecordingHandler()
+        self.level = logger.level
+        logger.addHandler(self.handler)
+
+    def tearDown(self):
+        stop_queue_logging()
+        logger.removeHandler(self.handler)
+        logger.setLevel(self.level)
+
+    def test_import_leaves_root_logger_alone(self):
+        """
+        Test that importing the SDK does not configure the root logger.
+        """
+        code = "import logging, scaile.logging; print(len(logging.getLogger().handlers))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "0")
+
+    def test_disabled_level_does_not_render(self):
+        """
+        Test that fields are never stringified when the level is disabled.
+        """
+        rendered = []
+
+        class Payload:
+            def __repr__(self):
+                rendered.append(True)
+                return "payload"
+
+        logger.setLevel(logging.INFO)
+        log_event(logging.DEBUG, "api.request", body=Payload())
+        self.assertEqual(rendered, [])
+        self.assertEqual(self.handler.messages, [])
+
+    def test_redaction_and_truncation(self):
+        """
+        Test that secrets are masked and long values shortened.
+        """
+        self.assertEqual(redact({"api_key": "k", "items": [{"Token": "t", "label": "cat"}]}),
+                         {"api_key": "***", "items": [{"Token": "***", "label": "cat"}]})
+        self.assertEqual(truncate("x" * 10, 4), "xxxx...(+6 chars)")
+
+        logger.setLevel(logging.DEBUG)
+        log_event(logging.DEBUG, "api.request", method="POST", body={"password": "p", "text": "y" * 1000})
+        message = self.handler.messages[0]
+        self.assertTrue(message.startswith("api.request method=POST body="))
+        self.assertIn('"password":"***"', message)
+        self.assertLess(len(message), 400)
+        self.assertEqual(str(LazyFields({"n": 1})), "n=1")
+
+    def test_queue_logging(self):
+        """
+        Test that records reach the handlers through the background listener.
+        """
+        logger.setLevel(logging.INFO)
+        target = RecordingHandler()
+        start_queue_logging(target)
+        logger.info("queued %s", 1)
+        stop_queue_logging()
+        self.assertEqual(target.messages, ["queued 1"])
+        # Handlers go back on the logger once the listener stops
+        self.assertIn(target, logger.handlers)
+        logger.removeHandler(target)
+
+    def test_large_fields_clipped_before_serializing(self):
+        """
+        Test that only the logged prefix of a large payload is serialized.
+        """
+        with patch("scaile.logging._to_json", wraps=_to_json) as to_json:
+            rendered = LazyFields({"items": list(range(100000)), "nested": [["z" * 1000] * 1000] * 1000}).as_dict()
+        self.assertTrue(all(len(arg[0]) < 300 for arg, _ in to_json.call_args_list))
+        self.assertTrue(rendered["items"].startswith("[0,1,2,"))
+        self.assertLess(len(rendered["nested"]), 300)
+
+    def test_queued_fields_rendered_when_logged(self):
+        """
+        Test that changing a payload after logging it does not change the queued record.
+        """
+        logger.setLevel(logging.DEBUG)
+        release = threading.Event()
+
+        class BlockingHandler(RecordingHandler):
+            def emit(self, record):
+                release.wait(5)
+                super().emit(record)
+
+        target = BlockingHandler()
+        start_queue_logging(target)
+        payload = {"label": "cat"}
+        log_event(logging.DEBUG, "webhook.received", payload=payload)
+        payload["label"] = "dog"
+        release.set()
+        stop_queue_logging()
+        logger.removeHandler(target)
+        self.assertEqual(target.messages, ['webhook.received payload={"label":"cat"}'])
+
+
+if __name__ == "__main__":
+    unittest.main()
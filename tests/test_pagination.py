@@ -0,0 +1,119 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+from scaile.annotation import Annotation
+from scaile.pagination import iter_pages, split_page
+
+class TestPagination(unittest.TestCase):
+    """
+    Unit tests for the cursor-following iterators.
+    """
+
+    def make_fetch(self, pages):
+        """
+        Build a fake list endpoint serving `pages` and recording the params it receives.
+        """
+        calls = []
+
+        def fetch(params):
+            calls.append(dict(params))
+            index = int(params.get("cursor", 0))
+            next_cursor = str(index + 1) if index + 1 < len(pages) else None
+            return {"data": pages[index], "next_cursor": next_cursor}
+
+        return fetch, calls
+
+    def test_split_page(self):
+        """
+        Test item and cursor extraction from supported response shapes.
+        """
+        self.assertEqual(split_page([1, 2]), ([1, 2], None))
+        self.assertEqual(split_page({"items": [1], "next": "abc"}), ([1], "abc"))
+        self.assertEqual(split_page({"data": [], "next_cursor": None}), ([], None))
+        self.assertEqual(split_page(None), ([], None))
+
+    def test_follows_next_links(self):
+        """
+        Test that a next-page link is requested with its own query parameters.
+        """
+        calls = []
+
+        def fetch(params):
+            calls.append(params)
+            if "cursor" in params:
+                return {"data": [3], "next": None}
+            return {"data": [1, 2], "next": "https://api.scaile.com/v1/projects/p1/rewards?cursor=xyz&limit=2"}
+
+        self.assertEqual(list(iter_pages(fetch, page_size=2, prefetch=False)), [[1, 2], [3]])
+        self.assertEqual(calls[1], {"cursor": "xyz", "limit": "2"})
+
+    def test_link_without_query_ends_pagination(self):
+        """
+        Test that a next link without parameters is not followed back to the first page.
+        """
+        calls = []
+
+        def fetch(params):
+            calls.append(params)
+            return {"data": [1, 2], "next": "https://api.scaile.com/v1/projects/p1/rewards"}
+
+        for prefetch in (False, True):
+            calls.clear()
+            self.assertEqual(list(iter_pages(fetch, page_size=2, prefetch=prefetch)), [[1, 2]])
+            self.assertEqual(len(calls), 1)
+
+    def test_follows_cursors(self):
+        """
+        Test that all pages are visited and filters are sent with each request.
+        """
+        fetch, calls = self.make_fetch([[1, 2], [3, 4], [5]])
+        pages = list(iter_pages(fetch, {"label": "cat"}, page_size=2))
+
+        self.assertEqual(pages, [[1, 2], [3, 4], [5]])
+        self.assertEqual(calls[0], {"label": "cat", "limit": 2})
+        self.assertEqual(calls[2], {"label": "cat", "limit": 2, "cursor": "2"})
+
+    def test_prefetches_next_page(self):
+        """
+        Test that the next page is requested while the current page is consumed.
+        """
+        requested = threading.Event()
+
+        def fetch(params):
+            if params.get("cursor") == "1":
+                requested.set()
+                return {"data": ["b"]}
+            return {"data": ["a"], "next_cursor": "1"}
+
+        pages = iter_pages(fetch)
+        self.assertEqual(next(pages), ["a"])
+        self.assertTrue(requested.wait(timeout=1))
+        self.assertEqual(list(pages), [["b"]])
+
+    def test_without_prefetch_is_lazy(self):
+        """
+        Test that nothing beyond the consumed page is fetched when prefetch is off.
+        """
+        fetch, calls = self.make_fetch([[1], [2], [3]])
+        pages = iter_pages(fetch, prefetch=False)
+        next(pages)
+        self.assertEqual(len(calls), 1)
+
+    def test_iter_annotations(self):
+        """
+        Test that Annotation.iter_annotations yields individual annotations.
+        """
+        mock_client = MagicMock()
+        mock_client._make_request.side_effect = [
+            {"data": [{"id": 1}], "next_cursor": "c1"},
+            {"data": [{"id": 2}]},
+        ]
+        items = list(Annotation(mock_client).iter_annotations("p1", page_size=1))
+
+        self.assertEqual(items, [{"id": 1}, {"id": 2}])
+        mock_client._make_request.assert_called_with(
+            "GET", "/projects/p1/annotations", params={"limit": 1, "cursor": "c1"}
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import requests
+from scaile.client import Client
+from scaile.ratelimit import FileTokenBucket, TokenBucket
+from scaile.retry import RetryPolicy, parse_retry_after
+
+class TestRetryPolicy(unittest.TestCase):
+    """
+    Unit tests for the RetryPolicy class.
+    """
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=3, backoff_base=1, backoff_max=8)
+
+    def test_idempotency_rules(self):
+        """
+        Test which methods and statuses are retried.
+        """
+        self.assertTrue(self.policy.should_retry("GET", 0, status=503))
+        self.assertFalse(self.policy.should_retry("POST", 0, status=503))
+        self.assertTrue(self.policy.should_retry("POST", 0, status=429))
+        self.assertTrue(self.policy.should_retry("POST", 0, headers={"Idempotency-Key": "k1"}))
+        self.assertFalse(self.policy.should_retry("GET", 0, status=400))
+        self.assertFalse(self.policy.should_retry("GET", 3, status=503))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """
+        Test that delays stay within the exponential envelope.
+        """
+        for attempt in range(6):
+            delay = self.policy.delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(8, 2 ** attempt))
+
+    def test_retry_after(self):
+        """
+        Test that Retry-After takes precedence over a shorter backoff.
+        """
+        self.assertGreaterEqual(self.policy.delay(0, "5"), 5)
+        self.assertEqual(parse_retry_after("garbage"), None)
+        self.assertAlmostEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+
+    def test_max_retries_from_config(self):
+        """
+        Test that max_retries defaults to annotation.max_retries.
+        """
+        from scaile.configs import settings
+        self.assertEqual(RetryPolicy().max_retries, settings.annotation["max_retries"])
+
+
+class TestTokenBucket(unittest.TestCase):
+    """
+    Unit tests for the token-bucket rate limiters.
+    """
+
+    def test_rate_is_enforced(self):
+        """
+        Test that acquiring beyond the burst waits for refills.
+        """
+        bucket = TokenBucket(rate=100, burst=5)
+        start = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_timeout(self):
+        """
+        Test that acquire gives up after the timeout.
+        """
+        bucket = TokenBucket(rate=1, burst=1)
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertFalse(bucket.acquire(timeout=0.01))
+
+    def test_more_than_burst_is_rejected(self):
+        """
+        Test that a request larger than the bucket fails instead of blocking forever.
+        """
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=10, burst=5).acquire(6)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaises(ValueError):
+                FileTokenBucket(os.path.join(tmpdir, "bucket.json"), rate=10, burst=5).acquire(6)
+
+    def test_adaptive_rate(self):
+        """
+        Test that throttling halves the rate and successes raise it again.
+        """
+        bucket = TokenBucket(rate=10, adaptive=True)
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 5)
+        for _ in range(100):
+            bucket.on_success()
+        self.assertEqual(bucket.rate, 10)
+
+    def test_file_bucket_is_shared(self):
+        """
+        Test that two buckets on the same file share one budget.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bucket.json")
+            first = FileTokenBucket(path, rate=1, burst=2)
+            second = FileTokenBucket(path, rate=1, burst=2)
+            self.assertTrue(first.acquire(timeout=0))
+            self.assertTrue(second.acquire(timeout=0))
+            self.assertFalse(first.acquire(timeout=0))
+
+
+class TestClientRetries(unittest.TestCase):
+    """
+    Unit tests for retries in Client requests.
+    """
+
+    def setUp(self):
+        self.client = Client(api_key="test_api_key", retry_policy=RetryPolicy(max_retries=2))
+        self.client.session = MagicMock()
+
+    def response(self, status_code, headers=None):
+        response = MagicMock(status_code=status_code, headers=headers or {}, content=b'{"ok": true}')
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} error")
+        return response
+
+    @patch("scaile.retry.time.sleep")
+    def test_retries_429_with_retry_after(self, sleep):
+        """
+        Test that a 429 is retried after the server-provided delay.
+        """
+        self.client.session.post.side_effect = [self.response(429, {"Retry-After": "2"}), self.response(201)]
+        self.assertEqual(self.client.submit_annotation("p1", {"text": "a"}), {"ok": True})
+        self.assertGreaterEqual(sleep.call_args.args[0], 2)
+
+    @patch("scaile.retry.time.sleep")
+    def test_gives_up_after_max_retries(self, sleep):
+        """
+        Test that the last error is raised once retries are exhausted.
+        """
+        self.client.session.get.return_value = self.response(503)
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_projects()
+        self.assertEqual(self.client.session.get.call_count, 3)
+
+    @patch("scaile.retry.time.sleep")
+    def test_post_not_retried_on_connection_error(self, sleep):
+        """
+        Test that a non-idempotent request is not resent after an ambiguous failure.
+        """
+        self.client.session.post.side_effect = requests.ConnectionError("reset")
+        with self.assertRaises(requests.ConnectionError):
+            self.client.create_project({"name": "p"})
+        self.assertEqual(self.client.session.post.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import math
+import unittest
+from unittest.mock import MagicMock, patch
+from scaile.reward_engine import RewardEngine, _import_numpy
+from scaile.rewards import Rewards
+
+class TestRewardEngine(unittest.TestCase):
+    """
+    Unit tests for the local RewardEngine.
+    """
+
+    def setUp(self):
+        """
+        Setup a small activity table.
+        """
+        self.ids = ["a", "b", "c"]
+        self.accepted = [10, 200, 1500]
+        self.quality = [1.0, 0.5, 0.8]
+
+    def test_linear(self):
+        """
+        Test that linear rewards scale with accepted work and quality.
+        """
+        result = RewardEngine("linear", rate=2).calculate(self.ids, self.accepted, self.quality)
+        self.assertEqual(list(result.tokens), [20, 200, 2400])
+        self.assertEqual(result.total, 2620)
+
+    def test_exponential(self):
+        """
+        Test that full quality pays linearly and lower quality decays exponentially.
+        """
+        result = RewardEngine("exponential", quality_weight=2).calculate(self.ids, self.accepted, self.quality)
+        self.assertEqual(result.tokens[0], 10)
+        self.assertAlmostEqual(result.tokens[1], 200 * math.exp(-1), places=5)
+
+    def test_tiered(self):
+        """
+        Test that each tier's multiplier applies only above its threshold.
+        """
+        engine = RewardEngine("tiered", tiers=[(0, 1), (100, 2), (1000, 3)])
+        result = engine.calculate(self.ids, self.accepted)
+        self.assertEqual(list(result.tokens), [10, 100 + 2 * 100, 100 + 2 * 900 + 3 * 500])
+
+    def test_method_from_settings(self):
+        """
+        Test that the engine honors rewards.calculation_method.
+        """
+        with patch("scaile.reward_engine.config_value", return_value="exponential"):
+            self.assertEqual(RewardEngine().method, "exponential")
+        with self.assertRaises(ValueError):
+            RewardEngine("quadratic")
+
+    def test_invalid_input(self):
+        """
+        Test that mismatched columns and out-of-range quality are rejected.
+        """
+        engine = RewardEngine("linear")
+        with self.assertRaises(ValueError):
+            engine.calculate(self.ids, [1, 2])
+        with self.assertRaises(ValueError):
+            engine.calculate(self.ids, self.accepted, [1, 2, 3])
+
+    def test_non_finite_input_rejected(self):
+        """
+        Test that NaN and infinite values are rejected by both backends.
+        """
+        for numpy in {_import_numpy(), None}:
+            engine = RewardEngine("linear")
+            engine._numpy = numpy
+            for accepted, quality in (([1, math.nan, 3], None), ([1, math.inf, 3], None),
+                                      (self.accepted, [1, math.nan, 0.5])):
+                with self.subTest(numpy=numpy is not None, accepted=accepted, quality=quality):
+                    with self.assertRaises(ValueError):
+                        engine.calculate(self.ids, accepted, quality)
+
+    @unittest.skipUnless(_import_numpy(), "numpy is not installed")
+    def test_numpy_and_list_backends_agree(self):
+        """
+        Test that the numpy and the pure-Python arithmetic give identical tokens.
+        """
+        ids = [f"c{n}" for n in range(500)]
+        accepted = [(n * 37) % 2500 for n in range(500)]
+        quality = [((n * 13) % 101) / 100 for n in range(500)]
+        for method in ("linear", "exponential", "tiered"):
+            with self.subTest(method=method):
+                engine = RewardEngine(method, rate=1.5)
+                vectorized = engine.calculate(ids, accepted, quality)
+                engine._numpy = None
+                plain = engine.calculate(ids, accepted, quality)
+                self.assertIsInstance(plain.tokens, list)
+                for fast, slow in zip(vectorized.tokens, plain.tokens):
+                    self.assertAlmostEqual(float(fast), slow, delta=1e-6)
+
+    def test_result_shape_and_payouts(self):
+        """
+        Test that records match the API shape and payouts feed bulk_distribute.
+        """
+        client = MagicMock()
+        rewards = Rewards(client)
+        result = rewards.calculate_rewards_local(
+            "p1", {"contributor_id": self.ids, "accepted": self.accepted}, method="linear"
+        )
+
+        self.assertEqual(result.get("b"), {
+            "project_id": "p1", "contributor_id": "b", "calculation_method": "linear", "tokens": 200.0,
+        })
+        self.assertEqual(len(list(result.records())), 3)
+        client._make_request.assert_not_called()
+
+        plan = rewards.plan_distribution(result.to_payouts())
+        self.assertEqual(plan.total_amount, 1710)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from scaile.reward_ledger import RewardLedger, SINCE_PARAM
+from scaile.rewards import Rewards
+from scaile.webhook_registry import WebhookRegistry
+
+class TestRewardLedger(unittest.TestCase):
+    """
+    Unit tests for the local RewardLedger.
+    """
+
+    def setUp(self):
+        """
+        Setup a ledger on a temporary database, synced through a mocked client.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.mock_client = MagicMock()
+        self.rewards = Rewards(self.mock_client)
+        self.ledger = self.rewards.ledger("p1", os.path.join(self.directory.name, "ledger.sqlite3"))
+
+    def tearDown(self):
+        self.ledger.close()
+        self.directory.cleanup()
+
+    def test_append_materializes_balances(self):
+        """
+        Test that balances are summed per contributor and duplicate IDs are ignored.
+        """
+        added = self.ledger.append([
+            {"id": "t1", "contributor_id": "a", "amount": 10},
+            {"id": "t2", "contributor_id": "a", "amount": "2.5"},
+            {"id": "t3", "contributor_id": "b", "tokens": 4},
+            {"contributor_id": "b", "amount": 1},
+        ])
+        self.assertEqual(added, 3)
+        self.assertEqual(self.ledger.append([{"id": "t1", "contributor_id": "a", "amount": 10}]), 0)
+
+        self.assertEqual(self.ledger.balance("a"), Decimal("12.5"))
+        self.assertEqual(self.ledger.balance("nobody"), 0)
+        self.assertEqual(self.ledger.summary("a"), {
+            "contributor_id": "a", "balance": Decimal("12.5"), "transactions": 2, "last_transaction": "t2",
+        })
+        self.assertEqual([t["id"] for t in self.ledger.history("a")], ["t2", "t1"])
+        self.assertEqual(self.ledger.balances(), {"a": Decimal("12.5"), "b": Decimal(4)})
+
+    def test_incremental_sync(self):
+        """
+        Test that sync sends the cursor of the last synced transaction.
+        """
+        self.mock_client._make_request.side_effect = [
+            {"data": [{"id": "t1", "contributor_id": "a", "amount": 5},
+                      {"id": "t2", "contributor_id": "b", "amount": 7}]},
+            {"data": [{"id": "t3", "contributor_id": "a", "amount": 1}]},
+        ]
+
+        self.assertEqual(self.ledger.sync(), 2)
+        self.assertEqual(self.ledger.cursor, "t2")
+        self.assertEqual(self.ledger.sync(), 1)
+
+        params = self.mock_client._make_request.call_args.kwargs["params"]
+        self.assertEqual(params[SINCE_PARAM], "t2")
+        self.assertEqual(self.ledger.cursor, "t3")
+        self.assertEqual(self.ledger.balance("a"), 6)
+
+    def test_webhook_updates(self):
+        """
+        Test that reward webhooks of the project update the ledger.
+        """
+        registry = WebhookRegistry()
+        self.ledger.attach(registry)
+
+        registry.dispatch({"event": "reward.distributed", "project_id": "p1",
+                           "data": [{"id": "t9", "contributor_id": "a", "amount": 3}]})
+        registry.dispatch({"event": "reward.distributed", "project_id": "other",
+                           "data": {"id": "t10", "contributor_id": "a", "amount": 3}})
+
+        self.assertEqual(self.ledger.balance("a"), 3)
+        self.assertIsNone(self.ledger.cursor)
+
+    def test_malformed_webhook_data_is_skipped(self):
+        """
+        Test that non-dict transactions are skipped instead of failing the batch.
+        """
+        added = self.ledger.handle_events([
+            {"event": "reward.created", "data": "oops"},
+            {"event": "reward.created", "data": [["t1", "a", 1], {"id": "t2", "contributor_id": "a", "amount": 2}]},
+        ])
+        self.assertEqual(added, 1)
+        self.assertEqual(self.ledger.balance("a"), 2)
+
+    def test_persists_across_instances(self):
+        """
+        Test that balances survive reopening the database.
+        """
+        self.ledger.append([{"id": "t1", "contributor_id": "a", "amount": 5}])
+        with RewardLedger(self.ledger.path, "p1") as reopened:
+            self.assertEqual(reopened.balance("a"), 5)
+        with RewardLedger(self.ledger.path, "p2") as other_project:
+            self.assertEqual(other_project.balance("a"), 0)
+
+if __name__ == "__main__":
+    unittest.main()
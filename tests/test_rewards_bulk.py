@@ -0,0 +1,123 @@
+import io
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from scaile.rewards import Rewards, DistributionPlan
+
+class TestRewardsBulkDistribute(unittest.TestCase):
+    """
+    Unit tests for Rewards.plan_distribution and Rewards.bulk_distribute.
+    """
+
+    def setUp(self):
+        """
+        Setup a mocked client instance for testing.
+        """
+        self.mock_client = MagicMock()
+        self.mock_client._make_request.side_effect = lambda method, endpoint, json, headers: {"status": "ok"}
+        self.rewards = Rewards(self.mock_client)
+
+    def test_duplicates_are_aggregated(self):
+        """
+        Test that entries of the same contributor are summed and bad rows rejected.
+        """
+        plan = self.rewards.plan_distribution([
+            {"contributor_id": "a", "amount": 10},
+            ("b", "2.5"),
+            {"contributor_id": "a", "amount": 0.1},
+            {"contributor_id": "", "amount": 1},
+            {"contributor_id": "c", "amount": "lots"},
+        ])
+
+        self.assertEqual(plan.totals, {"a": Decimal("10.1"), "b": Decimal("2.5")})
+        self.assertEqual(plan.duplicates, 1)
+        self.assertEqual([r[2] for r in plan.rejected], ["missing contributor", "invalid amount"])
+        self.assertEqual(plan.total_amount, Decimal("12.6"))
+        # Amounts are sent as exact decimal strings, never rounded through a float
+        self.assertEqual(plan.payload(0)["distributions"][0]["amount"], "10.1")
+
+    def test_csv_and_columnar_input(self):
+        """
+        Test that CSV files and columnar dicts produce the same plan.
+        """
+        csv_plan = self.rewards.plan_distribution(io.StringIO("contributor_id,amount\nx,1\ny,2\nx,3\n"))
+        columnar_plan = self.rewards.plan_distribution({"contributor_id": ["x", "y", "x"], "amount": [1, 2, 3]})
+
+        self.assertEqual(csv_plan.totals, columnar_plan.totals)
+        self.assertEqual(csv_plan.chunks, columnar_plan.chunks)
+        self.assertEqual(columnar_plan.payload(0), {"distributions": [
+            {"contributor_id": "x", "amount": "4"}, {"contributor_id": "y", "amount": "2"},
+        ]})
+
+    def test_chunks_sent_with_idempotency_keys(self):
+        """
+        Test that chunks are bounded and resubmitting the same run reuses the keys.
+        """
+        payouts = [{"contributor_id": f"c{n:03d}", "amount": n} for n in range(25)]
+        report = self.rewards.bulk_distribute("p1", payouts, chunk_size=10, max_workers=3, batch_id="2026-10")
+
+        calls = self.mock_client._make_request.call_args_list
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(all(call.args == ("POST", "/projects/p1/rewards/distribute") for call in calls))
+        self.assertEqual(sorted(len(call.kwargs["json"]["distributions"]) for call in calls), [5, 10, 10])
+        keys = {call.kwargs["headers"]["Idempotency-Key"] for call in calls}
+        self.assertEqual(len(keys), 3)
+        self.assertEqual({report.plan.idempotency_key("p1", i) for i in range(3)}, keys)
+
+        rerun = self.rewards.plan_distribution(list(reversed(payouts)), chunk_size=10, batch_id="2026-10")
+        self.assertEqual({rerun.idempotency_key("p1", i) for i in range(3)}, keys)
+        self.assertTrue(report.ok)
+        self.assertEqual(report.distributed_amount, Decimal(300))
+
+    def test_idempotency_keys_depend_on_run_project_and_chunk(self):
+        """
+        Test that keys never repeat across payout runs, projects or different chunks.
+        """
+        payouts = [(f"c{n}", n) for n in range(6)]
+        plan = self.rewards.plan_distribution(payouts, chunk_size=2, batch_id="2026-10")
+        keys = [plan.idempotency_key("p1", i) for i in range(3)]
+
+        # A later payout period with identical amounts
+        next_period = self.rewards.plan_distribution(payouts, chunk_size=2, batch_id="2026-11")
+        self.assertFalse(set(keys) & {next_period.idempotency_key("p1", i) for i in range(3)})
+        # Plans without a batch ID are separate runs
+        first, second = (self.rewards.plan_distribution(payouts, chunk_size=2) for _ in range(2))
+        self.assertNotEqual(first.idempotency_key("p1", 0), second.idempotency_key("p1", 0))
+        # The same entries for another project
+        self.assertNotIn(plan.idempotency_key("p2", 0), keys)
+        # Another chunk size regroups contributors under new keys
+        regrouped = self.rewards.plan_distribution(payouts, chunk_size=3, batch_id="2026-10")
+        self.assertFalse(set(keys) & {regrouped.idempotency_key("p1", i) for i in range(2)})
+
+    def test_reconciliation_of_failed_chunks(self):
+        """
+        Test that a failing chunk is reported and its entries can be resubmitted.
+        """
+        def distribute(method, endpoint, json, headers):
+            if json["distributions"][0]["contributor_id"] == "c2":
+                raise RuntimeError("rejected")
+            return {"status": "ok"}
+
+        self.mock_client._make_request.side_effect = distribute
+        payouts = [(f"c{n}", 5) for n in range(6)]
+        report = self.rewards.bulk_distribute("p1", payouts, chunk_size=2)
+        failed_key = report.failed[0].idempotency_key
+
+        self.assertFalse(report.ok)
+        self.assertEqual([r.index for r in report.failed], [1])
+        self.assertEqual(report.outstanding(), [
+            {"contributor_id": "c2", "amount": Decimal(5)}, {"contributor_id": "c3", "amount": Decimal(5)},
+        ])
+        summary = report.summary()
+        self.assertEqual(summary["distributed_amount"], "20")
+        self.assertEqual(summary["outstanding_amount"], "10")
+
+        self.mock_client._make_request.side_effect = lambda method, endpoint, json, headers: {"status": "ok"}
+        retry = self.rewards.bulk_distribute("p1", report.outstanding(), chunk_size=2,
+                                             batch_id=report.plan.batch_id)
+        self.assertTrue(retry.ok)
+        self.assertIsInstance(retry.plan, DistributionPlan)
+        self.assertEqual(retry.results[0].idempotency_key, failed_key)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import hashlib
+import hmac
+import unittest
+from scaile.signature import SignatureVerifier
+
+def reference_signature(secret: str, payload: bytes) -> str:
+    """Signature computed the way the Scaile platform does."""
+    return hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+
+
+class TestSignatureVerifier(unittest.TestCase):
+    """
+    Unit tests for webhook signature verification.
+    """
+
+    def test_matches_reference_hmac(self):
+        """
+        Test that valid signatures are accepted and tampered payloads rejected.
+        """
+        verifier = SignatureVerifier("secret")
+        payload = b'{"event": "new_data"}'
+        signature = reference_signature("secret", payload)
+
+        self.assertTrue(verifier.verify(payload, signature))
+        self.assertTrue(verifier.verify(payload, signature))  # keyed state is not consumed
+        self.assertEqual(verifier.sign(payload), signature)
+        self.assertFalse(verifier.verify(payload + b" ", signature))
+        self.assertFalse(verifier.verify(payload, ""))
+
+    def test_secret_rotation(self):
+        """
+        Test that every active secret is accepted and removed secrets are not.
+        """
+        payload = b'{"event": "delete_data"}'
+        verifier = SignatureVerifier(["old"])
+        verifier.add_secret("new")
+        self.assertEqual(verifier.secret_count, 2)
+        self.assertTrue(verifier.verify(payload, reference_signature("old", payload)))
+        self.assertTrue(verifier.verify(payload, reference_signature("new", payload)))
+
+        verifier.remove_secret("old")
+        self.assertFalse(verifier.verify(payload, reference_signature("old", payload)))
+        self.assertTrue(verifier.verify(payload, reference_signature("new", payload)))
+        with self.assertRaises(ValueError):
+            verifier.remove_secret("new")
+
+    def test_rejects_oversized_payload(self):
+        """
+        Test that payloads above the size limit are rejected even with a valid signature.
+        """
+        verifier = SignatureVerifier("secret", max_payload_size=16)
+        payload = b"x" * 17
+        self.assertFalse(verifier.verify(payload, reference_signature("secret", payload)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,10 @@
+import io
+import mmap
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock
+from scaile.cache import ContentCache
 from scaile.storage import Storage
 
 class TestStorage(unittest.TestCase):
@@ -52,5 +57,237 @@ class TestStorage(unittest.TestCase):
         self.mock_client.delete.assert_called_once_with(f"/storage/{file_id}")
         self.assertEqual(response, {"status": "deleted"})
 
+class TestStorageChunkedUpload(unittest.TestCase):
+    """
+    Unit tests for chunked, resumable uploads in Storage.upload_data.
+    """
+
+    def setUp(self):
+        """
+        Create a 10-byte file and a mocked client that records uploaded parts.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmpdir.name, "shard.bin")
+        with open(self.file_path, "wb") as f:
+            f.write(b"0123456789")
+
+        self.parts = {}
+        self.fail_part = None
+        self.mock_client = MagicMock()
+        self.mock_client._make_request.side_effect = self.fake_request
+        self.storage = Storage(self.mock_client)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def fake_request(self, method, endpoint, json=None, data=None, headers=None):
+        if endpoint.endswith("/storage/uploads"):
+            return {"upload_id": "u1"}
+        if "/parts/" in endpoint:
+            part_number = int(endpoint.rsplit("/", 1)[1])
+            if part_number == self.fail_part:
+                raise ConnectionError("network blip")
+            self.parts[part_number] = data
+            return {"etag": f"e{part_number}"}
+        if endpoint.endswith("/complete"):
+            return {"file_id": "f1", "parts": json["parts"]}
+
+    def test_uploads_fixed_size_parts(self):
+        """
+        Test that the file is split into parts and the upload is completed.
+        """
+        response = self.storage.upload_data("p1", self.file_path, part_size=4, max_workers=2)
+
+        self.assertEqual(self.parts, {1: b"0123", 2: b"4567", 3: b"89"})
+        self.assertEqual([p["etag"] for p in response["parts"]], ["e1", "e2", "e3"])
+        self.assertFalse(os.path.exists(self.file_path + ".scaile-upload"))
+
+    def test_resumes_from_checkpoint(self):
+        """
+        Test that a restarted upload only sends the parts that did not complete.
+        """
+        self.fail_part = 2
+        with self.assertRaises(ConnectionError):
+            self.storage.upload_data("p1", self.file_path, part_size=4, max_workers=1)
+        self.assertTrue(os.path.exists(self.file_path + ".scaile-upload"))
+
+        self.fail_part = None
+        self.parts.clear()
+        self.mock_client._make_request.reset_mock()
+        response = self.storage.upload_data("p1", self.file_path, part_size=4, max_workers=1)
+
+        self.assertEqual(sorted(self.parts), [2])
+        self.assertEqual(response["file_id"], "f1")
+        initiated = [c for c in self.mock_client._make_request.call_args_list if c.args[1].endswith("/uploads")]
+        self.assertEqual(initiated, [])
+
+    def test_checkpoint_written_before_first_part(self):
+        """
+        Test that the upload ID survives a failure of the very first part.
+        """
+        self.fail_part = 1
+        with self.assertRaises(ConnectionError):
+            self.storage.upload_data("p1", self.file_path, part_size=100)
+        self.assertTrue(os.path.exists(self.file_path + ".scaile-upload"))
+
+        self.fail_part = None
+        self.mock_client._make_request.reset_mock()
+        self.storage.upload_data("p1", self.file_path, part_size=100)
+        initiated = [c for c in self.mock_client._make_request.call_args_list if c.args[1].endswith("/uploads")]
+        self.assertEqual(initiated, [])
+
+class FakeStreamResponse:
+    """
+    Minimal stand-in for a streaming requests.Response serving a byte range of `content`.
+    """
+
+    def __init__(self, content, headers=None, accept_ranges=True):
+        self.content = content
+        self.accept_ranges = accept_ranges
+        self.headers = {"Content-Length": str(len(content)), "Accept-Ranges": "bytes" if accept_ranges else "none"}
+        self.status_code = 200
+        byte_range = (headers or {}).get("Range")
+        body = content
+        if byte_range and accept_ranges:
+            start, _, end = byte_range[len("bytes="):].partition("-")
+            body = content[int(start):int(end) + 1 if end else None]
+            self.status_code = 206
+        self.raw = io.BytesIO(body)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestStorageStreamingDownload(unittest.TestCase):
+    """
+    Unit tests for Storage.download_data.
+    """
+
+    content = bytes(range(256)) * 40
+
+    def setUp(self):
+        """
+        Setup a mocked client serving `content` with range support.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "out.bin")
+        self.accept_ranges = True
+        self.requests = []
+        self.mock_client = MagicMock()
+        self.mock_client._stream_request.side_effect = self.fake_stream
+        self.storage = Storage(self.mock_client)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def fake_stream(self, method, endpoint, headers=None):
+        self.requests.append((method, (headers or {}).get("Range")))
+        return FakeStreamResponse(self.content, headers, self.accept_ranges)
+
+    def test_download_to_path(self):
+        """
+        Test a single-stream download into a file path.
+        """
+        size = self.storage.download_data("p1", "f1", self.path, chunk_size=1000)
+        self.assertEqual(size, len(self.content))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_parallel_segments_into_buffer(self):
+        """
+        Test a segmented download written in place into a bytearray.
+        """
+        buffer = bytearray(len(self.content))
+        self.storage.download_data("p1", "f1", buffer, segments=3, chunk_size=512)
+
+        self.assertEqual(bytes(buffer), self.content)
+        ranges = sorted(r for m, r in self.requests if m == "GET")
+        self.assertEqual(len(ranges), 3)
+
+    def test_parallel_segments_into_mmap(self):
+        """
+        Test a segmented download into a memory-mapped file.
+        """
+        with open(self.path, "w+b") as f:
+            f.truncate(len(self.content))
+            with mmap.mmap(f.fileno(), len(self.content)) as mapped:
+                self.storage.download_data("p1", "f1", mapped, segments=4)
+                self.assertEqual(mapped[:], self.content)
+
+    def test_resume_partial_download(self):
+        """
+        Test that resume only requests the missing tail of a partial file.
+        """
+        with open(self.path, "wb") as f:
+            f.write(self.content[:3000])
+
+        size = self.storage.download_data("p1", "f1", self.path, resume=True)
+
+        self.assertEqual(size, len(self.content))
+        self.assertEqual(self.requests, [("GET", "bytes=3000-")])
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_falls_back_without_range_support(self):
+        """
+        Test that a server without range support gets a single full download.
+        """
+        self.accept_ranges = False
+        stream = io.BytesIO()
+        self.storage.download_data("p1", "f1", stream, segments=4)
+        self.assertEqual(stream.getvalue(), self.content)
+
+    def test_non_seekable_stream_is_not_segmented(self):
+        """
+        Test that a non-seekable file object gets one ordered stream, not parallel ranges.
+        """
+        class Pipe(io.RawIOBase):
+            def __init__(self):
+                self.data = bytearray()
+
+            def writable(self):
+                return True
+
+            def write(self, b):
+                self.data += b
+                return len(b)
+
+        pipe = Pipe()
+        self.storage.download_data("p1", "f1", pipe, segments=4, chunk_size=100)
+        self.assertEqual(bytes(pipe.data), self.content)
+        self.assertEqual(self.requests, [("GET", None)])
+
+    def test_cached_download(self):
+        """
+        Test that repeated downloads of a file are served from the content cache.
+        """
+        self.storage.cache = ContentCache(os.path.join(self.tmpdir.name, "cache"))
+        buffer = bytearray(len(self.content))
+        self.storage.download_data("p1", "cid-1", buffer)
+        self.storage.download_data("p1", "cid-1", self.path)
+
+        self.assertEqual(bytes(buffer), self.content)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_cached_download_resumes(self):
+        """
+        Test that resume continues a partial path from the cached content.
+        """
+        self.storage.cache = ContentCache(os.path.join(self.tmpdir.name, "cache"))
+        self.storage.download_data("p1", "cid-1", bytearray(len(self.content)))
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 100)
+
+        size = self.storage.download_data("p1", "cid-1", self.path, resume=True)
+
+        self.assertEqual(size, len(self.content))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"x" * 100 + self.content[100:])
+
 if __name__ == "__main__":
     unittest.main()
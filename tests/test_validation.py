@@ -0,0 +1,78 @@
+import io
+import json
+import unittest
+from scaile.utils import Utils
+from scaile.validation import BatchValidator
+
+SCHEMA = {
+    "text": str,
+    "label": {"type": str, "labels": {"cat", "dog"}},
+    "tags": {"type": list, "labels": {"indoor", "outdoor"}, "required": False},
+    "score": {"type": float, "required": False, "nullable": True},
+}
+
+class TestBatchValidator(unittest.TestCase):
+    """
+    Unit tests for batch schema validation.
+    """
+
+    def setUp(self):
+        self.validator = BatchValidator(SCHEMA)
+        self.rows = [
+            {"text": "a", "label": "cat", "score": 1},
+            {"label": "dog"},
+            {"text": 5, "label": "cow"},
+            {"text": "b", "label": "dog", "tags": ["indoor", "space"], "score": None},
+            "not a row",
+            {"text": "c", "label": "cat", "score": True},
+        ]
+
+    def test_list_of_dicts(self):
+        """
+        Test that presence, type and vocabulary errors are reported per row.
+        """
+        result = self.validator.validate(self.rows)
+        self.assertEqual(result.valid, [True, False, False, False, False, False])
+        self.assertEqual(result.errors(1), ["text: missing"])
+        self.assertEqual(result.errors(2), ["text: wrong type", "label: unknown label"])
+        self.assertEqual(result.errors(3), ["tags: unknown label"])
+        self.assertEqual(result.errors(4), ["row: not a JSON object"])
+        self.assertEqual(result.errors(5), ["score: wrong type"])
+        self.assertEqual(result.filter(self.rows), [self.rows[0]])
+        self.assertEqual(result.summary()["text: missing"], 1)
+
+    def test_columnar(self):
+        """
+        Test that columnar batches give the same masks and filter by column.
+        """
+        columns = {"text": ["a", None, "c"], "label": ["cat", "dog", "bird"]}
+        result = self.validator.validate(columns)
+        self.assertEqual(result.invalid_rows, [1, 2])
+        self.assertEqual(result.filter(columns), {"text": ["a"], "label": ["cat"]})
+        with self.assertRaises(ValueError):
+            self.validator.validate({"text": ["a"], "label": []})
+
+    def test_ndjson(self):
+        """
+        Test that NDJSON strings and streams are validated, flagging bad lines.
+        """
+        lines = [json.dumps(row) for row in self.rows[:3]] + ["{broken", ""]
+        result = self.validator.validate("\n".join(lines))
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result.invalid_rows, [1, 2, 3])
+
+        rejected = []
+        valid = list(self.validator.iter_valid(io.StringIO("\n".join(lines)), chunk_size=2,
+                                               on_invalid=lambda row, errors: rejected.append(errors)))
+        self.assertEqual(valid, [self.rows[0]])
+        self.assertEqual(len(rejected), 3)
+
+    def test_utils_entry_point(self):
+        """
+        Test that Utils exposes the batch validator.
+        """
+        self.assertTrue(Utils.validate_batch([{"text": "a", "label": "dog"}], SCHEMA).ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import unittest
+from unittest.mock import patch
+from scaile.configs import Config
+from scaile.webhook_asgi import WebhookASGIApp
+
+def sign(payload: bytes) -> str:
+    """Compute the X-Signature header for a payload."""
+    return hmac.new(Config.WEBHOOK_SECRET.encode(), payload, hashlib.sha256).hexdigest()
+
+
+class TestWebhookASGIApp(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit tests for the asyncio webhook receiver, driven through the ASGI interface.
+    """
+
+    def setUp(self):
+        self.app = WebhookASGIApp(max_pending=100, retry_delay=0.01)
+
+    async def request(self, payload: bytes, signature: str = None, method: str = "POST", path: str = "/webhook"):
+        """Send one request through the app and return (status, headers, body)."""
+        headers = [(b"x-signature", (signature or sign(payload)).encode())]
+        scope = {"type": "http", "method": method, "path": path, "headers": headers}
+        messages = [{"type": "http.request", "body": payload[:5], "more_body": True},
+                    {"type": "http.request", "body": payload[5:], "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await self.app(scope, receive, send)
+        return sent[0]["status"], dict(sent[0]["headers"]), json.loads(sent[1]["body"])
+
+    async def test_async_handler(self):
+        """
+        Test that a registered coroutine handler receives the event after a 202.
+        """
+        received = []
+
+        @self.app.on("new_data")
+        async def handle(event):
+            received.append(event)
+
+        status, _, body = await self.request(json.dumps({"event": "new_data", "id": 1}).encode())
+        await self.app.drain()
+
+        self.assertEqual(status, 202)
+        self.assertEqual(body, {"status": "accepted"})
+        self.assertEqual(received, [{"event": "new_data", "id": 1}])
+
+    async def test_falls_back_to_process_webhook(self):
+        """
+        Test that events without an async handler go to process_webhook.
+        """
+        with patch("scaile.webhook_asgi.process_webhook") as process:
+            await self.request(b'{"event": "delete_data"}')
+            await self.app.drain()
+        process.assert_called_once_with({"event": "delete_data"})
+
+    async def test_retries_failing_handler(self):
+        """
+        Test that a failing handler is retried.
+        """
+        calls = []
+
+        @self.app.on("new_data")
+        async def flaky(event):
+            calls.append(event)
+            if len(calls) < 2:
+                raise RuntimeError("db down")
+
+        await self.request(b'{"event": "new_data"}')
+        await self.app.drain()
+        self.assertEqual(len(calls), 2)
+
+    async def test_retries_only_failed_handlers(self):
+        """
+        Test that a handler that succeeded is not run again when another one is retried.
+        """
+        counted = []
+        failures = []
+
+        @self.app.on("new_data")
+        async def count(event):
+            counted.append(event)
+
+        @self.app.on("new_data")
+        async def flaky(event):
+            failures.append(event)
+            if len(failures) < 3:
+                raise RuntimeError("db down")
+
+        await self.request(b'{"event": "new_data"}')
+        await self.app.drain()
+        self.assertEqual(len(counted), 1)
+        self.assertEqual(len(failures), 3)
+
+    async def test_rejections(self):
+        """
+        Test signature, size, method and backlog checks.
+        """
+        self.assertEqual((await self.request(b'{"event": "x"}', signature="bad"))[0], 403)
+        self.assertEqual((await self.request(b"{}", method="GET"))[0], 405)
+        self.assertEqual((await self.request(b"{}", path="/other"))[0], 404)
+
+        self.app.max_body_size = 4
+        self.assertEqual((await self.request(b'{"event": "x"}'))[0], 413)
+
+    async def test_many_concurrent_deliveries(self):
+        """
+        Test that many deliveries are absorbed concurrently.
+        """
+        self.app.max_pending = 5000
+        release = asyncio.Event()
+        done = []
+
+        @self.app.on("new_data")
+        async def slow(event):
+            await release.wait()
+            done.append(event)
+
+        statuses = await asyncio.gather(*(
+            self.request(json.dumps({"event": "new_data", "n": n}).encode()) for n in range(1000)
+        ))
+        self.assertTrue(all(status == 202 for status, _, _ in statuses))
+        self.assertEqual(self.app.pending, 1000)
+
+        release.set()
+        await self.app.drain()
+        self.assertEqual(len(done), 1000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from scaile import webhook_listener
+from scaile.configs import Config
+from scaile.idempotency import IdempotencyStore
+from scaile.webhook_queue import WebhookQueue
+
+def sign(payload: bytes) -> str:
+    """Compute the X-Signature header for a payload."""
+    return hmac.new(Config.WEBHOOK_SECRET.encode(), payload, hashlib.sha256).hexdigest()
+
+
+class TestWebhookQueue(unittest.TestCase):
+    """
+    Unit tests for the background webhook processing queue.
+    """
+
+    def test_processes_events(self):
+        """
+        Test that submitted events are handled by the workers.
+        """
+        seen = []
+        queue = WebhookQueue(seen.append, workers=2).start()
+        for n in range(20):
+            self.assertTrue(queue.submit({"event": "new_data", "n": n}))
+        self.assertTrue(queue.join(timeout=5))
+        queue.stop()
+        self.assertEqual(sorted(e["n"] for e in seen), list(range(20)))
+
+    def test_retries_failed_events(self):
+        """
+        Test that a failing event is retried with backoff until it succeeds.
+        """
+        attempts = []
+
+        def flaky(event):
+            attempts.append(event)
+            if len(attempts) < 3:
+                raise RuntimeError("database unavailable")
+
+        queue = WebhookQueue(flaky, workers=1, max_retries=3, retry_delay=0.01).start()
+        queue.submit({"event": "new_data"})
+        self.assertTrue(queue.join(timeout=5))
+        queue.stop()
+        self.assertEqual(len(attempts), 3)
+
+    def test_drops_after_max_retries(self):
+        """
+        Test that an event is dropped once its retries are exhausted.
+        """
+        calls = []
+
+        def failing(event):
+            calls.append(event)
+            raise RuntimeError("boom")
+
+        queue = WebhookQueue(failing, workers=1, max_retries=2, retry_delay=0.01).start()
+        queue.submit({"event": "new_data"})
+        self.assertTrue(queue.join(timeout=5))
+        queue.stop()
+        self.assertEqual(len(calls), 3)
+
+    def test_bounded(self):
+        """
+        Test that submit refuses events when the queue is full.
+        """
+        queue = WebhookQueue(lambda event: None, maxsize=2)
+        self.assertTrue(queue.submit({}))
+        self.assertTrue(queue.submit({}))
+        self.assertFalse(queue.submit({}))
+
+    def test_disk_backed_queue_survives_restart(self):
+        """
+        Test that events accepted by a disk-backed queue are processed after a restart.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "events.sqlite3")
+            WebhookQueue(lambda event: None, path=path).submit({"event": "delete_data"})
+
+            seen = []
+            queue = WebhookQueue(seen.append, path=path).start()
+            self.assertTrue(queue.join(timeout=5))
+            queue.stop()
+            self.assertEqual(seen, [{"event": "delete_data"}])
+
+
+class TestHandleWebhook(unittest.TestCase):
+    """
+    Unit tests for the Flask webhook endpoint.
+    """
+
+    def setUp(self):
+        self.client = webhook_listener.app.test_client()
+        self.processed = threading.Event()
+        self.queue = WebhookQueue(lambda event: self.processed.set(), workers=1).start()
+        for name, value in (("_webhook_queue", self.queue), ("idempotency_store", IdempotencyStore())):
+            patcher = patch.object(webhook_listener, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.queue.stop)
+
+    def post(self, payload: bytes, signature: str = None):
+        return self.client.post("/webhook", data=payload, headers={"X-Signature": signature or sign(payload)})
+
+    def test_accepts_and_enqueues(self):
+        """
+        Test that a valid webhook is acknowledged with 202 and processed in the background.
+        """
+        response = self.post(json.dumps({"event": "new_data"}).encode())
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(self.processed.wait(timeout=5))
+
+    def test_rejects_bad_signature(self):
+        """
+        Test that an invalid or missing signature is rejected.
+        """
+        self.assertEqual(self.post(b"{}", signature="bad").status_code, 403)
+        self.assertEqual(self.client.post("/webhook", data=b"{}").status_code, 403)
+
+    def test_queue_full(self):
+        """
+        Test that a full queue asks the sender to redeliver later.
+        """
+        with patch.object(self.queue, "submit", return_value=False):
+            response = self.post(b'{"event": "new_data"}')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_duplicates_are_acknowledged_once(self):
+        """
+        Test that a redelivered event is acknowledged without being processed again.
+        """
+        payload = json.dumps({"event": "new_data", "event_id": "evt-1"}).encode()
+        self.assertEqual(self.post(payload).status_code, 202)
+        response = self.post(payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"status": "duplicate"})
+
+    def test_events_sharing_a_resource_id_are_distinct(self):
+        """
+        Test that events about the same resource are not deduplicated by its id.
+        """
+        self.assertEqual(self.post(b'{"event": "new_data", "id": "item-1"}').status_code, 202)
+        self.assertEqual(self.post(b'{"event": "delete_data", "id": "item-1"}').status_code, 202)
+
+    def test_repeated_payload_without_id_is_processed(self):
+        """
+        Test that an identical event repeated later is not taken for a redelivery.
+        """
+        for payload in (b'{"event": "new_data", "id": "f1"}', b'{"event": "delete_data", "id": "f1"}',
+                        b'{"event": "new_data", "id": "f1"}'):
+            self.assertEqual(self.post(payload).status_code, 202)
+
+    def test_delivery_id_header(self):
+        """
+        Test that the delivery id header deduplicates redeliveries.
+        """
+        payload = b'{"event": "new_data"}'
+        headers = {"X-Signature": sign(payload), "X-Delivery-Id": "d-1"}
+        self.assertEqual(self.client.post("/webhook", data=payload, headers=headers).status_code, 202)
+        self.assertEqual(self.client.post("/webhook", data=payload, headers=headers).status_code, 200)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+import threading
+import time
+import unittest
+from scaile.webhook_queue import WebhookQueue
+from scaile.webhook_registry import WebhookRegistry
+
+class TestWebhookRegistry(unittest.TestCase):
+    """
+    Unit tests for the webhook handler registry.
+    """
+
+    def setUp(self):
+        self.registry = WebhookRegistry()
+
+    def test_exact_and_wildcard_dispatch(self):
+        """
+        Test that exact handlers and matching wildcard handlers all run.
+        """
+        seen = []
+
+        @self.registry.on("annotation.created")
+        def exact(data):
+            seen.append("exact")
+
+        @self.registry.on("annotation.*")
+        def family(data):
+            seen.append("family")
+
+        @self.registry.on("*")
+        def everything(data):
+            seen.append("everything")
+
+        self.assertEqual(self.registry.dispatch({"event": "annotation.created"}), 3)
+        self.assertEqual(sorted(seen), ["everything", "exact", "family"])
+        self.assertEqual(self.registry.dispatch({"event": "new_data"}), 1)
+
+    def test_unknown_event(self):
+        """
+        Test that an event without handlers is ignored.
+        """
+        self.assertEqual(self.registry.dispatch({"event": "nothing"}), 0)
+
+    def test_handlers_run_concurrently(self):
+        """
+        Test that several handlers of one event run at the same time.
+        """
+        barrier = threading.Barrier(2, timeout=2)
+        self.registry.register("new_data", lambda data: barrier.wait())
+        self.registry.register("new_data", lambda data: barrier.wait())
+        self.assertEqual(self.registry.dispatch({"event": "new_data"}), 2)
+
+    def test_errors_propagate_after_all_handlers(self):
+        """
+        Test that a failing handler does not stop the others and its error is re-raised.
+        """
+        seen = []
+
+        def failing(data):
+            raise RuntimeError("boom")
+
+        self.registry.register("new_data", failing)
+        self.registry.register("new_data", seen.append)
+        with self.assertRaises(RuntimeError):
+            self.registry.dispatch({"event": "new_data"})
+        self.assertEqual(len(seen), 1)
+
+    def test_stats(self):
+        """
+        Test that per-handler calls, errors and timings are recorded.
+        """
+        def handler(data):
+            if data.get("fail"):
+                raise ValueError("bad")
+
+        self.registry.register("new_data", handler)
+        self.registry.dispatch({"event": "new_data"})
+        with self.assertRaises(ValueError):
+            self.registry.dispatch({"event": "new_data", "fail": True})
+
+        stats = next(v for k, v in self.registry.stats().items() if k.endswith("handler"))
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["errors"], 1)
+        self.assertGreaterEqual(stats["max_time"], stats["avg_time"])
+
+    def test_retry_runs_only_failed_handlers(self):
+        """
+        Test that re-dispatching a partially failed event skips handlers that succeeded.
+        """
+        seen = []
+        attempts = []
+
+        def flaky(data):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+
+        self.registry.register("new_data", seen.append)
+        self.registry.register("new_data", flaky)
+        event = {"event": "new_data", "event_id": "e1"}
+        with self.assertRaises(RuntimeError):
+            self.registry.dispatch(event)
+        self.assertEqual(self.registry.dispatch(event), 1)
+
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(len(attempts), 2)
+        stats = next(v for k, v in self.registry.stats().items() if k.endswith("flaky"))
+        self.assertEqual(stats["retries"], 1)
+
+    def test_stats_keep_same_named_handlers_apart(self):
+        """
+        Test that two lambdas get separate stats entries.
+        """
+        self.registry.register("new_data", lambda data: None)
+        self.registry.register("new_data", lambda data: None)
+        self.registry.dispatch({"event": "new_data"})
+
+        stats = self.registry.stats()
+        self.assertEqual(len(stats), 2)
+        self.assertTrue(all(entry["calls"] == 1 for entry in stats.values()))
+
+    def test_registration_invalidates_cache(self):
+        """
+        Test that handlers registered after a dispatch are picked up.
+        """
+        self.registry.dispatch({"event": "new_data"})
+        seen = []
+        self.registry.register("new_*", seen.append)
+        self.registry.dispatch({"event": "new_data"})
+        self.assertEqual(len(seen), 1)
+
+
+class TestWebhookBatching(unittest.TestCase):
+    """
+    Unit tests for micro-batched webhook delivery.
+    """
+
+    def setUp(self):
+        self.registry = WebhookRegistry()
+        self.batches = []
+
+        @self.registry.on_batch("new_data")
+        def upsert(events):
+            self.batches.append([(e["project_id"], e["id"]) for e in events])
+
+    def tearDown(self):
+        self.registry.disable_batching(timeout=5)
+
+    def test_unbatched_handler_gets_single_event(self):
+        """
+        Test that batch handlers receive one-event lists when batching is off.
+        """
+        self.assertEqual(self.registry.dispatch({"event": "new_data", "project_id": 1, "id": 1}), 1)
+        self.assertEqual(self.batches, [[(1, 1)]])
+
+    def test_coalesces_per_project_by_count(self):
+        """
+        Test that events are grouped per project and flushed when a group is full.
+        """
+        self.registry.enable_batching(window=60, max_batch=3)
+        for n in range(7):
+            self.registry.dispatch({"event": "new_data", "project_id": n % 2, "id": n})
+        self.assertTrue(self.registry.batcher.flush(timeout=5))
+
+        self.assertEqual(sorted(self.batches), [[(0, 0), (0, 2), (0, 4)], [(0, 6)], [(1, 1), (1, 3), (1, 5)]])
+
+    def test_flushes_after_window(self):
+        """
+        Test that a partial group is flushed once the window elapses.
+        """
+        self.registry.enable_batching(window=0.05, max_batch=100)
+        self.registry.dispatch({"event": "new_data", "project_id": 1, "id": 1})
+        self.registry.dispatch({"event": "new_data", "project_id": 1, "id": 2})
+
+        deadline = time.monotonic() + 5
+        while not self.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.batches, [[(1, 1), (1, 2)]])
+
+    def test_failed_batch_is_retried(self):
+        """
+        Test that a failing batch handler is retried with the whole batch.
+        """
+        attempts = []
+
+        @self.registry.on_batch("delete_data")
+        def flaky(events):
+            attempts.append(len(events))
+            if len(attempts) == 1:
+                raise RuntimeError("database unavailable")
+
+        self.registry.enable_batching(window=60, max_batch=2, retry_delay=0.01)
+        self.registry.dispatch({"event": "delete_data", "project_id": 1, "id": 1})
+        self.registry.dispatch({"event": "delete_data", "project_id": 1, "id": 2})
+        self.assertTrue(self.registry.batcher.flush(timeout=5))
+        self.assertEqual(attempts, [2, 2])
+
+    def test_queue_acknowledges_after_batch(self):
+        """
+        Test that a queued event stays unacknowledged until its batch is handled.
+        """
+        self.registry.enable_batching(window=60, max_batch=10)
+        queue = WebhookQueue(self.registry.submit, workers=1).start()
+        self.addCleanup(queue.stop)
+        queue.submit({"event": "new_data", "project_id": 1, "id": 1})
+
+        deadline = time.monotonic() + 5
+        while self.registry.batcher._pending == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(queue.store), 1)
+
+        self.assertTrue(self.registry.batcher.flush(timeout=5))
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual(self.batches, [[(1, 1)]])
+
+    def test_failed_batch_fails_its_events(self):
+        """
+        Test that a batch failing its last retry is reported to the queue, not dropped.
+        """
+        failed = []
+
+        @self.registry.on_batch("delete_data")
+        def broken(events):
+            raise RuntimeError("database unavailable")
+
+        self.registry.enable_batching(window=60, max_batch=1, max_retries=0)
+        queue = WebhookQueue(self.registry.submit, workers=1, max_retries=0, on_failure=failed.append).start()
+        self.addCleanup(queue.stop)
+        queue.submit({"event": "delete_data", "project_id": 1, "id": 1})
+
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual(failed, [{"event": "delete_data", "project_id": 1, "id": 1}])
+
+    def test_add_blocks_when_pending_limit_reached(self):
+        """
+        Test that the batcher applies backpressure instead of growing without bound.
+        """
+        release = threading.Event()
+
+        @self.registry.on_batch("slow")
+        def slow(events):
+            release.wait(5)
+
+        batcher = self.registry.enable_batching(window=60, max_batch=2, max_pending=2)
+        batcher.add({"event": "slow", "id": 1})
+        batcher.add({"event": "slow", "id": 2})
+        blocked = threading.Thread(target=batcher.add, args=({"event": "slow", "id": 3},))
+        blocked.start()
+        blocked.join(0.1)
+        self.assertTrue(blocked.is_alive())
+
+        release.set()
+        blocked.join(5)
+        self.assertFalse(blocked.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()